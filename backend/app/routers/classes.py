@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 
 from app.database import Database, get_db
+from app.services.reference_cache import reference_cache
 from app.schemas.class_model import Class, ClassCreate, ClassUpdate
 
 router = APIRouter()
@@ -63,6 +64,8 @@ async def create_class(class_data: ClassCreate, db: Database = Depends(get_db)):
         ),
     )
     
+    reference_cache.invalidate()
+
     return await get_class(class_data.class_id, db)
 
 
@@ -102,6 +105,8 @@ async def update_class(
     update_query = f"UPDATE classes SET {', '.join(update_fields)} WHERE class_id = %s"
     db.execute_update(update_query, tuple(params))
     
+    reference_cache.invalidate()
+
     return await get_class(class_id, db)
 
 
@@ -114,5 +119,7 @@ async def delete_class(class_id: str, db: Database = Depends(get_db)):
     if affected == 0:
         raise HTTPException(status_code=404, detail="班级不存在")
     
+    reference_cache.invalidate()
+
     return {"message": "删除成功", "class_id": class_id}
 
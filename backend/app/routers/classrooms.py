@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 
 from app.database import Database, get_db
+from app.services.reference_cache import reference_cache
 from app.schemas.classroom import Classroom, ClassroomCreate, ClassroomUpdate
 
 router = APIRouter()
@@ -103,6 +104,8 @@ async def create_classroom(classroom: ClassroomCreate, db: Database = Depends(ge
         for feature_id in classroom.features:
             db.execute_insert(feature_insert, (classroom.classroom_id, feature_id))
     
+    reference_cache.invalidate()
+
     return await get_classroom(classroom.classroom_id, db)
 
 
@@ -158,6 +161,8 @@ async def update_classroom(
             for feature_id in classroom.features:
                 db.execute_insert(feature_insert, (classroom_id, feature_id))
     
+    reference_cache.invalidate()
+
     return await get_classroom(classroom_id, db)
 
 
@@ -170,5 +175,7 @@ async def delete_classroom(classroom_id: str, db: Database = Depends(get_db)):
     if affected == 0:
         raise HTTPException(status_code=404, detail="教室不存在")
     
+    reference_cache.invalidate()
+
     return {"message": "删除成功", "classroom_id": classroom_id}
 
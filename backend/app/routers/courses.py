@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 
 from app.database import Database, get_db
+from app.services.reference_cache import reference_cache
 from app.schemas.course import Course, CourseCreate, CourseUpdate
 
 router = APIRouter()
@@ -62,6 +63,8 @@ async def create_course(course: CourseCreate, db: Database = Depends(get_db)):
         ),
     )
     
+    reference_cache.invalidate()
+
     return await get_course(course.course_id, db)
 
 
@@ -98,6 +101,8 @@ async def update_course(
     update_query = f"UPDATE courses SET {', '.join(update_fields)} WHERE course_id = %s"
     db.execute_update(update_query, tuple(params))
     
+    reference_cache.invalidate()
+
     return await get_course(course_id, db)
 
 
@@ -110,5 +115,7 @@ async def delete_course(course_id: str, db: Database = Depends(get_db)):
     if affected == 0:
         raise HTTPException(status_code=404, detail="课程不存在")
     
+    reference_cache.invalidate()
+
     return {"message": "删除成功", "course_id": course_id}
 
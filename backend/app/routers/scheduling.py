@@ -9,6 +9,7 @@
 """
 import asyncio
 import logging
+from typing import Optional
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
 from app.config import settings
@@ -46,6 +47,10 @@ def _build_ga_config(request: SchedulingRequest) -> dict:
         "elitism_size": request.elitism_size,
         "max_stagnation": request.max_stagnation,
     }
+    if request.pin_seed_schedules:
+        config["pin_seed_schedules"] = True
+    if request.time_budget_seconds is not None:
+        config["time_budget_seconds"] = request.time_budget_seconds
     if request.penalty_scores:
         # 过滤掉 None 值，只传用户明确设置的权重（算法层做深合并）
         ps = {k: v for k, v in request.penalty_scores.model_dump().items() if v is not None}
@@ -59,6 +64,7 @@ async def _run_scheduling_background(
     ga_config: dict,
     db_config: dict,
     loop: asyncio.AbstractEventLoop,
+    seed_version_id: Optional[int] = None,
 ) -> None:
     """
     后台任务：在线程池中运行排课算法，通过 ws_manager 推送进度。
@@ -71,7 +77,7 @@ async def _run_scheduling_background(
 
     try:
         result = await service.run_scheduling_async(
-            version_id, ga_config, progress_callback
+            version_id, ga_config, progress_callback, seed_version_id
         )
 
         if result.get("success"):
@@ -122,7 +128,9 @@ async def run_scheduling(request: SchedulingRequest):
 
     # 启动后台协程（不等待完成）
     asyncio.create_task(
-        _run_scheduling_background(version_id, ga_config, db_config, loop)
+        _run_scheduling_background(
+            version_id, ga_config, db_config, loop, request.seed_version_id
+        )
     )
 
     logger.info(f"排课任务已启动，version_id={version_id}")
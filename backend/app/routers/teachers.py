@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 
 from app.database import Database, get_db
+from app.services.reference_cache import reference_cache
 from app.schemas.teacher import Teacher, TeacherCreate, TeacherUpdate
 
 router = APIRouter()
@@ -64,6 +65,8 @@ async def create_teacher(teacher: TeacherCreate, db: Database = Depends(get_db))
         ),
     )
     
+    reference_cache.invalidate()
+
     # 返回创建的教师
     return await get_teacher(teacher.teacher_id, db)
 
@@ -103,6 +106,8 @@ async def update_teacher(
     update_query = f"UPDATE teachers SET {', '.join(update_fields)} WHERE teacher_id = %s"
     db.execute_update(update_query, tuple(params))
     
+    reference_cache.invalidate()
+
     return await get_teacher(teacher_id, db)
 
 
@@ -115,5 +120,7 @@ async def delete_teacher(teacher_id: str, db: Database = Depends(get_db)):
     if affected == 0:
         raise HTTPException(status_code=404, detail="教师不存在")
     
+    reference_cache.invalidate()
+
     return {"message": "删除成功", "teacher_id": teacher_id}
 
@@ -68,6 +68,12 @@ class SchedulingRequest(BaseModel):
     """排课请求"""
 
     version_id: int = Field(..., description="排课版本ID")
+    seed_version_id: Optional[int] = Field(
+        None, description="热启动来源版本ID（可选），以该版本的排课结果作为初始种群的种子"
+    )
+    pin_seed_schedules: bool = Field(
+        False, description="配合 seed_version_id：锁定原方案中仍有效的安排，只重排新增或已变更的任务"
+    )
     population: int = Field(100, ge=10, le=500, description="种群大小")
     generations: int = Field(200, ge=10, le=1000, description="进化代数")
     crossover_rate: float = Field(0.8, ge=0.0, le=1.0, description="交叉率")
@@ -75,6 +81,9 @@ class SchedulingRequest(BaseModel):
     tournament_size: int = Field(5, ge=2, le=20, description="锦标赛大小")
     elitism_size: int = Field(10, ge=1, le=50, description="精英个体数量")
     max_stagnation: int = Field(50, ge=10, le=200, description="最大停滞代数")
+    time_budget_seconds: Optional[float] = Field(
+        None, gt=0, description="运行时间预算(秒)，到时返回当前最优解；不传则不限时"
+    )
     penalty_scores: Optional[PenaltyScores] = Field(
         None, description="约束权重（可选，不传则全部使用算法默认值）"
     )
@@ -116,5 +125,18 @@ class ProgressEvent(BaseModel):
     total_generations: int = Field(0, description="总代数")
     best_fitness: float = Field(0.0, description="当前最佳适应度")
     message: str = Field("", description="可读状态描述")
+    cache_hits: int = Field(0, description="适应度缓存命中次数")
+    cache_misses: int = Field(0, description="适应度缓存未命中次数")
+    elapsed_seconds: float = Field(0.0, description="已用时间(秒)")
+    remaining_seconds: Optional[float] = Field(
+        None, description="时间预算剩余(秒)，未设置预算时为空"
+    )
+    phase_seconds: Dict[str, float] = Field(
+        default_factory=dict, description="最近一代各阶段耗时(秒)：fitness/selection/crossover/mutation 等"
+    )
+    evaluations_per_second: Optional[float] = Field(None, description="最近一代每秒适应度评估次数")
+    run_report: Optional[Dict] = Field(
+        None, description="运行报告汇总（stage=done 时填充）：阶段耗时、变异成功率、最优解硬约束分项"
+    )
     # 完成时附带结果摘要（stage=done 时填充）
     result: Optional[Dict] = Field(None, description="排课结果摘要（完成后）")
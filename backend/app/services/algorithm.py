@@ -17,6 +17,7 @@ sys.path.append(
 
 from db_connector import DatabaseConnector, DataLoader
 from genetic_algorithm import SchedulingGeneticAlgorithm
+from app.services.reference_cache import reference_cache
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,7 @@ class SchedulingService:
         version_id: int,
         ga_config: Dict,
         progress_callback: Optional[Callable[[Dict], None]] = None,
+        seed_version_id: Optional[int] = None,
     ) -> Dict:
         """运行排课算法（同步，阻塞）
 
@@ -57,6 +59,7 @@ class SchedulingService:
             version_id: 排课版本ID
             ga_config: 遗传算法配置
             progress_callback: 进度回调，接收 dict，格式见 genetic_algorithm.py _notify()
+            seed_version_id: 热启动的来源版本ID（可选），用其排课结果作为初始种群的种子
 
         Returns:
             排课结果字典
@@ -89,8 +92,10 @@ class SchedulingService:
             semester = version["semester"]
             logger.info(f"开始为学期 {semester} 版本 {version_id} 排课")
 
-            # 加载数据
-            data = self.data_loader.load_all_data(semester)
+            # 加载数据（基础数据取自进程内缓存，只查询学期相关的表）
+            data = self.data_loader.load_all_data(
+                semester, reference_data=reference_cache.get(self.db_connector)
+            )
 
             # 验证数据完整性
             if not data["teaching_tasks"]:
@@ -99,6 +104,12 @@ class SchedulingService:
                     "message": "没有找到教学任务",
                 }
 
+            # 热启动：以已有版本的排课结果为种子
+            if seed_version_id is not None:
+                data["seed_schedules"] = self.data_loader.load_schedules(
+                    seed_version_id
+                )
+
             # 初始化遗传算法
             ga = SchedulingGeneticAlgorithm(data, ga_config)
 
@@ -160,6 +171,7 @@ class SchedulingService:
         version_id: int,
         ga_config: Dict,
         progress_callback: Optional[Callable[[Dict], None]] = None,
+        seed_version_id: Optional[int] = None,
     ) -> Dict:
         """异步运行排课算法
 
@@ -176,6 +188,7 @@ class SchedulingService:
             version_id: 排课版本ID
             ga_config: 遗传算法配置
             progress_callback: 线程安全的进度回调（同步函数）
+            seed_version_id: 热启动的来源版本ID（可选）
 
         Returns:
             排课结果字典
@@ -187,6 +200,7 @@ class SchedulingService:
             version_id,
             ga_config,
             progress_callback,
+            seed_version_id,
         )
         return result
 
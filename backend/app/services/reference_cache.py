@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+基础数据缓存
+校区、院系、专业、班级、教师、课程、教室特征、教室一学期只变动几次，
+在进程内缓存，每次排课只加载学期相关的数据。
+
+失效方式：
+- 教师 / 教室 / 班级 / 课程的增删改路由调用 invalidate()；
+- 每次取用前用一条查询比较各表的行数和最大 updated_at，绕过接口直接修改数据库时也能发现变化。
+"""
+import logging
+import os
+import sys
+import threading
+from typing import Dict, Optional, Tuple
+
+# 添加项目根目录到路径，以便导入现有的数据加载模块（路由可能先于 algorithm 服务导入本模块）
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from db_connector import DataLoader
+
+logger = logging.getLogger(__name__)
+
+# 基础数据表 -> 是否有 updated_at 列（没有的只比较行数）
+REFERENCE_TABLES = {
+    "campuses": True,
+    "departments": True,
+    "majors": True,
+    "classes": True,
+    "teachers": True,
+    "courses": True,
+    "classroom_features": False,
+    "classrooms": True,
+    "classroom_has_features": False,
+}
+
+
+class ReferenceDataCache:
+    """进程内的基础数据缓存（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Optional[Dict] = None
+        self._signature: Optional[Tuple] = None
+
+    def invalidate(self):
+        """丢弃缓存，下次取用时重新加载"""
+        with self._lock:
+            self._data = None
+            self._signature = None
+        logger.info("基础数据缓存已失效")
+
+    def get(self, db_connector) -> Dict:
+        """取基础数据（DataLoader.load_reference_data() 的结果），缓存失效或数据变化时重新加载"""
+        signature = self._table_signature(db_connector)
+        with self._lock:
+            if self._data is not None and self._signature == signature:
+                logger.info("基础数据缓存命中")
+                return self._data
+
+        data = DataLoader(db_connector).load_reference_data()
+        with self._lock:
+            self._data = data
+            self._signature = signature
+        logger.info(
+            f"基础数据已重新加载：{len(data['classrooms'])} 间教室，"
+            f"{len(data['classes'])} 个班级，{len(data['teachers'])} 位教师"
+        )
+        return data
+
+    @staticmethod
+    def _table_signature(db_connector) -> Tuple:
+        """各基础数据表的 (表名, 行数, 最大 updated_at)，一次查询取得"""
+        query = " UNION ALL ".join(
+            f"SELECT '{table}' AS table_name, COUNT(*) AS row_count, "
+            f"{'MAX(updated_at)' if has_updated_at else 'NULL'} AS last_updated FROM {table}"
+            for table, has_updated_at in REFERENCE_TABLES.items()
+        )
+        rows = db_connector.execute_query(query)
+        return tuple(
+            (row["table_name"], row["row_count"], str(row["last_updated"]))
+            for row in rows
+        )
+
+
+# 进程内共享的缓存实例
+reference_cache = ReferenceDataCache()
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+排课引擎基准测试
+在固定种子的合成实例（small / medium / large）上运行 SchedulingGeneticAlgorithm，
+记录构建耗时（预处理、查找表）、初始化耗时、每代耗时、峰值内存、最终硬约束冲突数和最终适应度，
+与保存的基线比较：最终适应度和硬约束冲突数与硬件无关，退化时以非零状态退出；
+耗时和内存随机器变化，只与基线对比后给出提示，不作为退化判定。
+运行用例前先做适应度一致性检查（check_fitness_equivalence），全量与增量评估不一致时同样以非零状态退出。
+
+每个用例在独立的子进程中运行（峰值内存互不干扰），子进程固定 PYTHONHASHSEED，
+保证同一代码在同一实例上的求解结果可复现。
+
+用法：
+    python benchmark.py                       # 运行全部用例并与基线比较
+    python benchmark.py --cases small medium  # 只运行部分用例
+    python benchmark.py --update-baseline     # 用本次结果覆盖基线
+    python benchmark.py --skip-equivalence    # 跳过适应度一致性检查
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 基线文件默认路径
+DEFAULT_BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "benchmark_baselines.json"
+)
+
+# 基准用例：合成实例参数 + GA 参数
+BENCHMARK_CASES = {
+    "small": {
+        "instance": {"num_tasks": 500, "seed": 1, "num_campuses": 2, "tightness": 0.8},
+        "ga": {"population_size": 30, "generations": 30, "random_seed": 1},
+    },
+    "medium": {
+        "instance": {"num_tasks": 2000, "seed": 2, "num_campuses": 2, "tightness": 0.8},
+        "ga": {"population_size": 30, "generations": 15, "random_seed": 2},
+    },
+    "medium_conflict_set": {
+        "instance": {"num_tasks": 2000, "seed": 2, "num_campuses": 2, "tightness": 0.8},
+        "ga": {
+            "population_size": 30,
+            "generations": 15,
+            "random_seed": 2,
+            "mutation_mode": "conflict_set",
+        },
+    },
+    "large": {
+        "instance": {"num_tasks": 8000, "seed": 3, "num_campuses": 3, "tightness": 0.8},
+        "ga": {"population_size": 20, "generations": 5, "random_seed": 3},
+    },
+}
+
+# 基准测试前的适应度一致性检查规模
+EQUIVALENCE_CHECK = {"num_tasks": 400, "seed": 1, "rounds": 40}
+
+# 耗时 / 内存类指标（仅提示）：超过基线 (1 + 阈值) 倍且绝对差超过下限时给出提示，避免小数值上的计时噪声
+COST_METRICS = {
+    "setup_seconds": 0.2,
+    "init_seconds": 0.2,
+    "seconds_per_generation": 0.05,
+    "peak_memory_mb": 10.0,
+}
+
+
+def _peak_memory_mb() -> Optional[float]:
+    """当前进程的峰值常驻内存（MB）；平台不支持时返回 None"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case(name: str) -> Dict:
+    """运行单个基准用例，返回指标（在子进程中调用）"""
+    logging.getLogger("genetic_algorithm").setLevel(logging.WARNING)
+    logging.getLogger("synthetic_instance").setLevel(logging.WARNING)
+
+    from genetic_algorithm import SchedulingGeneticAlgorithm
+    from synthetic_instance import generate_instance
+
+    case = BENCHMARK_CASES[name]
+    data = generate_instance(**case["instance"])
+
+    started = time.perf_counter()
+    ga = SchedulingGeneticAlgorithm(data, dict(case["ga"]))
+    setup_seconds = time.perf_counter() - started
+    solution = ga.evolve()
+    total_seconds = time.perf_counter() - started
+
+    report = ga.get_run_report()
+    generation_seconds = [
+        sum(record["phase_seconds"].values()) for record in report["per_generation"]
+    ]
+    breakdown = report["best_hard_breakdown"] or {}
+    return {
+        "tasks": len(data["teaching_tasks"]),
+        "setup_seconds": round(setup_seconds, 3),
+        "init_seconds": round(report["phase_seconds"].get("init", 0.0), 3),
+        "seconds_per_generation": round(
+            sum(generation_seconds) / len(generation_seconds), 4
+        )
+        if generation_seconds
+        else None,
+        "total_seconds": round(total_seconds, 3),
+        "evaluations_per_second": report["evaluations_per_second"],
+        "peak_memory_mb": _peak_memory_mb(),
+        "hard_conflicts": sum(item["count"] for item in breakdown.values()),
+        "hard_breakdown": {k: item["count"] for k, item in breakdown.items()},
+        "fitness": ga.fitness(solution),
+    }
+
+
+def run_benchmarks(names: List[str]) -> Dict[str, Dict]:
+    """依次在独立子进程中运行各用例"""
+    # spawn 子进程读取启动时的环境变量，固定哈希种子使集合遍历顺序可复现
+    os.environ["PYTHONHASHSEED"] = "0"
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in names:
+        logger.info(f"运行基准用例 {name} ...")
+        with context.Pool(1) as pool:
+            results[name] = pool.apply(run_case, (name,))
+        logger.info(f"  {name}: {_format_metrics(results[name])}")
+    return results
+
+
+def run_equivalence_check() -> bool:
+    """全量 fitness() 与增量评估的一致性检查，通过返回 True"""
+    from check_fitness_equivalence import run_checks
+
+    logger.info("运行适应度一致性检查 ...")
+    for name in ("genetic_algorithm", "synthetic_instance"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    mismatches = run_checks(**EQUIVALENCE_CHECK)
+    for line in mismatches[:10]:
+        logger.error(f"  {line}")
+    return not mismatches
+
+
+def compare_with_baseline(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float
+) -> List[str]:
+    """与基线比较，返回退化描述列表（为空表示通过）
+
+    - 适应度：低于基线超过 threshold × |基线| 为退化；
+    - 硬约束冲突数：多于基线即为退化；
+    - 耗时 / 内存：与机器相关，超过基线 (1 + threshold) 倍（且超过绝对下限）时只记录警告。
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            logger.warning(f"用例 {name} 没有基线，跳过比较")
+            continue
+        if base.get("tasks") != current["tasks"]:
+            regressions.append(
+                f"{name}: 实例规模与基线不一致（{current['tasks']} vs {base.get('tasks')}），请更新基线"
+            )
+            continue
+
+        for metric, floor in COST_METRICS.items():
+            old, new = base.get(metric), current.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold) and new - old > floor:
+                logger.warning(
+                    f"{name}: {metric} {old} -> {new}（+{(new - old) / old:.0%}，"
+                    "与机器相关，仅供参考）"
+                )
+
+        old_fitness, new_fitness = base["fitness"], current["fitness"]
+        if new_fitness < old_fitness - threshold * max(abs(old_fitness), 1):
+            regressions.append(f"{name}: fitness {old_fitness} -> {new_fitness}")
+
+        if current["hard_conflicts"] > base["hard_conflicts"]:
+            regressions.append(
+                f"{name}: hard_conflicts {base['hard_conflicts']} -> {current['hard_conflicts']}"
+                f"（{current['hard_breakdown']}）"
+            )
+    return regressions
+
+
+def _format_metrics(metrics: Dict) -> str:
+    return (
+        f"{metrics['tasks']} 任务，初始化 {metrics['init_seconds']}s，"
+        f"每代 {metrics['seconds_per_generation']}s，峰值内存 {metrics['peak_memory_mb']}MB，"
+        f"硬冲突 {metrics['hard_conflicts']}，适应度 {metrics['fitness']}"
+    )
+
+
+def load_baseline(path: str) -> Dict[str, Dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: Dict[str, Dict]):
+    baseline = load_baseline(path)
+    baseline.update(results)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+    logger.info(f"基线已更新: {path}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="排课引擎基准测试")
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        choices=list(BENCHMARK_CASES),
+        default=list(BENCHMARK_CASES),
+        help="要运行的用例 (默认: 全部)",
+    )
+    parser.add_argument(
+        "--baseline", type=str, default=DEFAULT_BASELINE_PATH, help="基线文件路径"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="允许的适应度相对退化幅度，也用于耗时 / 内存提示 (默认: 0.25)",
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="用本次结果覆盖基线"
+    )
+    parser.add_argument("--output", type=str, default=None, help="把本次结果写入 JSON 文件")
+    parser.add_argument(
+        "--skip-equivalence", action="store_true", help="跳过适应度一致性检查"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if not args.skip_equivalence and not run_equivalence_check():
+        return 1
+    results = run_benchmarks(args.cases)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results)
+        return 0
+
+    regressions = compare_with_baseline(results, load_baseline(args.baseline), args.threshold)
+    if regressions:
+        logger.error("求解质量退化：")
+        for line in regressions:
+            logger.error(f"  {line}")
+        return 1
+    logger.info("全部用例均未超过退化阈值")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
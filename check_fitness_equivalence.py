@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+适应度评估一致性检查
+在固定种子的合成实例上生成随机个体及其交叉 / 变异后代，分别用
+- SchedulingGeneticAlgorithm.fitness()（逐个体全量计算）
+- IncrementalFitnessEvaluator（从亲本状态增量计算，以及从零构建状态）
+评估，要求结果在 REL_TOLERANCE / ABS_TOLERANCE 内一致：
+增量评估按差值累加软约束（含带小数的利用率惩罚），求和顺序与 fitness() 不同，允许舍入误差。
+
+默认惩罚下硬约束远超阈值，fitness() 只返回硬约束部分；
+另跑一轮把硬约束惩罚降到 -1，使软约束部分也参与比较。
+
+benchmark.py 在运行基准用例前会先调用 run_checks，不一致时基准测试以非零状态退出。
+
+用法：
+    python check_fitness_equivalence.py                # 默认规模
+    python check_fitness_equivalence.py --tasks 800 --rounds 300
+"""
+
+import argparse
+import logging
+import math
+import random
+import sys
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# 硬约束惩罚项：降为 -1 后软约束部分才会计入适应度
+HARD_PENALTY_KEYS = [
+    "teacher_conflict",
+    "class_conflict",
+    "classroom_conflict",
+    "capacity_violation",
+    "blackout_violation",
+    "feature_violation",
+    "thursday_afternoon",
+    "campus_commute",
+    "weekend_penalty",
+]
+
+# 允许的相对 / 绝对误差（只容纳浮点舍入，远小于任何一项惩罚）
+REL_TOLERANCE = 1e-9
+ABS_TOLERANCE = 1e-6
+
+
+def check_equivalence(
+    num_tasks: int, seed: int, rounds: int, penalty_scores: Dict
+) -> List[str]:
+    """运行一轮检查，返回不一致描述列表（为空表示通过）"""
+    from fitness_evaluator import IncrementalFitnessEvaluator
+    from genetic_algorithm import SchedulingGeneticAlgorithm
+    from synthetic_instance import generate_instance
+
+    data = generate_instance(num_tasks=num_tasks, seed=seed)
+    ga = SchedulingGeneticAlgorithm(
+        data, {"random_seed": seed, "penalty_scores": penalty_scores}
+    )
+    evaluator = IncrementalFitnessEvaluator(ga)
+    rng_state = random.getstate()
+    random.seed(seed)
+
+    mismatches = []
+
+    def compare(label: str, individuals, states):
+        scalar = [ga.fitness(individual) for individual in individuals]
+        for i, individual in enumerate(individuals):
+            values = {
+                "fitness": scalar[i],
+                "incremental": states[i].fitness,
+                "full_state": evaluator.full_state(individual).fitness,
+            }
+            reference = values["fitness"]
+            if not all(
+                math.isclose(
+                    value, reference, rel_tol=REL_TOLERANCE, abs_tol=ABS_TOLERANCE
+                )
+                for value in values.values()
+            ):
+                mismatches.append(f"{label} #{i}: {values}")
+
+    try:
+        population = [ga.create_individual() for _ in range(6)]
+        states = [evaluator.full_state(individual) for individual in population]
+        compare("随机个体", population, states)
+
+        for round_idx in range(rounds):
+            i, j = random.randrange(len(population)), random.randrange(len(population))
+            child1, child2 = ga.crossover(population[i], population[j])
+            children = [ga.mutate(child1), ga.mutate(child2)]
+            child_states = [
+                evaluator.evaluate(child, states[i], states[j]) for child in children
+            ]
+            compare(f"第 {round_idx} 轮后代", children, child_states)
+            population[i], states[i] = children[0], child_states[0]
+            population[j], states[j] = children[1], child_states[1]
+    finally:
+        random.setstate(rng_state)
+
+    return mismatches
+
+
+def run_checks(num_tasks: int, seed: int, rounds: int) -> List[str]:
+    """依次在默认惩罚和降低硬约束惩罚（软约束路径）下检查，返回全部不一致描述"""
+    mismatches = []
+    for label, penalty_scores in (
+        ("默认惩罚", {}),
+        ("降低硬约束惩罚（软约束路径）", {key: -1 for key in HARD_PENALTY_KEYS}),
+    ):
+        found = check_equivalence(num_tasks, seed, rounds, penalty_scores)
+        if found:
+            logger.error(f"{label}：{len(found)} 处不一致")
+        else:
+            logger.info(f"{label}：全部一致")
+        mismatches.extend(f"{label} {line}" for line in found)
+    return mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="适应度评估一致性检查")
+    parser.add_argument("--tasks", type=int, default=400, help="合成实例任务数 (默认: 400)")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子 (默认: 1)")
+    parser.add_argument("--rounds", type=int, default=100, help="交叉/变异轮数 (默认: 100)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    for name in ("genetic_algorithm", "synthetic_instance"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    mismatches = run_checks(args.tasks, args.seed, args.rounds)
+    for line in mismatches[:10]:
+        logger.error(f"  {line}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
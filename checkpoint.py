@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+进化检查点模块
+定期把种群、适应度、随机数状态、停滞计数和代数写入本地文件，
+进程重启后可以从最近一次检查点继续进化，而不必重新初始化种群。
+"""
+
+import logging
+import os
+import pickle
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from chromosome import ChromosomeCodec
+from data_models import Gene
+
+logger = logging.getLogger(__name__)
+
+# 检查点文件格式版本，格式不兼容时递增
+CHECKPOINT_VERSION = 2
+
+
+@dataclass
+class Checkpoint:
+    """一次检查点的内容
+
+    记录的是某一代评估完成、即将产生下一代时的状态：
+    恢复后用 population / fitness_scores 直接繁殖下一代，从 generation + 1 继续。
+    时间预算用完时保存的检查点不含该代的精英局部搜索，也不含结束时的后处理和最终局部搜索，
+    因此从它恢复的进程与已返回结果的那次运行并不完全一致。
+    """
+
+    generation: int
+    population: List[List[Gene]]
+    fitness_scores: List[float]
+    best_fitness: float
+    stagnation_count: int
+    random_state: Tuple
+
+
+def save_checkpoint(path: str, codec: ChromosomeCodec, checkpoint: Checkpoint):
+    """写入检查点（先写临时文件再替换，进程中途退出不会留下损坏的文件）"""
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "task_ids": codec.task_ids,
+        "teacher_ids": codec.teacher_ids,
+        "classroom_ids": codec.classroom_ids,
+        "generation": checkpoint.generation,
+        "population": [codec.pack(individual) for individual in checkpoint.population],
+        "fitness_scores": list(checkpoint.fitness_scores),
+        "best_fitness": checkpoint.best_fitness,
+        "stagnation_count": checkpoint.stagnation_count,
+        "random_state": checkpoint.random_state,
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    logger.debug(f"检查点已保存: {path}（第 {checkpoint.generation} 代）")
+
+
+def load_checkpoint(path: str, codec: ChromosomeCodec) -> Checkpoint:
+    """读取检查点；文件与当前数据的任务 / 教师 / 教室布局不一致时抛出 ValueError
+
+    种群按下标打包教师和教室，教师或教室增删后下标会错位，必须拒绝恢复。
+    """
+    with open(path, "rb") as f:
+        payload = pickle.load(f)
+
+    if payload.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(
+            f"检查点格式版本 {payload.get('version')} 与当前版本 {CHECKPOINT_VERSION} 不一致"
+        )
+    if payload["task_ids"] != codec.task_ids:
+        raise ValueError("检查点的任务列表与当前数据不一致，无法恢复")
+    if payload["teacher_ids"] != codec.teacher_ids:
+        raise ValueError("检查点的教师列表与当前数据不一致，无法恢复")
+    if payload["classroom_ids"] != codec.classroom_ids:
+        raise ValueError("检查点的教室列表与当前数据不一致，无法恢复")
+
+    return Checkpoint(
+        generation=payload["generation"],
+        population=[codec.unpack(packed) for packed in payload["population"]],
+        fitness_scores=payload["fitness_scores"],
+        best_fitness=payload["best_fitness"],
+        stagnation_count=payload["stagnation_count"],
+        random_state=payload["random_state"],
+    )
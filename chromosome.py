@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+紧凑染色体模块
+按任务下标排列的定长染色体：教师、教室、星期、节次分别存放在整数数组中，
+教师 / 教室 ID 驻留为下标，用于种群的跨进程传输和持久化。
+
+GA 内部的交叉、变异和适应度评估仍在 Gene 列表上进行：个体按不可变值使用，
+复制和交叉只复制列表中的引用，不复制 Gene 对象。把这些算子移到数组上是尚未完成的后续工作，
+见 docs/SYSTEM_DESIGN.md 的“个体表示”。
+"""
+
+from array import array
+from typing import Iterator, List, Sequence
+
+from data_models import Gene, TeachingTask
+
+
+class ChromosomeCodec:
+    """染色体编码表
+
+    由同一份数据构建的编码表在任何进程中都完全一致（ID 排序后驻留），
+    因此编码结果可以直接在主进程与工作进程之间传递。
+
+    - task_ids: 染色体第 i 位对应的任务ID（与 GA 中个体的基因顺序一致）
+    - teacher_ids / classroom_ids: 下标 -> ID
+    """
+
+    def __init__(self, tasks: Sequence[TeachingTask], classroom_ids: Sequence[str]):
+        self.task_ids: List[int] = [task.task_id for task in tasks]
+        self.task_positions = {task_id: i for i, task_id in enumerate(self.task_ids)}
+        self.teacher_ids: List[str] = sorted(
+            {teacher_id for task in tasks for teacher_id in task.teachers}
+        )
+        self.teacher_index = {t: i for i, t in enumerate(self.teacher_ids)}
+        self.classroom_ids: List[str] = sorted(classroom_ids)
+        self.classroom_index = {c: i for i, c in enumerate(self.classroom_ids)}
+
+    def encode(self, genes: Sequence[Gene]) -> "Chromosome":
+        """基因列表 -> 紧凑染色体（基因必须按 task_ids 顺序排列）"""
+        if len(genes) != len(self.task_ids):
+            raise ValueError(
+                f"基因数量 {len(genes)} 与任务数量 {len(self.task_ids)} 不一致"
+            )
+        chromosome = Chromosome(self, len(genes))
+        for i, gene in enumerate(genes):
+            if gene.task_id != self.task_ids[i]:
+                raise ValueError(
+                    f"第 {i} 个基因的任务 {gene.task_id} 与编码表任务 {self.task_ids[i]} 不一致"
+                )
+            chromosome.teachers[i] = self.teacher_index[gene.teacher_id]
+            chromosome.classrooms[i] = self.classroom_index[gene.classroom_id]
+            chromosome.weekdays[i] = gene.week_day
+            chromosome.slots[i] = gene.start_slot
+        return chromosome
+
+    def pack(self, genes: Sequence[Gene]) -> bytes:
+        """基因列表 -> 字节串（跨进程传输 / 持久化用）"""
+        return self.encode(genes).tobytes()
+
+    def unpack(self, data: bytes) -> List[Gene]:
+        """字节串 -> 基因列表"""
+        return Chromosome.frombytes(self, data).to_genes()
+
+
+class Chromosome:
+    """定长、按任务下标排列的染色体
+
+    四个并行数组：教师下标、教室下标、星期、开始节次。
+    通过下标访问时返回 Gene 视图，与 save_schedule_results 等现有接口兼容。
+    """
+
+    __slots__ = ("codec", "teachers", "classrooms", "weekdays", "slots")
+
+    def __init__(self, codec: ChromosomeCodec, length: int):
+        self.codec = codec
+        self.teachers = array("H", bytes(2 * length))
+        self.classrooms = array("H", bytes(2 * length))
+        self.weekdays = array("B", bytes(length))
+        self.slots = array("B", bytes(length))
+
+    def __len__(self) -> int:
+        return len(self.weekdays)
+
+    def __getitem__(self, i: int) -> Gene:
+        codec = self.codec
+        return Gene(
+            codec.task_ids[i],
+            codec.teacher_ids[self.teachers[i]],
+            codec.classroom_ids[self.classrooms[i]],
+            self.weekdays[i],
+            self.slots[i],
+        )
+
+    def __iter__(self) -> Iterator[Gene]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def gene_for_task(self, task_id: int) -> Gene:
+        """按任务ID取基因（O(1)）"""
+        return self[self.codec.task_positions[task_id]]
+
+    def to_genes(self) -> List[Gene]:
+        return list(self)
+
+    def copy(self) -> "Chromosome":
+        clone = Chromosome.__new__(Chromosome)
+        clone.codec = self.codec
+        clone.teachers = array("H", self.teachers)
+        clone.classrooms = array("H", self.classrooms)
+        clone.weekdays = array("B", self.weekdays)
+        clone.slots = array("B", self.slots)
+        return clone
+
+    def tobytes(self) -> bytes:
+        return (
+            self.teachers.tobytes()
+            + self.classrooms.tobytes()
+            + self.weekdays.tobytes()
+            + self.slots.tobytes()
+        )
+
+    @classmethod
+    def frombytes(cls, codec: ChromosomeCodec, data: bytes) -> "Chromosome":
+        length = len(codec.task_ids)
+        if len(data) != 6 * length:
+            raise ValueError("染色体数据长度与编码表不一致")
+        chromosome = cls.__new__(cls)
+        chromosome.codec = codec
+        chromosome.teachers = array("H")
+        chromosome.teachers.frombytes(data[: 2 * length])
+        chromosome.classrooms = array("H")
+        chromosome.classrooms.frombytes(data[2 * length : 4 * length])
+        chromosome.weekdays = array("B", data[4 * length : 5 * length])
+        chromosome.slots = array("B", data[5 * length :])
+        return chromosome
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+冲突集驱动的变异模块
+均匀变异对每个基因独立掷骰子，无冲突的基因和有冲突的基因被扰动的概率相同，
+smart_repair 还要先扫描全部基因才能知道当前基因是否冲突。
+
+这里为每个待变异个体从零建立一次 (实体, 星期, 节次) -> 基因下标 的占用索引，
+扫描得到当前处在硬约束冲突中的基因集合（冲突集）；索引和冲突集不会从亲本继承，
+每个子代都要付出一次 O(基因数 × 节数) 的构建开销：
+- 冲突集（时间冲突、单基因硬约束、校区通勤）中的基因按 conflict_repair_rate 的概率做修复移动：
+  在候选域中采样时间、在合适教室中找空闲教室，选冲突最少的放置（找到零冲突的放置立即采用）；
+- 冲突集之外的基因只按 exploration_rate 的小概率做原有的随机变异，保留探索能力。
+同一子代内的每次移动只增量更新占用索引，修复时的冲突计数只查被移动基因占用的格子；
+冲突集本身在移动后不重算，修复前会重新计数，已被顺带消除冲突的基因直接跳过。
+"""
+
+import random
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from data_models import Gene
+from occupancy import GRID_SIZE, SLOTS_PER_DAY
+
+# 变异模式
+MUTATION_UNIFORM = "uniform"
+MUTATION_CONFLICT_SET = "conflict_set"
+
+# 修复移动在候选域内最多尝试的时间数
+MAX_REPAIR_TIMES = 50
+# 每个候选时间最多检查的空闲教室数（教室列表已按容量匹配程度排序）
+MAX_REPAIR_ROOMS = 10
+# 单基因硬约束缓存的最大条目数，超过后清空重建
+MAX_STATIC_CACHE = 200000
+
+
+class ConflictSetMutator:
+    """冲突集驱动的变异算子
+
+    实体编号：教师 / 班级 / 教室分别使用 ProblemInstance 中的整数下标，
+    依次偏移后展平为一个整数，与格子下标合成占用索引的键 entity * GRID_SIZE + cell。
+    """
+
+    def __init__(self, ga, repair_rate: float = 1.0, exploration_rate: float = 0.02):
+        self.ga = ga
+        self.repair_rate = repair_rate
+        self.exploration_rate = exploration_rate
+
+        instance = ga.instance
+        class_offset = len(instance.teacher_ids)
+        self.room_offset = class_offset + len(instance.class_ids)
+        self.instance = instance
+        self.room_index = instance.room_index
+
+        # 按个体布局（ga.schedulable_tasks）预先展开每个位置的周次、节数和教师 / 班级实体
+        self.position_weeks: List[int] = []
+        self.position_slots: List[int] = []
+        self.position_entities: List[Tuple[int, ...]] = []
+        self.position_teachers: List[Tuple[int, ...]] = []
+        for task in ga.schedulable_tasks:
+            t = instance.task_index[task.task_id]
+            self.position_weeks.append(instance.task_weeks[t])
+            self.position_slots.append(instance.task_slots[t])
+            self.position_teachers.append(instance.task_teachers[t])
+            self.position_entities.append(
+                instance.task_teachers[t]
+                + tuple(class_offset + c for c in instance.task_classes[t])
+            )
+
+        # 可移动（未锁定）的基因下标
+        self.free_positions = [
+            idx
+            for idx, task in enumerate(ga.schedulable_tasks)
+            if task.task_id not in ga.pinned_genes
+        ]
+
+        # 单基因硬约束（容量、设施、黑名单等）是否违反，按 (任务, 教室, 星期, 节次) 缓存
+        self._static_violations: Dict[tuple, bool] = {}
+
+    def mutate(self, individual: List[Gene]) -> List[Gene]:
+        """对个体做一次冲突集驱动的变异，返回新个体（不修改输入）"""
+        ga = self.ga
+        telemetry = ga.telemetry
+        mutated = individual[:]
+        cells = self._build_cells(mutated)
+        conflicted = self._conflicted_positions(mutated, cells)
+
+        # 修复冲突集中的基因（随机顺序，避免总是先动排在前面的任务）
+        repair_order = list(conflicted)
+        random.shuffle(repair_order)
+        for idx in repair_order:
+            if random.random() >= self.repair_rate:
+                continue
+            new_gene = self._repair(mutated, cells, idx)
+            if new_gene is not None:
+                self._move(mutated, cells, idx, new_gene)
+            if telemetry is not None:
+                telemetry.record_mutation("conflict_repair", new_gene is not None)
+
+        # 冲突集之外的基因小概率随机探索
+        exploration_rate = self.exploration_rate
+        for idx in self.free_positions:
+            if idx in conflicted or random.random() >= exploration_rate:
+                continue
+            gene = mutated[idx]
+            mutation_type = random.choice(("teacher", "time", "classroom"))
+            new_gene = ga._random_gene_mutation(
+                gene, ga.task_dict[gene.task_id], mutation_type
+            )
+            if new_gene is not gene:
+                self._move(mutated, cells, idx, new_gene)
+            if telemetry is not None:
+                telemetry.record_mutation(mutation_type, new_gene != gene)
+
+        return mutated
+
+    # ------------------------------------------------------------------
+    # 占用索引
+    # ------------------------------------------------------------------
+
+    def _time_keys(self, idx: int, weekday: int, start_slot: int) -> List[int]:
+        """基因在给定时间下其教师 / 班级占用的索引键"""
+        base = weekday * SLOTS_PER_DAY + start_slot
+        cells = range(base, base + self.position_slots[idx])
+        return [
+            entity * GRID_SIZE + cell
+            for entity in self.position_entities[idx]
+            for cell in cells
+        ]
+
+    def _room_keys(
+        self, idx: int, weekday: int, start_slot: int, classroom_id: str
+    ) -> List[int]:
+        """基因在给定时间下其教室占用的索引键"""
+        base = weekday * SLOTS_PER_DAY + start_slot
+        offset = (self.room_offset + self.room_index[classroom_id]) * GRID_SIZE
+        return list(range(offset + base, offset + base + self.position_slots[idx]))
+
+    def _gene_keys(self, idx: int, gene: Gene) -> List[int]:
+        """基因占用的全部索引键"""
+        return self._time_keys(idx, gene.week_day, gene.start_slot) + self._room_keys(
+            idx, gene.week_day, gene.start_slot, gene.classroom_id
+        )
+
+    def _build_cells(self, individual: List[Gene]) -> Dict[int, List[int]]:
+        cells = defaultdict(list)
+        for idx, gene in enumerate(individual):
+            for key in self._gene_keys(idx, gene):
+                cells[key].append(idx)
+        return cells
+
+    def _conflicted_positions(
+        self, individual: List[Gene], cells: Dict[int, List[int]]
+    ) -> Set[int]:
+        """处在时间冲突、校区通勤中，或自身违反单基因硬约束的未锁定基因下标"""
+        weeks = self.position_weeks
+        conflicted = set()
+
+        # 同一教师同一天涉及多个校区：当天该教师的课都算在冲突集中
+        teacher_days = defaultdict(list)
+        for idx, gene in enumerate(individual):
+            for teacher in self.position_teachers[idx]:
+                teacher_days[(teacher, gene.week_day)].append(idx)
+        commute_count = self.instance.commute_count
+        for positions in teacher_days.values():
+            if len(positions) > 1 and commute_count(
+                individual[idx].classroom_id for idx in positions
+            ):
+                conflicted.update(positions)
+
+        for occupants in cells.values():
+            if len(occupants) < 2:
+                continue
+            for i, a in enumerate(occupants):
+                for b in occupants[i + 1 :]:
+                    if weeks[a] & weeks[b]:
+                        conflicted.add(a)
+                        conflicted.add(b)
+
+        for idx in self.free_positions:
+            if idx not in conflicted and self._violates_static(individual[idx]):
+                conflicted.add(idx)
+        conflicted.intersection_update(self.free_positions)
+        return conflicted
+
+    def _violates_static(self, gene: Gene) -> bool:
+        key = (gene.task_id, gene.classroom_id, gene.week_day, gene.start_slot)
+        violated = self._static_violations.get(key)
+        if violated is None:
+            if len(self._static_violations) >= MAX_STATIC_CACHE:
+                self._static_violations.clear()
+            violated = self._static_violations[key] = (
+                self.ga._gene_hard_penalty(gene, self.ga.task_dict[gene.task_id]) < 0
+            )
+        return violated
+
+    def _commute_conflicts(
+        self,
+        individual: List[Gene],
+        cells: Dict[int, List[int]],
+        idx: int,
+        weekday: int,
+        classroom_id: str,
+    ) -> int:
+        """基因 idx 在 weekday 到 classroom_id 上课时，其教师当天的校区通勤次数"""
+        rooms = {classroom_id}
+        for teacher in self.position_teachers[idx]:
+            base = teacher * GRID_SIZE + weekday * SLOTS_PER_DAY
+            for key in range(base + 1, base + SLOTS_PER_DAY):
+                for other in cells.get(key, ()):
+                    if other != idx:
+                        rooms.add(individual[other].classroom_id)
+        return self.instance.commute_count(rooms)
+
+    def _count_conflicts(
+        self, cells: Dict[int, List[int]], idx: int, keys: List[int]
+    ) -> int:
+        """基因 idx 占用 keys 时与其他基因冲突的格子数"""
+        weeks = self.position_weeks
+        week_mask = weeks[idx]
+        count = 0
+        for key in keys:
+            for other in cells.get(key, ()):
+                if other != idx and weeks[other] & week_mask:
+                    count += 1
+        return count
+
+    def _move(
+        self,
+        individual: List[Gene],
+        cells: Dict[int, List[int]],
+        idx: int,
+        new_gene: Gene,
+    ):
+        """把基因 idx 换成 new_gene 并更新占用索引"""
+        for key in self._gene_keys(idx, individual[idx]):
+            cells[key].remove(idx)
+        for key in self._gene_keys(idx, new_gene):
+            cells[key].append(idx)
+        individual[idx] = new_gene
+
+    # ------------------------------------------------------------------
+    # 修复移动
+    # ------------------------------------------------------------------
+
+    def _repair(
+        self, individual: List[Gene], cells: Dict[int, List[int]], idx: int
+    ) -> Optional[Gene]:
+        """为冲突基因寻找冲突更少的放置（最小冲突），找不到更好的返回 None
+
+        候选时间取自任务的候选域（已避开周末、周四下午和黑名单），
+        每个时间优先保留原教室，原教室被占用时按顺序找合适的空闲教室。
+        """
+        ga = self.ga
+        gene = individual[idx]
+        task_id = gene.task_id
+        if self._violates_static(gene):
+            best_conflicts = float("inf")
+        else:
+            best_conflicts = self._count_conflicts(
+                cells, idx, self._gene_keys(idx, gene)
+            ) + self._commute_conflicts(
+                individual, cells, idx, gene.week_day, gene.classroom_id
+            )
+            if best_conflicts == 0:
+                return None  # 此前的修复已顺带消除了它的冲突
+
+        rooms = ga.task_classrooms[task_id] or ga.task_mutation_classrooms[task_id]
+        candidates = [gene.classroom_id] + [
+            room.classroom_id
+            for room in rooms[:MAX_REPAIR_ROOMS]
+            if room.classroom_id != gene.classroom_id
+        ]
+        time_domain = ga.task_time_domains[task_id]
+        best = None
+        for weekday, start_slot in random.sample(
+            time_domain, min(MAX_REPAIR_TIMES, len(time_domain))
+        ):
+            # 教师 / 班级冲突与教室无关，先单独计算
+            time_conflicts = self._count_conflicts(
+                cells, idx, self._time_keys(idx, weekday, start_slot)
+            )
+            if time_conflicts >= best_conflicts:
+                continue
+
+            commute_by_campus = {}
+            for classroom_id in candidates:
+                candidate = Gene(
+                    task_id, gene.teacher_id, classroom_id, weekday, start_slot
+                )
+                if self._violates_static(candidate):
+                    continue
+                campus = self.instance.campus_of(classroom_id)
+                commute = commute_by_campus.get(campus)
+                if commute is None:
+                    commute = commute_by_campus[campus] = self._commute_conflicts(
+                        individual, cells, idx, weekday, classroom_id
+                    )
+                conflicts = (
+                    time_conflicts
+                    + commute
+                    + self._count_conflicts(
+                        cells,
+                        idx,
+                        self._room_keys(idx, weekday, start_slot, classroom_id),
+                    )
+                )
+                if conflicts < best_conflicts:
+                    best, best_conflicts = candidate, conflicts
+                    if conflicts == time_conflicts:
+                        break  # 该时间下教室和校区都已无冲突
+            if best_conflicts == 0:
+                break
+
+        return best
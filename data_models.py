@@ -212,6 +212,9 @@ class ScheduleVersion:
 class Gene:
     """基因 - 代表一个具体的排课安排"""
 
+    # 种群中基因数量巨大，去掉每个实例的 __dict__ 以节省内存
+    __slots__ = ("task_id", "teacher_id", "classroom_id", "week_day", "start_slot")
+
     task_id: int
     teacher_id: str
     classroom_id: str
@@ -243,6 +246,29 @@ TIME_WINDOWS = {
 AVAILABLE_SLOTS_2 = [(1, 2), (3, 4), (6, 7), (9, 10), (11, 12)]
 
 
+# 学期周次：学校最多17周，周次 w 对应位图中的第 w 位
+SEMESTER_WEEKS = 17
+ALL_WEEKS_MASK = ((1 << SEMESTER_WEEKS) - 1) << 1
+
+
+def weeks_to_mask(weeks: Optional[Set[int]]) -> int:
+    """
+    将周次集合编码为整数位图
+
+    Args:
+        weeks: 周次集合；为空时视为全学期上课（保守处理）
+
+    Returns:
+        周次位图，两门课周次是否重叠只需一次按位与
+    """
+    if not weeks:
+        return ALL_WEEKS_MASK
+    mask = 0
+    for week in weeks:
+        mask |= 1 << week
+    return mask
+
+
 def get_valid_time_slots(slots_count: int) -> List[tuple]:
     """
     根据课程节数获取有效的时间块
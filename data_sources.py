@@ -0,0 +1,573 @@
+# -*- coding: utf-8 -*-
+"""
+数据源模块
+DataLoader 只依赖连接器的 execute_query / execute_insert / execute_write / execute_batch_insert 接口，
+本模块提供 MySQL 以外的两种数据源，使实验、基准测试不需要运行 MySQL：
+
+- SQLiteConnector：与 DatabaseConnector 接口一致的 SQLite 连接器，
+  直接交给 DataLoader 使用（SQL 中的 %s 占位符和 ON DUPLICATE KEY UPDATE 自动转换）；
+- InMemoryDataLoader：从快照文件（pickle 的 data 字典）提供 load_all_data()，完全不访问数据库；
+- SnapshotDataLoader：带快照缓存的 DataLoader，按学期、年级和源数据表的变化标记缓存 load_all_data() 的结果，
+  源数据表变化后快照自动失效（SQLite 用触发器维护的修改计数，MySQL 用 CHECKSUM TABLE）。
+
+用法：
+    python data_sources.py --export-sqlite school.db                    # 把 MySQL 数据复制到 SQLite 文件
+    python data_sources.py --snapshot 2025-1.pkl --semester 2025-2026-1  # 把某学期数据写成快照文件
+    python suan2.py --version 1 --snapshot-dir .snapshots                 # 排课时使用快照缓存
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Union
+
+from data_models import Gene, Schedule, TeachingTask
+from db_connector import DataLoader
+
+logger = logging.getLogger(__name__)
+
+# 快照文件格式版本，格式不兼容时递增
+SNAPSHOT_VERSION = 1
+
+# 与 final.sql 对应的 SQLite 表结构（只包含排课读写用到的表和列）
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS campuses (
+    campus_id TEXT PRIMARY KEY,
+    campus_name TEXT NOT NULL,
+    address TEXT
+);
+CREATE TABLE IF NOT EXISTS departments (
+    department_id TEXT PRIMARY KEY,
+    department_name TEXT NOT NULL,
+    campus_id TEXT
+);
+CREATE TABLE IF NOT EXISTS majors (
+    major_id TEXT PRIMARY KEY,
+    major_name TEXT NOT NULL,
+    department_id TEXT NOT NULL,
+    notes TEXT
+);
+CREATE TABLE IF NOT EXISTS classes (
+    class_id TEXT PRIMARY KEY,
+    class_name TEXT NOT NULL,
+    grade INTEGER NOT NULL,
+    student_count INTEGER NOT NULL,
+    major_id TEXT NOT NULL,
+    education_system INTEGER
+);
+CREATE TABLE IF NOT EXISTS teachers (
+    teacher_id TEXT PRIMARY KEY,
+    teacher_name TEXT NOT NULL,
+    department_id TEXT,
+    gender TEXT,
+    is_external INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS courses (
+    course_id TEXT PRIMARY KEY,
+    course_name TEXT NOT NULL,
+    credits REAL,
+    total_hours INTEGER,
+    notes TEXT
+);
+CREATE TABLE IF NOT EXISTS classroom_features (
+    feature_id TEXT PRIMARY KEY,
+    feature_name TEXT NOT NULL,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS classrooms (
+    classroom_id TEXT PRIMARY KEY,
+    classroom_name TEXT NOT NULL,
+    building_name TEXT,
+    campus_id TEXT NOT NULL,
+    classroom_type TEXT,
+    capacity INTEGER NOT NULL,
+    is_available INTEGER DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS classroom_has_features (
+    classroom_id TEXT NOT NULL,
+    feature_id TEXT NOT NULL,
+    PRIMARY KEY (classroom_id, feature_id)
+);
+CREATE TABLE IF NOT EXISTS course_offerings (
+    offering_id INTEGER PRIMARY KEY,
+    semester TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    course_nature TEXT DEFAULT '必修',
+    student_count_estimate INTEGER,
+    start_week INTEGER,
+    end_week INTEGER,
+    week_pattern TEXT NOT NULL DEFAULT 'CONTINUOUS'
+);
+CREATE TABLE IF NOT EXISTS offering_classes (
+    offering_id INTEGER NOT NULL,
+    class_id TEXT NOT NULL,
+    PRIMARY KEY (offering_id, class_id)
+);
+CREATE TABLE IF NOT EXISTS offering_teachers (
+    offering_id INTEGER NOT NULL,
+    teacher_id TEXT NOT NULL,
+    role TEXT DEFAULT '主讲',
+    start_week INTEGER,
+    end_week INTEGER,
+    PRIMARY KEY (offering_id, teacher_id)
+);
+CREATE TABLE IF NOT EXISTS offering_requires_features (
+    offering_id INTEGER NOT NULL,
+    feature_id TEXT NOT NULL,
+    is_mandatory INTEGER DEFAULT 1,
+    PRIMARY KEY (offering_id, feature_id)
+);
+CREATE TABLE IF NOT EXISTS offering_weeks (
+    offering_id INTEGER NOT NULL,
+    week_number INTEGER NOT NULL,
+    PRIMARY KEY (offering_id, week_number)
+);
+CREATE TABLE IF NOT EXISTS teaching_groups (
+    group_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    offering_id INTEGER NOT NULL,
+    group_name TEXT NOT NULL,
+    student_count INTEGER
+);
+CREATE TABLE IF NOT EXISTS teaching_tasks (
+    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    offering_id INTEGER NOT NULL,
+    group_id INTEGER,
+    task_sequence INTEGER NOT NULL,
+    slots_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS teacher_blackout_times (
+    blackout_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    teacher_id TEXT NOT NULL,
+    semester TEXT NOT NULL,
+    weekday INTEGER NOT NULL,
+    start_slot INTEGER NOT NULL,
+    end_slot INTEGER NOT NULL,
+    reason TEXT
+);
+CREATE TABLE IF NOT EXISTS teacher_preferences (
+    preference_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    offering_id INTEGER NOT NULL,
+    teacher_id TEXT NOT NULL,
+    preference_type TEXT NOT NULL,
+    weekday INTEGER NOT NULL,
+    start_slot INTEGER NOT NULL,
+    end_slot INTEGER NOT NULL,
+    penalty_score INTEGER NOT NULL DEFAULT 100
+);
+CREATE TABLE IF NOT EXISTS task_relation_constraints (
+    constraint_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    offering_id INTEGER NOT NULL,
+    task_sequence_a INTEGER NOT NULL,
+    task_sequence_b INTEGER NOT NULL,
+    constraint_type TEXT NOT NULL,
+    constraint_value INTEGER,
+    penalty_score INTEGER NOT NULL DEFAULT 100
+);
+CREATE TABLE IF NOT EXISTS schedule_versions (
+    version_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    semester TEXT NOT NULL,
+    version_name TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'draft',
+    description TEXT,
+    created_by TEXT
+);
+CREATE TABLE IF NOT EXISTS schedules (
+    schedule_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    version_id INTEGER NOT NULL,
+    task_id INTEGER NOT NULL,
+    classroom_id TEXT NOT NULL,
+    week_day INTEGER NOT NULL,
+    start_slot INTEGER NOT NULL,
+    end_slot INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_schedules_version ON schedules (version_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_offering ON teaching_tasks (offering_id);
+"""
+
+# SQLite 表（按 SQLITE_SCHEMA 中的顺序，也是复制数据时的顺序）
+SQLITE_TABLES = re.findall(r"CREATE TABLE IF NOT EXISTS (\w+)", SQLITE_SCHEMA)
+
+# 快照依赖的源数据表（load_all_data() 读取的表），排课结果表的写入不会使快照失效
+SOURCE_TABLES = [t for t in SQLITE_TABLES if t not in ("schedule_versions", "schedules")]
+
+# 源数据表的修改计数：每张源数据表的增删改由触发器累加计数，
+# 另存一行随机的数据库标识，区分内容不同但计数恰好相同的两个数据库文件
+SOURCE_VERSION_TABLE = "source_table_versions"
+DATABASE_ID_KEY = "__database_id__"
+SOURCE_VERSION_SCHEMA = "\n".join(
+    [
+        f"CREATE TABLE IF NOT EXISTS {SOURCE_VERSION_TABLE} ("
+        "table_name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0);",
+        f"INSERT OR IGNORE INTO {SOURCE_VERSION_TABLE} VALUES ('{DATABASE_ID_KEY}', random());",
+    ]
+    + [
+        f"INSERT OR IGNORE INTO {SOURCE_VERSION_TABLE} VALUES ('{table}', 0);"
+        for table in SOURCE_TABLES
+    ]
+    + [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_version "
+        f"AFTER {event} ON {table} BEGIN "
+        f"UPDATE {SOURCE_VERSION_TABLE} SET version = version + 1 "
+        f"WHERE table_name = '{table}'; END;"
+        for table in SOURCE_TABLES
+        for event in ("INSERT", "UPDATE", "DELETE")
+    ]
+)
+
+_UPSERT_PATTERN = re.compile(r"\s+ON\s+DUPLICATE\s+KEY\s+UPDATE\s+.*$", re.I | re.S)
+
+
+def _to_sqlite(query: str) -> str:
+    """把 MySQL 风格的 SQL 转为 SQLite：%s 占位符 -> ?，ON DUPLICATE KEY UPDATE -> INSERT OR REPLACE"""
+    if _UPSERT_PATTERN.search(query):
+        query = _UPSERT_PATTERN.sub("", query)
+        query = re.sub(r"^\s*INSERT\s+INTO", "INSERT OR REPLACE INTO", query, flags=re.I)
+    return query.replace("%s", "?")
+
+
+def _to_sqlite_value(value):
+    """MySQL 驱动返回的 Decimal / 日期转为 SQLite 可直接存储的类型"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class SQLiteConnector:
+    """SQLite 连接器（接口与 DatabaseConnector 一致）"""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.connection = None
+
+    def connect(self):
+        """建立数据库连接"""
+        self.connection = sqlite3.connect(self.path)
+        self.connection.row_factory = sqlite3.Row
+        logger.info(f"SQLite 数据库已打开: {self.path}")
+
+    def disconnect(self):
+        """关闭数据库连接"""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+            logger.info("SQLite 数据库已关闭")
+
+    def create_schema(self):
+        """创建排课所需的表和源数据表的修改计数触发器（已存在的表和触发器不受影响）"""
+        if not self.connection:
+            self.connect()
+        self.connection.executescript(SQLITE_SCHEMA + SOURCE_VERSION_SCHEMA)
+        self.connection.commit()
+
+    def table_checksums(self, tables: List[str]) -> Dict[str, str]:
+        """各表的变化标记：数据库标识 + 触发器维护的修改计数（一次小查询，与数据量无关）
+
+        修改计数表不存在时（之前创建的数据库文件）先补建计数表和触发器，
+        之后对源数据表的任何增删改（包括绕过本程序直接修改数据库）都会使计数变化。
+        """
+        if not self.connection:
+            self.connect()
+        exists = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (SOURCE_VERSION_TABLE,),
+        ).fetchone()
+        if not exists:
+            self.create_schema()
+        versions = {
+            row["table_name"]: row["version"]
+            for row in self.connection.execute(
+                f"SELECT table_name, version FROM {SOURCE_VERSION_TABLE}"
+            )
+        }
+        database_id = versions[DATABASE_ID_KEY]
+        return {table: f"{database_id}:{versions.get(table, 0)}" for table in tables}
+
+    def execute_query(self, query: str, params: tuple = None) -> List[Dict]:
+        """执行查询语句"""
+        if not self.connection:
+            self.connect()
+
+        try:
+            cursor = self.connection.execute(_to_sqlite(query), params or ())
+            return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"查询执行失败: {query}, 错误: {e}")
+            raise
+
+    def execute_insert(self, query: str, params: tuple = None) -> int:
+        """执行插入语句"""
+        if not self.connection:
+            self.connect()
+
+        try:
+            cursor = self.connection.execute(_to_sqlite(query), params or ())
+            self.connection.commit()
+            return cursor.lastrowid
+        except Exception as e:
+            logger.error(f"插入执行失败: {query}, 错误: {e}")
+            self.connection.rollback()
+            raise
+
+    def execute_write(self, query: str, params: tuple = None) -> int:
+        """执行写操作（UPDATE / DELETE），返回影响行数"""
+        if not self.connection:
+            self.connect()
+
+        try:
+            cursor = self.connection.execute(_to_sqlite(query), params or ())
+            self.connection.commit()
+            return cursor.rowcount
+        except Exception as e:
+            logger.error(f"写操作执行失败: {query}, 错误: {e}")
+            self.connection.rollback()
+            raise
+
+    def execute_batch_insert(self, query: str, params_list: List[tuple]):
+        """批量插入"""
+        if not self.connection:
+            self.connect()
+
+        try:
+            self.connection.executemany(_to_sqlite(query), params_list)
+            self.connection.commit()
+            logger.info(f"批量插入 {len(params_list)} 条记录成功")
+        except Exception as e:
+            logger.error(f"批量插入失败: {e}")
+            self.connection.rollback()
+            raise
+
+
+def copy_tables(source, target: SQLiteConnector, tables: List[str] = None):
+    """把 source 连接器（通常是 MySQL）中的表复制到 SQLite，只复制 SQLite 表结构中存在的列"""
+    target.create_schema()
+    for table in tables or SQLITE_TABLES:
+        columns = [
+            row["name"] for row in target.execute_query(f"PRAGMA table_info({table})")
+        ]
+        rows = source.execute_query(f"SELECT {', '.join(columns)} FROM {table}")
+        if rows:
+            target.execute_batch_insert(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(['?'] * len(columns))})",
+                [tuple(_to_sqlite_value(row[c]) for c in columns) for row in rows],
+            )
+        logger.info(f"已复制 {table}: {len(rows)} 行")
+
+
+def save_snapshot(data: Dict, path: str, fingerprint: str = None):
+    """把 load_all_data() 的结果写成快照文件（先写临时文件再替换）
+
+    Args:
+        fingerprint: 生成快照时源数据表的指纹（见 source_fingerprint），随快照一起保存
+    """
+    payload = {"version": SNAPSHOT_VERSION, "fingerprint": fingerprint, "data": data}
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    logger.info(f"快照已保存: {path}（{len(data['teaching_tasks'])} 个教学任务）")
+
+
+def load_snapshot(path: str) -> Dict:
+    """读取快照文件；格式版本不一致时抛出 ValueError"""
+    with open(path, "rb") as f:
+        payload = pickle.load(f)
+    if payload.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"快照格式版本 {payload.get('version')} 与当前版本 {SNAPSHOT_VERSION} 不一致"
+        )
+    return payload["data"]
+
+
+def source_fingerprint(db) -> str:
+    """源数据表的指纹：各表变化标记的哈希，任一表内容变化指纹即变化"""
+    checksums = db.table_checksums(SOURCE_TABLES)
+    text = json.dumps(sorted(checksums.items()))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def snapshot_key(semester: str, grades: List[int] = None) -> str:
+    """快照文件名前缀：学期 + 年级（年级顺序无关）"""
+    grade_part = "-".join(str(g) for g in sorted(set(grades))) if grades else "all"
+    return f"{semester}_{grade_part}".replace(os.sep, "_")
+
+
+class SnapshotDataLoader:
+    """带快照缓存的数据加载器：接口与 DataLoader 一致
+
+    load_all_data() 先用一次变化标记查询计算源数据表的指纹，快照目录中存在同一学期、年级、指纹的快照时
+    直接读取（一次文件读取，不再执行十几条查询）；否则从数据库加载、写入新快照并删除该学期和年级的旧快照。
+    排课结果的读写直接转交 DataLoader。
+    """
+
+    def __init__(self, db_connector, cache_dir: str):
+        self.db = db_connector
+        self.loader = DataLoader(db_connector)
+        self.cache_dir = cache_dir
+
+    def load_all_data(self, semester: str, grades: List[int] = None) -> Dict:
+        key = snapshot_key(semester, grades)
+        fingerprint = source_fingerprint(self.db)
+        path = os.path.join(self.cache_dir, f"{key}_{fingerprint}.pkl")
+
+        if os.path.exists(path):
+            try:
+                data = load_snapshot(path)
+                logger.info(f"使用快照: {path}（{len(data['teaching_tasks'])} 个教学任务）")
+                return data
+            except Exception as e:
+                logger.warning(f"快照读取失败，重新从数据库加载: {e}")
+
+        data = self.loader.load_all_data(semester, grades)
+        save_snapshot(data, path, fingerprint)
+        pattern = os.path.join(glob.escape(self.cache_dir), f"{glob.escape(key)}_*.pkl")
+        for stale in glob.glob(pattern):
+            if os.path.abspath(stale) != os.path.abspath(path):
+                os.remove(stale)
+                logger.info(f"源数据已变化，删除旧快照: {stale}")
+        return data
+
+    def save_schedule_results(
+        self, version_id: int, genes: List[Gene], tasks: Dict[int, TeachingTask]
+    ):
+        self.loader.save_schedule_results(version_id, genes, tasks)
+
+    def load_schedules(self, version_id: int) -> List[Schedule]:
+        return self.loader.load_schedules(version_id)
+
+
+class InMemoryDataLoader:
+    """内存数据源：接口与 DataLoader 一致，数据来自快照文件或现成的 data 字典
+
+    每次 load_all_data() 返回一份独立的副本，调用方修改任务对象不会影响后续加载；
+    学期和年级过滤规则与 DataLoader 相同。排课结果保存在内存中，可供 load_schedules() 热启动读取。
+    """
+
+    def __init__(self, source: Union[str, Dict]):
+        data = load_snapshot(source) if isinstance(source, str) else source
+        # 以序列化形式保存，复制比 deepcopy 快得多
+        self._payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        self.schedules: Dict[int, List[Schedule]] = {}
+
+    def load_all_data(self, semester: str, grades: List[int] = None) -> Dict:
+        """加载指定学期（和年级）的排课数据"""
+        data = pickle.loads(self._payload)
+
+        offerings = {
+            oid: o for oid, o in data["course_offerings"].items() if o.semester == semester
+        }
+        data["course_offerings"] = offerings
+        data["teaching_tasks"] = [
+            t for t in data["teaching_tasks"] if t.offering_id in offerings
+        ]
+        data["teacher_blackout_times"] = [
+            b for b in data["teacher_blackout_times"] if b.semester == semester
+        ]
+        data["task_relations"] = [
+            r for r in data["task_relations"] if r.offering_id in offerings
+        ]
+
+        if grades:
+            data["classes"] = {
+                cid: c for cid, c in data["classes"].items() if c.grade in grades
+            }
+            kept = []
+            for task in data["teaching_tasks"]:
+                task.classes = [c for c in task.classes if c in data["classes"]]
+                if not task.classes:
+                    continue
+                if not (task.group_id and task.group_id in data["teaching_groups"]):
+                    task.student_count = sum(
+                        data["classes"][c].student_count or 0 for c in task.classes
+                    )
+                kept.append(task)
+            if len(kept) < len(data["teaching_tasks"]):
+                logger.info(
+                    f"移除了 {len(data['teaching_tasks']) - len(kept)} 个不符合年级条件的任务"
+                )
+            data["teaching_tasks"] = kept
+
+        logger.info(
+            f"从内存数据源加载学期 {semester}：{len(data['teaching_tasks'])} 个教学任务"
+        )
+        return data
+
+    def save_schedule_results(
+        self, version_id: int, genes: List[Gene], tasks: Dict[int, TeachingTask]
+    ):
+        """保存排课结果（内存中）"""
+        self.schedules[version_id] = [
+            Schedule(
+                i,
+                version_id,
+                gene.task_id,
+                gene.classroom_id,
+                gene.week_day,
+                gene.start_slot,
+                gene.start_slot + tasks[gene.task_id].slots_count - 1,
+            )
+            for i, gene in enumerate(genes, start=1)
+        ]
+        logger.info(f"成功保存 {len(genes)} 条排课结果（内存）")
+
+    def load_schedules(self, version_id: int) -> List[Schedule]:
+        """加载某个排课版本已保存的排课结果"""
+        return list(self.schedules.get(version_id, []))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="导出 SQLite 数据库 / 学期数据快照")
+    parser.add_argument("--export-sqlite", type=str, help="把 MySQL 中的排课数据复制到该 SQLite 文件")
+    parser.add_argument("--snapshot", type=str, help="把某学期的 load_all_data() 结果写入该快照文件")
+    parser.add_argument("--semester", type=str, help="快照的学期（与 --snapshot 一起使用）")
+    parser.add_argument(
+        "--grades", type=str, default=None, help="快照的年级范围（格式：2023,2024；默认所有年级）"
+    )
+    parser.add_argument(
+        "--sqlite", type=str, default=None, help="快照的数据来源改为该 SQLite 文件（默认 MySQL）"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if not args.export_sqlite and not args.snapshot:
+        parser.error("需要指定 --export-sqlite 或 --snapshot")
+    if args.snapshot and not args.semester:
+        parser.error("--snapshot 需要同时指定 --semester")
+
+    if args.sqlite:
+        source = SQLiteConnector(args.sqlite)
+    else:
+        from db_config import get_db_config
+        from db_connector import DatabaseConnector
+
+        source = DatabaseConnector(**get_db_config())
+    source.connect()
+    try:
+        if args.export_sqlite:
+            target = SQLiteConnector(args.export_sqlite)
+            try:
+                copy_tables(source, target)
+            finally:
+                target.disconnect()
+        if args.snapshot:
+            grades = [int(g) for g in args.grades.split(",")] if args.grades else None
+            data = DataLoader(source).load_all_data(args.semester, grades)
+            save_snapshot(data, args.snapshot, source_fingerprint(source))
+    finally:
+        source.disconnect()
+
+
+if __name__ == "__main__":
+    main()
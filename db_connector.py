@@ -4,11 +4,15 @@
 负责所有数据库交互操作
 """
 
-import pymysql
 import logging
 from typing import List, Dict, Set, Optional, Tuple
 from data_models import *
 
+try:
+    import pymysql
+except ImportError:  # 只使用 SQLite / 快照数据源（data_sources.py）时不需要 pymysql
+    pymysql = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +40,8 @@ class DatabaseConnector:
 
     def connect(self):
         """建立数据库连接"""
+        if pymysql is None:
+            raise ImportError("连接 MySQL 需要安装 pymysql：pip install pymysql")
         try:
             self.connection = pymysql.connect(**self.connection_config)
             logger.info("数据库连接成功")
@@ -108,19 +114,29 @@ class DatabaseConnector:
             raise
 
 
+    def table_checksums(self, tables: List[str]) -> Dict[str, str]:
+        """各表的内容校验和（CHECKSUM TABLE，在服务器端计算，用于判断数据是否变化）"""
+        rows = self.execute_query(f"CHECKSUM TABLE {', '.join(tables)}")
+        return {row["Table"].split(".")[-1]: str(row["Checksum"]) for row in rows}
+
+
 class DataLoader:
     """数据加载器"""
 
     def __init__(self, db_connector: DatabaseConnector):
         self.db = db_connector
 
-    def load_all_data(self, semester: str, grades: List[int] = None) -> Dict:
+    def load_all_data(
+        self, semester: str, grades: List[int] = None, reference_data: Dict = None
+    ) -> Dict:
         """
         加载所有排课相关数据
 
         Args:
             semester: 学期
             grades: 年级列表，如 [1, 2, 3]；None 表示加载所有年级
+            reference_data: 已缓存的基础数据（load_reference_data() 的结果）；
+                提供时不再查询这些表，只加载学期相关的数据
         """
         logger.info(f"开始加载学期 {semester} 的排课数据")
 
@@ -132,15 +148,20 @@ class DataLoader:
         else:
             logger.info("加载所有年级")
 
+        if reference_data is None:
+            reference_data = self._load_reference_tables()
+        else:
+            # 缓存的字典可能被多次运行共用，只复制字典本身，不修改其中的对象
+            reference_data = {key: dict(value) for key, value in reference_data.items()}
+            if grades:
+                reference_data["classes"] = {
+                    class_id: cls
+                    for class_id, cls in reference_data["classes"].items()
+                    if cls.grade in grades
+                }
+
         data = {
-            "campuses": self._load_campuses(),
-            "departments": self._load_departments(),
-            "majors": self._load_majors(),
-            "classes": self._load_classes(),
-            "teachers": self._load_teachers(),
-            "courses": self._load_courses(),
-            "classroom_features": self._load_classroom_features(),
-            "classrooms": self._load_classrooms(),
+            **reference_data,
             "course_offerings": self._load_course_offerings(semester),
             "teaching_groups": self._load_teaching_groups(),
             "teaching_tasks": self._load_teaching_tasks(semester),
@@ -156,6 +177,24 @@ class DataLoader:
         logger.info("所有数据加载完成")
         return data
 
+    def load_reference_data(self) -> Dict:
+        """加载与学期无关的基础数据：校区、院系、专业、班级（全部年级）、教师、课程、教室特征、教室"""
+        self._current_grades = None
+        return self._load_reference_tables()
+
+    def _load_reference_tables(self) -> Dict:
+        """加载基础数据表（班级按当前年级过滤）"""
+        return {
+            "campuses": self._load_campuses(),
+            "departments": self._load_departments(),
+            "majors": self._load_majors(),
+            "classes": self._load_classes(),
+            "teachers": self._load_teachers(),
+            "courses": self._load_courses(),
+            "classroom_features": self._load_classroom_features(),
+            "classrooms": self._load_classrooms(),
+        }
+
     def _load_campuses(self) -> Dict[str, Campus]:
         """加载校区数据"""
         query = "SELECT campus_id, campus_name, address FROM campuses"
@@ -527,6 +566,13 @@ class DataLoader:
         self.db.execute_batch_insert(insert_query, params_list)
         logger.info(f"成功保存 {len(params_list)} 条排课结果")
 
+    def load_schedules(self, version_id: int) -> List[Schedule]:
+        """加载某个排课版本已保存的排课结果（用于热启动）"""
+        query = "SELECT schedule_id, version_id, task_id, classroom_id, week_day, start_slot, end_slot FROM schedules WHERE version_id = %s"
+        rows = self.db.execute_query(query, (version_id,))
+        logger.info(f"已加载版本 {version_id} 的 {len(rows)} 条排课记录")
+        return [Schedule(**row) for row in rows]
+
     def _load_task_relations(self, semester: str) -> List[TaskRelation]:
         """加载任务关系约束"""
         try:
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+问题分解模块
+按班级、教师和任务关系把教学任务划分为互不相关的连通分量：
+不同分量之间不会产生教师 / 班级冲突，只通过教室争用弱耦合。
+各分量按任务数均衡分组后在独立进程中求解，最后合并结果并修复教室冲突。
+"""
+
+import logging
+import multiprocessing
+import random
+from collections import defaultdict
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from data_models import Gene, TaskRelation, TeachingTask
+from occupancy import OccupancyGrid
+
+logger = logging.getLogger(__name__)
+
+
+def find_components(
+    tasks: Sequence[TeachingTask], relations: Sequence[TaskRelation] = ()
+) -> List[List[TeachingTask]]:
+    """按共享班级 / 教师 / 任务关系划分连通分量（并查集），按任务数降序返回
+
+    教室候选集几乎在所有同规模任务之间重叠，不作为分量的连边，
+    由合并后的教室修复处理。
+    """
+    parent = {task.task_id: task.task_id for task in tasks}
+
+    def find(task_id: int) -> int:
+        while parent[task_id] != task_id:
+            parent[task_id] = parent[parent[task_id]]
+            task_id = parent[task_id]
+        return task_id
+
+    def union(a: int, b: int):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    first_owner = {}
+    for task in tasks:
+        for resource in [("T", t) for t in task.teachers] + [
+            ("C", c) for c in task.classes
+        ]:
+            if resource in first_owner:
+                union(first_owner[resource], task.task_id)
+            else:
+                first_owner[resource] = task.task_id
+    for rel in relations:
+        if rel.task_id_from in parent and rel.task_id_to in parent:
+            union(rel.task_id_from, rel.task_id_to)
+
+    components = defaultdict(list)
+    for task in tasks:
+        components[find(task.task_id)].append(task)
+    return sorted(components.values(), key=len, reverse=True)
+
+
+def group_components(
+    components: List[List[TeachingTask]], groups: int
+) -> List[List[TeachingTask]]:
+    """把分量按任务数均衡地装入 groups 组（最长处理时间优先）"""
+    bins = [[] for _ in range(min(groups, len(components)))]
+    for component in sorted(components, key=len, reverse=True):
+        min(bins, key=len).extend(component)
+    return [b for b in bins if b]
+
+
+def _init_worker():
+    """子进程初始化：子问题的逐代日志不再输出"""
+    logging.getLogger("genetic_algorithm").setLevel(logging.WARNING)
+
+
+def _solve_group(args: Tuple[int, Dict, Dict]) -> Tuple[int, List[Gene]]:
+    """求解一组分量，返回 (组号, 基因列表)"""
+    from genetic_algorithm import SchedulingGeneticAlgorithm
+
+    group_id, data, config = args
+    ga = SchedulingGeneticAlgorithm(data, config)
+    return group_id, ga.evolve()
+
+
+def repair_room_conflicts(ga, individual: List[Gene]) -> Tuple[List[Gene], int]:
+    """合并后的教室冲突修复：时间不动，只为冲突的基因换一间同时段空闲的教室
+
+    只换教室不会引入新的教师 / 班级冲突。锁定任务不会被改动。
+
+    Returns:
+        (修复后的个体, 修复的基因数)
+    """
+    classroom_occupancy = OccupancyGrid()
+    repaired = individual[:]
+    fixed = 0
+    for i, gene in enumerate(repaired):
+        task = ga.task_dict[gene.task_id]
+        week_mask = ga.task_week_masks[gene.task_id]
+        if gene.task_id not in ga.pinned_genes and classroom_occupancy.conflicts(
+            gene.classroom_id, gene.week_day, gene.start_slot, task.slots_count, week_mask
+        ):
+            classroom = ga._select_classroom(
+                task, gene.week_day, gene.start_slot, classroom_occupancy
+            )
+            if classroom is None:
+                # 放置用教室都被占用时，退而求其次用满足容量和特征的任一空闲教室
+                classroom = next(
+                    (
+                        c
+                        for c in ga.task_mutation_classrooms[gene.task_id]
+                        if not classroom_occupancy.conflicts(
+                            c.classroom_id,
+                            gene.week_day,
+                            gene.start_slot,
+                            task.slots_count,
+                            week_mask,
+                        )
+                    ),
+                    None,
+                )
+            if classroom is not None:
+                gene = Gene(
+                    gene.task_id,
+                    gene.teacher_id,
+                    classroom.classroom_id,
+                    gene.week_day,
+                    gene.start_slot,
+                )
+                repaired[i] = gene
+                fixed += 1
+        classroom_occupancy.occupy(
+            gene.classroom_id, gene.week_day, gene.start_slot, task.slots_count, week_mask
+        )
+    return repaired, fixed
+
+
+class ComponentSolver:
+    """分量并行求解器（运行在主进程）"""
+
+    def __init__(self, ga, groups: List[List[TeachingTask]]):
+        self.ga = ga
+        self.groups = groups
+
+    def run(self, notify: Callable[..., None]) -> List[Gene]:
+        """并行求解各组，合并为完整个体并修复教室冲突
+
+        Args:
+            notify: evolve 内部的进度推送函数
+        """
+        ga = self.ga
+        seed_rng = (
+            random.Random(ga.config["random_seed"])
+            if ga.config.get("random_seed") is not None
+            else random.Random(random.getrandbits(64))
+        )
+        jobs = [
+            (
+                group_id,
+                self._group_data(group),
+                self._group_config(group, seed_rng.getrandbits(64)),
+            )
+            for group_id, group in enumerate(self.groups)
+        ]
+        workers = min(ga.config.get("component_workers", 1), len(jobs))
+        logger.info(
+            f"问题分解：{len(jobs)} 组子问题（任务数 {[len(g) for g in self.groups]}），"
+            f"{workers} 个进程求解"
+        )
+        notify("init", 5, message=f"问题已分解为 {len(jobs)} 组子问题，开始并行求解")
+
+        genes: Dict[int, Gene] = {}
+        if workers > 1:
+            with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+                results = pool.imap_unordered(_solve_group, jobs)
+                self._collect(results, genes, notify)
+        else:
+            self._collect(map(_solve_group, jobs), genes, notify)
+
+        merged = [genes[task.task_id] for task in ga.schedulable_tasks]
+        merged, fixed = repair_room_conflicts(ga, merged)
+        logger.info(f"子问题合并完成，修复了 {fixed} 个教室冲突")
+        return merged
+
+    def _collect(self, results, genes: Dict[int, Gene], notify):
+        for done, (group_id, group_genes) in enumerate(results, start=1):
+            for gene in group_genes:
+                genes[gene.task_id] = gene
+            notify(
+                "evolving",
+                10 + int(done / len(self.groups) * 85),
+                message=f"子问题 {group_id + 1} 求解完成（{done}/{len(self.groups)}）",
+            )
+
+    def _group_data(self, group: List[TeachingTask]) -> Dict:
+        """子问题数据：只保留本组的教学任务和组内的任务关系，其余数据共用"""
+        task_ids = {task.task_id for task in group}
+        data = dict(self.ga.data)
+        data["teaching_tasks"] = list(group)
+        data["task_relations"] = [
+            rel
+            for rel in self.ga.data["task_relations"]
+            if rel.task_id_from in task_ids and rel.task_id_to in task_ids
+        ]
+        return data
+
+    def _group_config(self, group: List[TeachingTask], seed: int) -> Dict:
+        """子问题配置：单进程求解，种子由主随机数派生，时间预算取主进程剩余时间
+
+        检查点、恢复和运行报告只由主进程负责，子问题不写文件，避免并发写同一路径。
+        """
+        task_ids = {task.task_id for task in group}
+        config = {k: v for k, v in self.ga.config.items() if not callable(v)}
+        config.update(
+            decompose=False,
+            islands=1,
+            fitness_workers=1,
+            init_workers=1,
+            random_seed=seed,
+            time_budget_seconds=self.ga._remaining_time(),
+            checkpoint_path=None,
+            resume_from=None,
+            run_report_path=None,
+            pinned_genes=[
+                gene
+                for gene in self.ga.pinned_genes.values()
+                if gene.task_id in task_ids
+            ],
+            pin_seed_schedules=False,
+        )
+        return config
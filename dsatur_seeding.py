@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+DSATUR 构造式初始化模块
+在“共享班级或教师”的任务冲突图上按饱和度动态排序：
+每次优先安排剩余可行时间最少的任务（并列时冲突图度数大者优先），
+放置后只更新其相邻任务的可行时间数。
+用于为初始种群提供一部分接近零硬冲突的个体。
+"""
+
+import heapq
+import logging
+import random
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from data_models import Gene, TeachingTask
+from occupancy import OccupancyGrid
+
+logger = logging.getLogger(__name__)
+
+
+def build_conflict_graph(tasks: List[TeachingTask]) -> Dict[int, Set[int]]:
+    """构建任务冲突图：共享任一班级或任一教师的两个任务相邻"""
+    by_resource = defaultdict(list)
+    for task in tasks:
+        for teacher_id in task.teachers:
+            by_resource[("T", teacher_id)].append(task.task_id)
+        for class_id in task.classes:
+            by_resource[("C", class_id)].append(task.task_id)
+
+    neighbors = {task.task_id: set() for task in tasks}
+    for task_ids in by_resource.values():
+        for task_id in task_ids:
+            neighbors[task_id].update(task_ids)
+    for task_id, adjacent in neighbors.items():
+        adjacent.discard(task_id)
+    return neighbors
+
+
+def create_dsatur_individual(ga) -> List[Gene]:
+    """用 DSATUR 顺序构造一个个体
+
+    基因仍按 ga.schedulable_tasks 的顺序输出，与随机初始化的个体布局一致；
+    随机性来自并列任务的打散以及 _create_gene_for_task 内部的候选时间洗牌。
+    """
+    if not hasattr(ga, "_conflict_graph"):
+        ga._conflict_graph = build_conflict_graph(ga.schedulable_tasks)
+    neighbors = ga._conflict_graph
+    task_dict = ga.task_dict
+
+    teacher_occupancy = OccupancyGrid()
+    class_occupancy = OccupancyGrid()
+    classroom_occupancy = OccupancyGrid()
+
+    def feasible_count(task: TeachingTask) -> int:
+        """当前占用下，任务剩余的无教师/班级冲突的时间数"""
+        return sum(
+            1
+            for weekday, start_slot in ga.task_time_domains[task.task_id]
+            if not ga._has_time_conflict(
+                task, weekday, start_slot, teacher_occupancy, class_occupancy
+            )
+        )
+
+    # 惰性删除的最小堆：(可行时间数, -度数, 随机打散, task_id)
+    saturation = {}
+    heap = []
+    for task in ga.schedulable_tasks:
+        saturation[task.task_id] = len(ga.task_time_domains[task.task_id])
+        heap.append(
+            (
+                saturation[task.task_id],
+                -len(neighbors[task.task_id]),
+                random.random(),
+                task.task_id,
+            )
+        )
+    heapq.heapify(heap)
+
+    genes: Dict[int, Gene] = {}
+    while heap:
+        count, neg_degree, _, task_id = heapq.heappop(heap)
+        if task_id in genes or count != saturation[task_id]:
+            continue  # 已安排，或是过期的堆条目
+
+        task = task_dict[task_id]
+        gene = ga._create_gene_for_task(
+            task, teacher_occupancy, class_occupancy, classroom_occupancy
+        )
+        genes[task_id] = gene
+        ga._update_schedules(
+            gene, task, teacher_occupancy, class_occupancy, classroom_occupancy
+        )
+
+        # 只有相邻任务的可行时间会因本次放置而减少
+        for neighbor_id in neighbors[task_id]:
+            if neighbor_id in genes:
+                continue
+            new_count = feasible_count(task_dict[neighbor_id])
+            if new_count != saturation[neighbor_id]:
+                saturation[neighbor_id] = new_count
+                heapq.heappush(
+                    heap,
+                    (
+                        new_count,
+                        -len(neighbors[neighbor_id]),
+                        random.random(),
+                        neighbor_id,
+                    ),
+                )
+
+    return [genes[task.task_id] for task in ga.schedulable_tasks]
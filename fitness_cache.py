@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+适应度缓存模块
+按染色体指纹缓存适应度，跳过精英复制、未交叉/未变异子代等完全相同个体的重复评估
+
+指纹是各基因哈希的异或（Zobrist 哈希）：子代指纹由亲本指纹增量更新，
+只需重新哈希交叉、变异实际替换的基因，不必每代为每个个体构建并哈希整条染色体。
+异或指纹可能碰撞（例如两个基因互换同一分量时相互抵消），缓存条目因此同时保存个体本身，
+命中时逐位核对基因的教室和时间，核对不通过按未命中处理。
+"""
+
+from collections import OrderedDict
+from itertools import compress, count
+from operator import is_not
+from typing import List, Optional, Tuple
+
+from data_models import Gene
+
+
+def gene_fingerprint(gene: Gene) -> int:
+    """单个基因的哈希（Zobrist 键）
+
+    适应度只依赖任务的教室和时间（教师冲突按任务的全部教师统计），
+    因此不包含 teacher_id，只换教师的个体可以直接命中缓存。
+    """
+    return hash((gene.task_id, gene.classroom_id, gene.week_day, gene.start_slot))
+
+
+def chromosome_fingerprint(individual: List[Gene]) -> int:
+    """从零计算染色体指纹：各基因哈希的异或"""
+    fingerprint = 0
+    for gene in individual:
+        fingerprint ^= gene_fingerprint(gene)
+    return fingerprint
+
+
+def update_fingerprint(fingerprint: int, parent: List[Gene], child: List[Gene]) -> int:
+    """由亲本指纹增量得到子代指纹
+
+    交叉和变异只替换部分位置的基因对象，其余位置与亲本是同一对象；
+    按对象身份找出被替换的位置（逐位比较在 C 层完成），只对这些基因异或出旧哈希、异或入新哈希。
+    """
+    for idx in compress(count(), map(is_not, parent, child)):
+        fingerprint ^= gene_fingerprint(parent[idx]) ^ gene_fingerprint(child[idx])
+    return fingerprint
+
+
+def same_placement(a: List[Gene], b: List[Gene]) -> bool:
+    """两个个体的每个基因是否有相同的任务、教室和时间（即适应度必然相同）
+
+    个体之间大部分位置是同一基因对象，先按身份筛出不同的位置（C 层完成），只比较这些位置。
+    """
+    if a is b:
+        return True
+    if len(a) != len(b):
+        return False
+    for idx in compress(count(), map(is_not, a, b)):
+        x, y = a[idx], b[idx]
+        if (
+            x.task_id != y.task_id
+            or x.classroom_id != y.classroom_id
+            or x.week_day != y.week_day
+            or x.start_slot != y.start_slot
+        ):
+            return False
+    return True
+
+
+class FitnessCache:
+    """有界 LRU 适应度缓存
+
+    条目为 指纹 -> (适应度, 个体)；保存的个体只是基因引用列表（个体按不可变值使用），
+    命中时用 same_placement 核对，指纹碰撞不会返回其他个体的适应度。
+    """
+
+    __slots__ = ("maxsize", "hits", "misses", "collisions", "_entries")
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self._entries: "OrderedDict[int, Tuple[float, List[Gene]]]" = OrderedDict()
+
+    def get(self, key: int, individual: List[Gene]) -> Optional[float]:
+        """查询缓存，命中且核对通过时把条目移到最近使用的位置"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        score, cached = entry
+        if not same_placement(cached, individual):
+            self.collisions += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def put(self, key: int, score: float, individual: List[Gene]):
+        """写入缓存（同一指纹的旧条目被替换），超出容量时淘汰最久未使用的条目"""
+        self._entries[key] = (score, individual)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
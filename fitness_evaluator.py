@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+"""
+增量适应度评估模块
+为每个个体维护占用分桶和各约束的局部得分，
+变异 / 交叉 / 修复之后只重算被改动基因涉及的教师、班级、教室和日期
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from data_models import Gene
+from occupancy import count_slot_conflicts
+
+logger = logging.getLogger(__name__)
+
+# 分桶类型：教师-日期、班级-日期、教室-日期
+BUCKET_TEACHER = "T"
+BUCKET_CLASS = "C"
+BUCKET_CLASSROOM = "R"
+
+# 连续增量更新这么多步后按局部项重新求和总分，避免按差值累加的浮点误差逐代累积
+RESUM_INTERVAL = 64
+
+
+class EvaluationState:
+    """单个个体的评估状态
+
+    - genes: 对应的基因列表（只读，算子总是生成新列表）
+    - buckets: (类型, 实体ID, 星期) -> 落在该桶内的基因下标元组（升序）
+    - bucket_scores: 分桶 -> (硬约束惩罚, 软约束惩罚)
+    - gene_scores: 每个基因自身的 (硬约束惩罚, 软约束惩罚)
+    - relation_scores: 每条任务关系约束的惩罚
+    - task_positions: task_id -> 基因下标
+    - hard / soft: 汇总后的硬约束惩罚（负数）与软约束惩罚（正数）
+    - steps: 自上次求和以来的增量更新次数
+    """
+
+    __slots__ = (
+        "genes",
+        "buckets",
+        "bucket_scores",
+        "gene_scores",
+        "relation_scores",
+        "task_positions",
+        "hard",
+        "soft",
+        "steps",
+    )
+
+    def __init__(self, genes: List[Gene]):
+        self.genes = genes
+        self.buckets: Dict[tuple, tuple] = {}
+        self.bucket_scores: Dict[tuple, Tuple[float, float]] = {}
+        self.gene_scores: List[Tuple[float, float]] = []
+        self.relation_scores: List[float] = []
+        self.task_positions: Dict[int, int] = {}
+        self.hard = 0
+        self.soft = 0
+        self.steps = 0
+
+    @property
+    def fitness(self) -> float:
+        """与 SchedulingGeneticAlgorithm.fitness() 相同的组合规则"""
+        if self.hard < -50000:
+            return self.hard
+        return self.hard - self.soft
+
+    def derive(self, genes: List[Gene]) -> "EvaluationState":
+        """浅拷贝出一个新状态（分桶元组不可变，可安全共享）"""
+        state = EvaluationState(genes)
+        state.buckets = self.buckets.copy()
+        state.bucket_scores = self.bucket_scores.copy()
+        state.gene_scores = self.gene_scores[:]
+        state.relation_scores = self.relation_scores[:]
+        state.task_positions = self.task_positions
+        state.hard = self.hard
+        state.soft = self.soft
+        state.steps = self.steps
+        return state
+
+    def resum(self):
+        """按局部项重新求和 hard / soft，清除增量累加的舍入误差"""
+        self.hard = sum(score[0] for score in self.gene_scores) + sum(
+            score[0] for score in self.bucket_scores.values()
+        )
+        self.soft = (
+            sum(score[1] for score in self.gene_scores)
+            + sum(score[1] for score in self.bucket_scores.values())
+            + sum(self.relation_scores)
+        )
+        self.steps = 0
+
+
+class _GeneOverlay:
+    """在基因列表上叠加少量改动的只读视图（用于试算邻域移动，不复制整条染色体）"""
+
+    __slots__ = ("genes", "changes")
+
+    def __init__(self, genes: List[Gene], changes: Dict[int, Gene]):
+        self.genes = genes
+        self.changes = changes
+
+    def __getitem__(self, idx: int) -> Gene:
+        gene = self.changes.get(idx)
+        return self.genes[idx] if gene is None else gene
+
+
+class IncrementalFitnessEvaluator:
+    """增量适应度评估器
+
+    适应度被拆成三类互不重叠的局部项：
+    1. 基因自身项：周末、容量、设施、黑名单、周四下午、教师偏好、利用率、时段偏好；
+    2. 分桶项：教师-日期（教师冲突、校区通勤、连堂同教室、多教室）、
+       班级-日期（班级冲突、连堂同教室、学生负荷）、教室-日期（教室冲突）；
+    3. 任务关系项：每条 task_relation 约束。
+
+    基因改动后只需重算该基因自身项、它新旧位置所在的分桶以及涉及它的关系约束。
+    各局部项复用 SchedulingGeneticAlgorithm 中的同名计算函数，保证与全量 fitness() 一致。
+    """
+
+    def __init__(self, ga, max_changed_ratio: float = 0.5):
+        """
+        Args:
+            ga: SchedulingGeneticAlgorithm 实例（提供任务、教室和惩罚配置）
+            max_changed_ratio: 改动基因占比超过该值时直接全量重算
+        """
+        self.ga = ga
+        self.task_dict = ga.task_dict
+        self.instance = ga.instance
+        self.task_week_masks = ga.task_week_masks
+        self.penalty_scores = ga.config["penalty_scores"]
+        self.max_changed_ratio = max_changed_ratio
+
+        # 展平任务关系约束，并建立 task_id -> 关系下标 的反向索引
+        self.relations: List[Tuple[int, int, Dict]] = []
+        self.relations_by_task: Dict[int, List[int]] = defaultdict(list)
+        for task_id, relations in ga.task_relations.items():
+            for rel in relations:
+                rel_idx = len(self.relations)
+                related_task_id = rel["related_task_id"]
+                self.relations.append((task_id, related_task_id, rel))
+                self.relations_by_task[task_id].append(rel_idx)
+                if related_task_id != task_id:
+                    self.relations_by_task[related_task_id].append(rel_idx)
+
+    # ------------------------------------------------------------------
+    # 对外接口
+    # ------------------------------------------------------------------
+
+    def evaluate(
+        self, individual: List[Gene], *bases: Optional[EvaluationState]
+    ) -> EvaluationState:
+        """评估个体
+
+        Args:
+            individual: 待评估的个体
+            bases: 亲本（或变异前个体）的评估状态，可传多个（如交叉的两个亲本），
+                自动选择改动最少的一个做增量计算；不传则全量计算
+
+        Returns:
+            个体的评估状态，适应度见 state.fitness
+        """
+        best_base = None
+        best_changed = None
+        for base in bases:
+            if base is None:
+                continue
+            changed = self._diff(base, individual)
+            if changed is not None and (
+                best_changed is None or len(changed) < len(best_changed)
+            ):
+                best_base, best_changed = base, changed
+
+        if best_base is None:
+            return self.full_state(individual)
+
+        if not best_changed:
+            # 状态创建后不再原地修改，内容相同的个体可直接共享
+            return best_base
+
+        if len(best_changed) > len(individual) * self.max_changed_ratio:
+            return self.full_state(individual)
+
+        return self._apply_changes(best_base, individual, best_changed)
+
+    def move_delta(
+        self, state: EvaluationState, changes: Dict[int, Gene]
+    ) -> Tuple[float, float]:
+        """试算一次邻域移动带来的 (硬约束, 软约束) 变化量，不修改也不复制状态
+
+        Args:
+            state: 当前个体的评估状态
+            changes: 基因下标 -> 新基因（同一任务，只改时间和/或教室）
+        """
+        view = _GeneOverlay(state.genes, changes)
+        delta_hard = delta_soft = 0
+        new_buckets: Dict[tuple, tuple] = {}
+        touched_relations = set()
+
+        for idx, new_gene in changes.items():
+            old_gene = state.genes[idx]
+            task = self.task_dict[new_gene.task_id]
+
+            old_hard, old_soft = state.gene_scores[idx]
+            new_hard, new_soft = self._score_gene(new_gene, task)
+            delta_hard += new_hard - old_hard
+            delta_soft += new_soft - old_soft
+
+            for key in self._bucket_keys(old_gene, task):
+                bucket = new_buckets.get(key, state.buckets.get(key, ()))
+                new_buckets[key] = tuple(i for i in bucket if i != idx)
+            for key in self._bucket_keys(new_gene, task):
+                bucket = new_buckets.get(key, state.buckets.get(key, ()))
+                new_buckets[key] = tuple(sorted(bucket + (idx,)))
+
+            touched_relations.update(self.relations_by_task.get(new_gene.task_id, ()))
+
+        for key, bucket in new_buckets.items():
+            old_hard, old_soft = state.bucket_scores.get(key, (0, 0))
+            new_hard, new_soft = (
+                self._score_bucket(key, view, bucket) if bucket else (0, 0)
+            )
+            delta_hard += new_hard - old_hard
+            delta_soft += new_soft - old_soft
+
+        for rel_idx in touched_relations:
+            delta_soft += (
+                self._score_relation(rel_idx, view, state.task_positions)
+                - state.relation_scores[rel_idx]
+            )
+
+        return delta_hard, delta_soft
+
+    def apply_move(
+        self, state: EvaluationState, changes: Dict[int, Gene]
+    ) -> EvaluationState:
+        """执行邻域移动，返回新个体的评估状态（原状态保持不变）"""
+        genes = state.genes[:]
+        for idx, gene in changes.items():
+            genes[idx] = gene
+        return self._apply_changes(state, genes, list(changes))
+
+    def _diff(
+        self, base: EvaluationState, individual: List[Gene]
+    ) -> Optional[List[int]]:
+        """找出与基准状态不同的基因下标；基因位置与任务不对齐时返回 None"""
+        if len(base.genes) != len(individual):
+            return None
+
+        # 适应度按任务的全部教师计算，与基因选中的 teacher_id 无关，
+        # 因此只比较时间和教室
+        changed = []
+        for idx, (old_gene, new_gene) in enumerate(zip(base.genes, individual)):
+            if old_gene is new_gene:
+                continue
+            if old_gene.task_id != new_gene.task_id:
+                return None
+            if (
+                old_gene.week_day != new_gene.week_day
+                or old_gene.start_slot != new_gene.start_slot
+                or old_gene.classroom_id != new_gene.classroom_id
+            ):
+                changed.append(idx)
+        return changed
+
+    def full_state(self, individual: List[Gene]) -> EvaluationState:
+        """从零构建个体的评估状态"""
+        state = EvaluationState(individual)
+
+        members = defaultdict(list)
+        for idx, gene in enumerate(individual):
+            task = self.task_dict[gene.task_id]
+            state.task_positions[gene.task_id] = idx
+
+            gene_score = self._score_gene(gene, task)
+            state.gene_scores.append(gene_score)
+            state.hard += gene_score[0]
+            state.soft += gene_score[1]
+
+            for key in self._bucket_keys(gene, task):
+                members[key].append(idx)
+
+        for key, indices in members.items():
+            bucket = tuple(indices)
+            score = self._score_bucket(key, individual, bucket)
+            state.buckets[key] = bucket
+            state.bucket_scores[key] = score
+            state.hard += score[0]
+            state.soft += score[1]
+
+        for rel_idx in range(len(self.relations)):
+            score = self._score_relation(rel_idx, individual, state.task_positions)
+            state.relation_scores.append(score)
+            state.soft += score
+
+        return state
+
+    # ------------------------------------------------------------------
+    # 增量更新
+    # ------------------------------------------------------------------
+
+    def _apply_changes(
+        self, base: EvaluationState, individual: List[Gene], changed: List[int]
+    ) -> EvaluationState:
+        """在亲本状态基础上只重算改动基因涉及的局部项"""
+        state = base.derive(individual)
+        touched_buckets = set()
+        touched_relations = set()
+
+        for idx in changed:
+            old_gene = base.genes[idx]
+            new_gene = individual[idx]
+            task = self.task_dict[new_gene.task_id]
+
+            # 基因自身项
+            old_hard, old_soft = state.gene_scores[idx]
+            new_hard, new_soft = self._score_gene(new_gene, task)
+            state.gene_scores[idx] = (new_hard, new_soft)
+            state.hard += new_hard - old_hard
+            state.soft += new_soft - old_soft
+
+            # 从旧分桶移出，加入新分桶
+            for key in self._bucket_keys(old_gene, task):
+                state.buckets[key] = tuple(i for i in state.buckets[key] if i != idx)
+                touched_buckets.add(key)
+            for key in self._bucket_keys(new_gene, task):
+                state.buckets[key] = tuple(sorted(state.buckets.get(key, ()) + (idx,)))
+                touched_buckets.add(key)
+
+            touched_relations.update(self.relations_by_task.get(new_gene.task_id, ()))
+
+        for key in touched_buckets:
+            old_hard, old_soft = state.bucket_scores.pop(key, (0, 0))
+            bucket = state.buckets[key]
+            if bucket:
+                new_hard, new_soft = self._score_bucket(key, individual, bucket)
+                state.bucket_scores[key] = (new_hard, new_soft)
+            else:
+                del state.buckets[key]
+                new_hard, new_soft = 0, 0
+            state.hard += new_hard - old_hard
+            state.soft += new_soft - old_soft
+
+        for rel_idx in touched_relations:
+            old_score = state.relation_scores[rel_idx]
+            new_score = self._score_relation(rel_idx, individual, state.task_positions)
+            state.relation_scores[rel_idx] = new_score
+            state.soft += new_score - old_score
+
+        state.steps += 1
+        if state.steps >= RESUM_INTERVAL:
+            state.resum()
+        return state
+
+    # ------------------------------------------------------------------
+    # 局部项计算
+    # ------------------------------------------------------------------
+
+    def _bucket_keys(self, gene: Gene, task) -> List[tuple]:
+        """基因所属的全部分桶"""
+        keys = [(BUCKET_TEACHER, t_id, gene.week_day) for t_id in task.teachers]
+        keys.extend((BUCKET_CLASS, c_id, gene.week_day) for c_id in task.classes)
+        keys.append((BUCKET_CLASSROOM, gene.classroom_id, gene.week_day))
+        return keys
+
+    def _score_gene(self, gene: Gene, task) -> Tuple[float, float]:
+        """基因自身的 (硬约束, 软约束) 惩罚"""
+        ga = self.ga
+        hard = ga._gene_hard_penalty(gene, task)
+        soft = (
+            ga._gene_preference_penalty(gene, task)
+            + ga._gene_utilization_penalty(gene, task)
+            + ga._gene_time_preference_penalty(gene, task)
+        )
+        return hard, soft
+
+    def _score_bucket(
+        self, key: tuple, individual: List[Gene], bucket: tuple
+    ) -> Tuple[float, float]:
+        """分桶内的 (硬约束, 软约束) 惩罚"""
+        kind = key[0]
+        ga = self.ga
+
+        if len(bucket) == 1:
+            # 单节课的分桶不会有冲突、换教室或跨校区，只有班级负荷可能非零
+            if kind == BUCKET_CLASS:
+                gene = individual[bucket[0]]
+                return 0, ga._overload_penalty(
+                    self.task_dict[gene.task_id].slots_count
+                )
+            return 0, 0
+
+        total_slots = 0
+        intervals = []
+        week_intervals = []
+        for idx in bucket:
+            gene = individual[idx]
+            task = self.task_dict[gene.task_id]
+            end_slot = gene.start_slot + task.slots_count - 1
+            total_slots += task.slots_count
+            intervals.append((gene.start_slot, end_slot, gene.classroom_id))
+            week_intervals.append(
+                (gene.start_slot, end_slot, self.task_week_masks[gene.task_id])
+            )
+
+        # 与 fitness() 中按基因顺序逐个占用的冲突计数一致
+        conflict_count = count_slot_conflicts(week_intervals)
+
+        if kind == BUCKET_TEACHER:
+            hard = conflict_count * self.penalty_scores["teacher_conflict"]
+            rooms = {room for _, _, room in intervals}
+            hard += self.penalty_scores["campus_commute"] * self.instance.commute_count(
+                rooms
+            )
+
+            soft = (
+                ga._count_continuity_breaks(intervals)
+                * self.penalty_scores["classroom_continuity"]
+            )
+            if len(rooms) > 1:
+                soft += (len(rooms) - 1) * self.penalty_scores.get(
+                    "daily_classroom_variety", 300
+                )
+            return hard, soft
+
+        if kind == BUCKET_CLASS:
+            hard = conflict_count * self.penalty_scores["class_conflict"]
+            soft = (
+                ga._count_continuity_breaks(intervals)
+                * self.penalty_scores["classroom_continuity"]
+                * 0.8
+            )
+            soft += ga._overload_penalty(total_slots)
+            return hard, soft
+
+        return conflict_count * self.penalty_scores["classroom_conflict"], 0
+
+    def _score_relation(
+        self, rel_idx: int, individual: List[Gene], task_positions: Dict[int, int]
+    ) -> float:
+        """单条任务关系约束的惩罚"""
+        task_id, related_task_id, rel = self.relations[rel_idx]
+        if task_id not in task_positions or related_task_id not in task_positions:
+            return 0
+        return self.ga._relation_penalty(
+            individual[task_positions[task_id]],
+            individual[task_positions[related_task_id]],
+            rel,
+        )
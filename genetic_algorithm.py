@@ -6,11 +6,45 @@
 
 import random
 import logging
+import time
 from typing import List, Dict, Set, Tuple, Optional
 from collections import defaultdict
 import copy
 
 from data_models import *
+from checkpoint import Checkpoint, load_checkpoint, save_checkpoint
+from chromosome import ChromosomeCodec
+from conflict_mutation import (
+    MUTATION_CONFLICT_SET,
+    MUTATION_UNIFORM,
+    ConflictSetMutator,
+)
+from decomposition import ComponentSolver, find_components, group_components
+from dsatur_seeding import create_dsatur_individual
+from fitness_cache import FitnessCache, chromosome_fingerprint, update_fingerprint
+from fitness_evaluator import IncrementalFitnessEvaluator
+from hard_constraint_checker import check_all_hard_constraints
+from island_model import IslandModel
+from local_search import LocalSearch
+from occupancy import OccupancyGrid
+from parallel_fitness import ParallelFitnessEvaluator
+from problem_instance import (
+    NATURE_ELECTIVE,
+    NATURE_GENERAL,
+    NATURE_REQUIRED,
+    ProblemInstance,
+)
+from telemetry import (
+    PHASE_CROSSOVER,
+    PHASE_FITNESS,
+    PHASE_INIT,
+    PHASE_LOCAL_SEARCH,
+    PHASE_MUTATION,
+    PHASE_POST_PROCESS,
+    PHASE_SELECTION,
+    RunTelemetry,
+)
+from warm_start import create_warm_start_individuals, seed_genes_from_schedules
 
 logger = logging.getLogger(__name__)
 
@@ -32,12 +66,18 @@ class SchedulingGeneticAlgorithm:
                     base_config[key] = value
         self.config = base_config
 
+        # 运行遥测，evolve() 开始时创建
+        self.telemetry: Optional[RunTelemetry] = None
+
         # 预处理数据
         self._preprocess_data()
 
         # 构建查找表
         self._build_lookup_tables()
 
+        # 锁定基因（增量重排）
+        self._apply_pinned_genes()
+
     def _default_config(self) -> Dict:
         """默认配置
 
@@ -68,9 +108,36 @@ class SchedulingGeneticAlgorithm:
             "generations": 200,
             "crossover_rate": 0.85,  # 提高交叉率，增加种群多样性
             "mutation_rate": 0.15,  # 提高变异率，帮助跳出局部最优
+            "mutation_mode": "uniform",  # 变异模式："uniform"（每个基因按 mutation_rate 独立变异）/ "conflict_set"（优先修复处在硬约束冲突中的基因）
+            "conflict_repair_rate": 1.0,  # conflict_set 模式：冲突集中每个基因被修复的概率
+            "exploration_rate": 0.02,  # conflict_set 模式：无冲突基因做随机探索变异的概率
             "tournament_size": 5,
             "elitism_size": 15,  # 增加精英保留，保护优秀基因
             "max_stagnation": 60,  # 增加容忍度，给算法更多探索机会
+            "incremental_fitness": True,  # 增量适应度评估：子代只重算改动基因涉及的部分
+            "fitness_cache_size": 1024,  # 适应度 LRU 缓存容量（按染色体指纹），0 表示不缓存
+            "fitness_workers": 1,  # 并行适应度评估进程数，1 表示串行（并行时不使用增量评估）
+            "dsatur_seed_ratio": 0.0,  # 初始种群中用 DSATUR 构造式启发生成的比例（0-1），其余随机生成以保持多样性
+            "init_workers": 1,  # 并行初始化种群的进程数，1 表示串行（已启用并行评估时复用其进程池）
+            "time_budget_seconds": None,  # 整体运行时间预算（秒），到时停止进化并返回当前最优解；None 表示不限时
+            "warm_start_ratio": 0.5,  # 提供 data["seed_schedules"] 时，由原方案及其变异体构成的初始种群比例
+            "decompose": False,  # 按班级/教师把任务分解为互不相关的分量，分组并行求解后合并
+            "component_workers": 1,  # 分解模式下并行求解的进程数（即子问题组数）
+            "pinned_genes": None,  # 锁定的基因列表：对应任务固定在给定的教师/教室/时间，只优化其余任务
+            "pin_seed_schedules": False,  # True 时把 data["seed_schedules"] 中仍有效的安排全部锁定，只重排新增/变更的任务
+            "run_report_path": None,  # 运行报告（各阶段耗时、评估速度、变异成功率等）JSON 输出路径
+            "checkpoint_path": None,  # 检查点文件路径，None 表示不保存检查点
+            "checkpoint_interval": 10,  # 每隔多少代保存一次检查点
+            "resume_from": None,  # 从该检查点文件恢复进化（跳过种群初始化）
+            "random_seed": None,  # 主随机种子；每个初始个体与后续进化的种子都由它派生，None 表示沿用全局随机状态
+            "islands": 1,  # 岛屿模型子种群（进程）数，1 表示单种群；种群规模在各岛间平分
+            "migration_interval": 10,  # 岛屿模型：每隔多少代交换一次最优个体
+            "migration_size": 2,  # 岛屿模型：每次每个岛屿迁出的个体数
+            "local_search": None,  # 模因局部搜索方法："tabu"（禁忌搜索）/ "annealing"（模拟退火），None 表示不启用
+            "local_search_time_budget": 5.0,  # 进化结束后对最佳个体做局部搜索的时间预算（秒）
+            "local_search_interval": 0,  # 每隔多少代对精英个体做一次局部搜索，0 表示只在进化结束后做
+            "local_search_elites": 1,  # 周期性局部搜索的精英个体数
+            "local_search_elite_time_budget": 0.5,  # 周期性局部搜索每个精英的时间预算（秒）
             "penalty_scores": {
                 "teacher_conflict": -50000,  # 大幅提高：教师冲突必须避免
                 "class_conflict": -80000,  # 最高优先级：班级冲突必须完全避免
@@ -96,10 +163,20 @@ class SchedulingGeneticAlgorithm:
         """预处理数据"""
         logger.info("开始预处理数据")
 
+        # 编译问题实例（ID 驻留为整数下标，任务 / 教室属性展开为平铺数组）
+        self.instance = ProblemInstance(self.data)
+
         # 按优先级排序教学任务
         self.tasks = self._sort_tasks_by_priority()
         self.task_dict = {task.task_id: task for task in self.tasks}
 
+        # 任务周次位图（冲突检测时一次按位与即可判断周次是否重叠）
+        instance = self.instance
+        self.task_week_masks = {
+            task_id: instance.task_weeks[t]
+            for task_id, t in instance.task_index.items()
+        }
+
         # 构建可用教室列表（按容量排序）
         self.classrooms = list(self.data["classrooms"].values())
         self.classrooms.sort(key=lambda x: x.capacity)
@@ -107,6 +184,9 @@ class SchedulingGeneticAlgorithm:
         # 构建教师黑名单时间映射
         self.teacher_blackouts = self._build_teacher_blackouts()
 
+        # 构建任务候选域（静态合法的教师/星期/节次组合）
+        self._build_task_domains()
+
         # 构建教师偏好映射
         self.teacher_preferences = self._build_teacher_preferences()
 
@@ -118,39 +198,14 @@ class SchedulingGeneticAlgorithm:
         )
 
     def _sort_tasks_by_priority(self) -> List[TeachingTask]:
-        """按优先级排序教学任务"""
-        tasks = self.data["teaching_tasks"]
+        """按优先级排序教学任务
 
-        def priority_key(task):
-            offering = task.offering
-            if not offering:
-                return (2, 0, 0, 0)  # 默认优先级
-
-            # 课程性质优先级
-            nature_priority = {
-                CourseNature.GENERAL: 0,  # 通识最高
-                CourseNature.REQUIRED: 1,  # 必修中等
-                CourseNature.ELECTIVE: 2,  # 选修最低
-            }
-
-            # 课时长度优先级（越长的课程越优先，避免时间块被短课程占用）
-            slots_priority = -task.slots_count  # 负号表示降序，4节>3节>2节
-
-            # 学生人数（越多优先级越高）
-            student_count = task.student_count or 0
-
-            # 计算该offering的总学时
-            offering_tasks = [t for t in tasks if t.offering_id == task.offering_id]
-            total_slots = sum(t.slots_count for t in offering_tasks)
-
-            return (
-                nature_priority.get(offering.course_nature, 2),
-                slots_priority,  # 课时长度优先级（新增）
-                -student_count,  # 负号表示降序
-                -total_slots,  # 负号表示降序
-            )
-
-        sorted_tasks = sorted(tasks, key=priority_key)
+        排序键见 ProblemInstance.priority_key：课程性质（通识 > 必修 > 选修）、
+        课时长度（长课优先，避免时间块被短课程占用）、学生人数、开课计划总学时。
+        """
+        tasks = self.data["teaching_tasks"]
+        order = sorted(range(len(tasks)), key=self.instance.priority_key)
+        sorted_tasks = [tasks[i] for i in order]
         logger.info("任务优先级排序完成：长课程优先，必修课优先")
         return sorted_tasks
 
@@ -163,6 +218,53 @@ class SchedulingGeneticAlgorithm:
                 blackouts[teacher_id].add((blackout.weekday, slot))
         return dict(blackouts)
 
+    def _build_task_domains(self):
+        """预先计算每个任务的候选域
+
+        候选域只包含静态合法的安排：工作日、该节数的有效时间块、
+        避开周四下午（第6-10节），且不落在任何授课教师的黑名单时间内
+        （适应度对任务的所有教师都检查黑名单）。
+        初始化、变异和修复都只在候选域内采样，不再做无效的随机尝试。
+
+        结果:
+            self.task_time_domains: task_id -> [(weekday, start_slot), ...]
+            self.task_domains: task_id -> [(teacher_id, weekday, start_slot), ...]
+        """
+        self.task_time_domains = {}
+        self.task_domains = {}
+
+        for task in self.tasks:
+            if not task.teachers:
+                continue
+
+            static_times = [
+                (weekday, start_slot)
+                for weekday in range(1, 6)  # 只排工作日
+                for start_slot, _ in get_valid_time_slots(task.slots_count)
+                if not (weekday == 4 and 6 <= start_slot <= 10)
+            ]
+            legal_times = [
+                (weekday, start_slot)
+                for weekday, start_slot in static_times
+                if not any(
+                    self._violates_teacher_blackout(
+                        t_id, weekday, start_slot, task.slots_count
+                    )
+                    for t_id in task.teachers
+                )
+            ]
+            if not legal_times:
+                # 教师黑名单覆盖了全部时间：保留未剪枝的时间，交由适应度惩罚
+                logger.warning(f"任务 {task.task_id} 的教师黑名单覆盖了全部可用时间")
+                legal_times = static_times
+
+            self.task_time_domains[task.task_id] = legal_times
+            self.task_domains[task.task_id] = [
+                (teacher_id, weekday, start_slot)
+                for teacher_id in task.teachers
+                for weekday, start_slot in legal_times
+            ]
+
     def _build_teacher_preferences(self) -> Dict[str, Dict]:
         """构建教师偏好映射"""
         preferences = defaultdict(lambda: {"preferred": [], "avoided": []})
@@ -218,55 +320,180 @@ class SchedulingGeneticAlgorithm:
             for feature in classroom.features:
                 self.classrooms_by_feature[feature].append(classroom)
 
+        # 染色体编码表：个体按任务下标定长排列（无教师的任务不参与排课）
+        self.schedulable_tasks = [task for task in self.tasks if task.teachers]
+        self.codec = ChromosomeCodec(
+            self.schedulable_tasks, list(self.data["classrooms"].keys())
+        )
+
+        # 按任务预先筛选并排序静态可用的教室（学生人数 × 特征要求相同的任务共用一份）
+        self.task_classrooms = {}
+        self.task_mutation_classrooms = {}
+        index_cache = {}
+        for task in self.tasks:
+            key = (task.student_count, frozenset(task.required_features))
+            if key not in index_cache:
+                index_cache[key] = self._build_classroom_index(task)
+            (
+                self.task_classrooms[task.task_id],
+                self.task_mutation_classrooms[task.task_id],
+            ) = index_cache[key]
+        logger.info(f"教室索引构建完成：{len(index_cache)} 种容量/特征组合")
+
+    def _build_classroom_index(
+        self, task: TeachingTask
+    ) -> Tuple[List[Classroom], List[Classroom]]:
+        """计算任务静态可用的教室列表
+
+        Returns:
+            (放置用教室列表, 变异用教室列表)
+            - 放置用：满足容量、浪费率和特征要求，按利用率得分排序
+            - 变异用：满足容量和特征要求，按与 1.2 倍人数的接近程度排序
+        """
+        # 允许最大浪费率：小班(<30人)允许50%，中班(30-60)允许40%，大班(>60)允许30%
+        max_waste_ratio = (
+            0.5 if task.student_count < 30 else (0.4 if task.student_count < 60 else 0.3)
+        )
+
+        placement = []
+        mutation = []
+        for classroom in self.classrooms:
+            # 检查容量：必须大于等于学生人数
+            if classroom.capacity < task.student_count:
+                continue
+
+            # 检查特征要求
+            if not task.required_features.issubset(classroom.features):
+                continue
+
+            mutation.append(classroom)
+
+            # 容量浪费检查：避免容量过大
+            waste_ratio = (classroom.capacity - task.student_count) / classroom.capacity
+            if waste_ratio > max_waste_ratio:
+                continue  # 容量浪费太大，跳过
+
+            placement.append(classroom)
+
+        placement.sort(
+            key=lambda c: self._utilization_score(task.student_count, c.capacity)
+        )
+        mutation.sort(key=lambda x: abs(x.capacity - task.student_count * 1.2))
+        return placement, mutation
+
+    def _apply_pinned_genes(self):
+        """锁定部分任务的安排
+
+        被锁定任务的候选域收缩为唯一的锁定安排，初始化、变异、修复和局部搜索
+        因此都只会改动未锁定的任务；锁定任务仍留在个体中，适应度照常计入其占用。
+
+        结果:
+            self.pinned_genes: task_id -> 锁定的基因
+        """
+        pinned = {}
+        if self.config.get("pin_seed_schedules") and self.data.get("seed_schedules"):
+            pinned.update(seed_genes_from_schedules(self, self.data["seed_schedules"]))
+        for gene in self.config.get("pinned_genes") or []:
+            pinned[gene.task_id] = gene
+
+        self.pinned_genes = {}
+        for task_id, gene in pinned.items():
+            if task_id not in self.task_domains:
+                logger.warning(f"锁定的任务 {task_id} 不在可排课任务中，忽略")
+                continue
+            if gene.classroom_id not in self.data["classrooms"]:
+                logger.warning(f"锁定任务 {task_id} 的教室 {gene.classroom_id} 不存在，忽略")
+                continue
+            classroom = self.data["classrooms"][gene.classroom_id]
+            self.pinned_genes[task_id] = gene
+            self.task_time_domains[task_id] = [(gene.week_day, gene.start_slot)]
+            self.task_domains[task_id] = [
+                (gene.teacher_id, gene.week_day, gene.start_slot)
+            ]
+            self.task_classrooms[task_id] = [classroom]
+            self.task_mutation_classrooms[task_id] = [classroom]
+
+        if self.pinned_genes:
+            logger.info(
+                f"已锁定 {len(self.pinned_genes)} 个任务，"
+                f"只优化其余 {len(self.schedulable_tasks) - len(self.pinned_genes)} 个任务"
+            )
+
+    @staticmethod
+    def _utilization_score(student_count: int, capacity: int) -> float:
+        """计算教室利用率得分，越接近理想利用率得分越高（分数越小越好）
+
+        目标：利用率在80%-95%之间最佳
+        """
+        if capacity == 0:
+            return float("inf")
+
+        utilization = student_count / capacity
+
+        # 优化后的利用率评分：更严格的容量匹配
+        if 0.80 <= utilization <= 0.95:
+            # 最佳区间：80%-95%利用率
+            return abs(0.875 - utilization)  # 最接近87.5%的最好
+        elif 0.70 <= utilization < 0.80:
+            # 次优区间：70%-80%
+            return 0.10 + abs(0.75 - utilization)
+        elif 0.95 < utilization <= 1.0:
+            # 可接受区间：95%-100%（接近满员）
+            return 0.08 + abs(0.975 - utilization)
+        elif 0.60 <= utilization < 0.70:
+            # 勉强可接受：60%-70%（有一定浪费）
+            return 0.20 + abs(0.65 - utilization)
+        else:
+            # 利用率过低（<60%）或理论上的过载（>100%），大幅惩罚
+            return 1.0 + abs(0.85 - utilization)
+
     def create_individual(self) -> List[Gene]:
         """创建一个个体（染色体）"""
         genes = []
 
-        # 跟踪占用情况
-        teacher_schedule = defaultdict(set)  # teacher_id -> {(weekday, slot), ...}
-        class_schedule = defaultdict(set)  # class_id -> {(weekday, slot), ...}
-        classroom_schedule = defaultdict(set)  # classroom_id -> {(weekday, slot), ...}
-
-        # 跟踪带周次信息的占用情况
-        # 结构: schedule_with_weeks[id][(weekday, slot)] = [weeks1, weeks2, ...]
-        class_schedule_with_weeks = defaultdict(lambda: defaultdict(list))
-        classroom_schedule_with_weeks = defaultdict(lambda: defaultdict(list))
+        # 跟踪占用情况（带周次位图）
+        teacher_occupancy = OccupancyGrid()
+        class_occupancy = OccupancyGrid()
+        classroom_occupancy = OccupancyGrid()
 
         for task in self.tasks:
             gene = self._create_gene_for_task(
-                task,
-                teacher_schedule,
-                class_schedule,
-                classroom_schedule,
-                class_schedule_with_weeks,
-                classroom_schedule_with_weeks,
+                task, teacher_occupancy, class_occupancy, classroom_occupancy
             )
             if gene:
                 genes.append(gene)
                 self._update_schedules(
-                    gene,
-                    task,
-                    teacher_schedule,
-                    class_schedule,
-                    classroom_schedule,
-                    class_schedule_with_weeks,
-                    classroom_schedule_with_weeks,
+                    gene, task, teacher_occupancy, class_occupancy, classroom_occupancy
                 )
 
         return genes
 
+    def create_seeded_individual(
+        self, seed: int, constructive: bool = False
+    ) -> List[Gene]:
+        """用指定种子重置随机状态后创建个体（同一种子在任何进程中结果相同）
+
+        Args:
+            seed: 随机种子
+            constructive: True 时按 DSATUR 顺序构造，否则按优先级顺序随机构造
+        """
+        random.seed(seed)
+        if constructive:
+            return create_dsatur_individual(self)
+        return self.create_individual()
+
     def _create_gene_for_task(
         self,
         task: TeachingTask,
-        teacher_schedule: Dict,
-        class_schedule: Dict,
-        classroom_schedule: Dict,
-        class_schedule_with_weeks: Dict = None,
-        classroom_schedule_with_weeks: Dict = None,
+        teacher_occupancy: OccupancyGrid,
+        class_occupancy: OccupancyGrid,
+        classroom_occupancy: OccupancyGrid,
     ) -> Optional[Gene]:
         """为单个任务创建基因"""
         if not task.teachers:
             return None
+        if task.task_id in self.pinned_genes:
+            return self.pinned_genes[task.task_id]
 
         # 获取有效时间块
         valid_slots = get_valid_time_slots(task.slots_count)
@@ -274,94 +501,33 @@ class SchedulingGeneticAlgorithm:
         # 根据课程性质确定时间偏好
         preferred_weekdays = self._get_preferred_weekdays(task)
         preferred_time_slots = self._get_preferred_time_slots(task, valid_slots)
+        preferred_starts = {start_slot for start_slot, _ in preferred_time_slots}
+
+        # 候选域已剔除周末、周四下午和教师黑名单时间，这里只需检查占用冲突
+        domain = self.task_domains[task.task_id]
+        preferred_candidates = [
+            c for c in domain if c[1] in preferred_weekdays and c[2] in preferred_starts
+        ]
+        other_candidates = [
+            c
+            for c in domain
+            if not (c[1] in preferred_weekdays and c[2] in preferred_starts)
+        ]
+        random.shuffle(preferred_candidates)
+        random.shuffle(other_candidates)
 
         # 尝试多次找到可行的安排
         max_attempts = 300  # 大幅增加尝试次数以减少班级冲突
 
-        # 首先尝试偏好时间（60%的尝试）
-        for attempt in range(int(max_attempts * 0.6)):
-            # 随机选择教师
-            teacher_id = random.choice(task.teachers)
-
-            # 优先选择偏好的时间
-            weekday = random.choice(preferred_weekdays)
-            start_slot, _ = random.choice(preferred_time_slots)
-
-            # 检查周四下午限制（第6-10节不可排课，第11-13节晚上可以）
-            if weekday == 4 and 6 <= start_slot <= 10:
-                continue
-
-            # 检查教师黑名单时间
-            if self._violates_teacher_blackout(
-                teacher_id, weekday, start_slot, task.slots_count
-            ):
-                continue
-
-            # 检查时间冲突
-            if self._has_time_conflict(
-                teacher_id,
-                task.classes,
-                weekday,
-                start_slot,
-                task.slots_count,
-                teacher_schedule,
-                class_schedule,
-                task_id=task.task_id,
-                weeks=task.weeks,
-                class_schedule_with_weeks=class_schedule_with_weeks,
-            ):
-                continue
-
-            # 选择合适的教室（优化：传入上下文以提高连续性）
-            classroom = self._select_classroom(
-                task,
-                weekday,
-                start_slot,
-                classroom_schedule,
-                teacher_id=teacher_id,
-                class_ids=task.classes,
-                existing_genes=[],  # 初始创建时无已有基因
-                classroom_schedule_with_weeks=classroom_schedule_with_weeks,
-            )
-            if classroom:
-                return Gene(
-                    task.task_id,
-                    teacher_id,
-                    classroom.classroom_id,
-                    weekday,
-                    start_slot,
-                )
-
-        # 如果偏好时间无法安排，尝试所有可能时间（40%的尝试）
-        for attempt in range(int(max_attempts * 0.4)):
-            # 随机选择教师
-            teacher_id = random.choice(task.teachers)
-
-            # 随机选择时间（只选工作日，避免周末硬约束）
-            weekday = random.randint(1, 5)  # 只选周一到周五
-            start_slot, _ = random.choice(valid_slots)
-
-            # 检查周四下午限制（第6-10节不可排课，第11-13节晚上可以）
-            if weekday == 4 and 6 <= start_slot <= 10:
-                continue
-
-            # 检查教师黑名单时间
-            if self._violates_teacher_blackout(
-                teacher_id, weekday, start_slot, task.slots_count
-            ):
-                continue
-
+        # 首先尝试偏好时间（60%的尝试），再尝试其他合法时间（40%的尝试）
+        candidates = (
+            preferred_candidates[: int(max_attempts * 0.6)]
+            + other_candidates[: int(max_attempts * 0.4)]
+        )
+        for teacher_id, weekday, start_slot in candidates:
             # 检查时间冲突
             if self._has_time_conflict(
-                teacher_id,
-                task.classes,
-                weekday,
-                start_slot,
-                task.slots_count,
-                teacher_schedule,
-                class_schedule,
-                task_id=task.task_id,
-                weeks=task.weeks,
+                task, weekday, start_slot, teacher_occupancy, class_occupancy
             ):
                 continue
 
@@ -370,11 +536,10 @@ class SchedulingGeneticAlgorithm:
                 task,
                 weekday,
                 start_slot,
-                classroom_schedule,
+                classroom_occupancy,
                 teacher_id=teacher_id,
                 class_ids=task.classes,
                 existing_genes=[],  # 初始创建时无已有基因
-                classroom_schedule_with_weeks=classroom_schedule_with_weeks,
             )
             if classroom:
                 return Gene(
@@ -386,15 +551,11 @@ class SchedulingGeneticAlgorithm:
                 )
 
         # 如果无法找到可行安排，返回一个随机安排（会在适应度函数中被惩罚）
-        # 但仍然需要遵守周四下午禁排等硬性规则
-        teacher_id = random.choice(task.teachers)
+        # 候选域本身已遵守周四下午禁排等硬性规则
+        teacher_id, weekday, start_slot = random.choice(
+            preferred_candidates or other_candidates
+        )
         classroom = random.choice(self.classrooms)
-        for _ in range(50):
-            weekday = random.choice(preferred_weekdays)
-            start_slot, _ = random.choice(preferred_time_slots)
-            # 确保不违反周四下午禁排规则
-            if not (weekday == 4 and 6 <= start_slot <= 10):
-                break
 
         return Gene(
             task.task_id, teacher_id, classroom.classroom_id, weekday, start_slot
@@ -475,61 +636,32 @@ class SchedulingGeneticAlgorithm:
 
     def _has_time_conflict(
         self,
-        teacher_id: str,
-        class_ids: List[str],
+        task: TeachingTask,
         weekday: int,
         start_slot: int,
-        slots_count: int,
-        teacher_schedule: Dict,
-        class_schedule: Dict,
-        task_id: str = None,
-        weeks: Set[int] = None,
-        class_schedule_with_weeks: Dict = None,
+        teacher_occupancy: OccupancyGrid,
+        class_occupancy: OccupancyGrid,
     ) -> bool:
         """检查时间冲突
 
         重要修复: 对于多教师课程,需要检查该任务的所有教师是否有冲突,
         而不仅仅检查基因中被选中的那个教师。
 
-        周次冲突检查: 只有当时间段冲突且周次有重叠时才算冲突。
+        周次冲突检查: 只有当时间段冲突且周次有重叠时才算冲突（教师与班级相同）。
         """
-        time_slots = {
-            (weekday, slot) for slot in range(start_slot, start_slot + slots_count)
-        }
+        week_mask = self.task_week_masks[task.task_id]
 
-        # 如果提供了task_id,检查该任务的所有教师
-        if task_id and task_id in self.task_dict:
-            task = self.task_dict[task_id]
-            for tid in task.teachers:
-                if teacher_schedule[tid] & time_slots:
-                    # 时间冲突,检查周次是否重叠
-                    if (
-                        weeks is None
-                        or task.weeks is None
-                        or len(task.weeks & weeks) > 0
-                    ):
-                        return True
-        else:
-            # 向后兼容:只检查传入的单个教师
-            if teacher_schedule[teacher_id] & time_slots:
+        for tid in task.teachers:
+            if teacher_occupancy.conflicts(
+                tid, weekday, start_slot, task.slots_count, week_mask
+            ):
                 return True
 
-        # 检查班级冲突（考虑周次）
-        if class_schedule_with_weeks and weeks:
-            for class_id in class_ids:
-                for time_key in time_slots:
-                    if time_key in class_schedule_with_weeks[class_id]:
-                        # 该班级在该时间有课，检查周次是否重叠
-                        for other_weeks in class_schedule_with_weeks[class_id][
-                            time_key
-                        ]:
-                            if len(weeks & other_weeks) > 0:
-                                return True
-        else:
-            # 旧逻辑：保守检测（无周次信息时）
-            for class_id in class_ids:
-                if class_schedule[class_id] & time_slots:
-                    return True
+        for class_id in task.classes:
+            if class_occupancy.conflicts(
+                class_id, weekday, start_slot, task.slots_count, week_mask
+            ):
+                return True
 
         return False
 
@@ -538,176 +670,91 @@ class SchedulingGeneticAlgorithm:
         task: TeachingTask,
         weekday: int,
         start_slot: int,
-        classroom_schedule: Dict,
+        classroom_occupancy: OccupancyGrid,
         teacher_id: str = None,
         class_ids: List[str] = None,
         existing_genes: List[Gene] = None,
-        classroom_schedule_with_weeks: Dict = None,
     ) -> Optional[Classroom]:
-        """选择合适的教室（优化版：优先选择同教师/班级已使用的教室）"""
-        time_slots = {
-            (weekday, slot) for slot in range(start_slot, start_slot + task.slots_count)
-        }
+        """选择合适的教室（优化版：优先选择同教师/班级已使用的教室）
 
-        # 筛选满足容量和特征要求的教室
-        suitable_classrooms = []
-        for classroom in self.classrooms:
-            # 检查容量：必须大于等于学生人数
-            if classroom.capacity < task.student_count:
-                continue
-
-            # 容量浪费检查：避免容量过大
-            # 允许最大浪费率：小班(<30人)允许50%，中班(30-60)允许40%，大班(>60)允许30%
-            max_waste_ratio = (
-                0.5
-                if task.student_count < 30
-                else (0.4 if task.student_count < 60 else 0.3)
-            )
-            waste_ratio = (classroom.capacity - task.student_count) / classroom.capacity
-            if waste_ratio > max_waste_ratio:
-                continue  # 容量浪费太大，跳过
-
-            # 检查特征要求
-            if not task.required_features.issubset(classroom.features):
-                continue
+        静态条件（容量、浪费率、特征）已在教室索引中筛好并按利用率排序，
+        这里只需按顺序过滤时间占用。
+        """
+        week_mask = self.task_week_masks[task.task_id]
+
+        # 优先选择同教师/班级在当天已使用的教室（提高连续性）
+        used_classrooms_today = set()
+        if existing_genes and (teacher_id or class_ids):
+            for gene in existing_genes:
+                if gene.week_day == weekday:
+                    # 同教师
+                    if teacher_id and gene.teacher_id == teacher_id:
+                        used_classrooms_today.add(gene.classroom_id)
+                    # 同班级
+                    if class_ids:
+                        gene_task = self.task_dict.get(gene.task_id)
+                        if gene_task and set(gene_task.classes) & set(class_ids):
+                            used_classrooms_today.add(gene.classroom_id)
 
+        first_available = None
+        for classroom in self.task_classrooms[task.task_id]:
             # 检查时间冲突（考虑周次）
-            has_conflict = False
-            if classroom_schedule_with_weeks and task.weeks:
-                # 使用带周次的检测
-                for time_key in time_slots:
-                    if (
-                        time_key
-                        in classroom_schedule_with_weeks[classroom.classroom_id]
-                    ):
-                        # 该教室在该时间被占用，检查周次是否重叠
-                        for other_weeks in classroom_schedule_with_weeks[
-                            classroom.classroom_id
-                        ][time_key]:
-                            if len(task.weeks & other_weeks) > 0:
-                                has_conflict = True
-                                break
-                    if has_conflict:
-                        break
-            else:
-                # 旧逻辑：保守检测
-                if classroom_schedule[classroom.classroom_id] & time_slots:
-                    has_conflict = True
-
-            if has_conflict:
+            if classroom_occupancy.conflicts(
+                classroom.classroom_id,
+                weekday,
+                start_slot,
+                task.slots_count,
+                week_mask,
+            ):
                 continue
 
-            suitable_classrooms.append(classroom)
-
-        if suitable_classrooms:
-            # 优先选择同教师/班级在当天已使用的教室（提高连续性）
-            preferred_classrooms = []
-            if existing_genes and (teacher_id or class_ids):
-                used_classrooms_today = set()
-                for gene in existing_genes:
-                    if gene.week_day == weekday:
-                        # 同教师
-                        if teacher_id and gene.teacher_id == teacher_id:
-                            used_classrooms_today.add(gene.classroom_id)
-                        # 同班级
-                        if class_ids:
-                            gene_task = self.task_dict.get(gene.task_id)
-                            if gene_task and set(gene_task.classes) & set(class_ids):
-                                used_classrooms_today.add(gene.classroom_id)
-
-                # 筛选出已使用的教室
-                for classroom in suitable_classrooms:
-                    if classroom.classroom_id in used_classrooms_today:
-                        preferred_classrooms.append(classroom)
-
-            # 优先使用已使用的教室，如果没有则使用所有合适教室
-            classrooms_to_choose = (
-                preferred_classrooms if preferred_classrooms else suitable_classrooms
-            )
-
-            # 优先选择容量最匹配的教室（严格控制浪费）
-            # 目标：利用率在80%-95%之间最佳
-            def utilization_score(classroom):
-                """计算教室利用率得分，越接近理想利用率得分越高（分数越小越好）"""
-                if classroom.capacity == 0:
-                    return float("inf")
-
-                utilization = task.student_count / classroom.capacity
+            # 优先使用已使用的教室，如果没有则使用利用率最优的合适教室
+            if classroom.classroom_id in used_classrooms_today:
+                return classroom
+            if first_available is None:
+                first_available = classroom
+                if not used_classrooms_today:
+                    break
 
-                # 如果是优先教室（已使用），给予额外奖励
-                is_preferred = classroom.classroom_id in (
-                    {c.classroom_id for c in preferred_classrooms}
-                    if preferred_classrooms
-                    else set()
-                )
-                preference_bonus = (
-                    -0.25 if is_preferred else 0
-                )  # 负数表示更优先（权重增强：从-0.15提升至-0.25）
-
-                # 优化后的利用率评分：更严格的容量匹配
-                if 0.80 <= utilization <= 0.95:
-                    # 最佳区间：80%-95%利用率
-                    return (
-                        abs(0.875 - utilization) + preference_bonus
-                    )  # 最接近87.5%的最好
-                elif 0.70 <= utilization < 0.80:
-                    # 次优区间：70%-80%
-                    return 0.10 + abs(0.75 - utilization) + preference_bonus
-                elif 0.95 < utilization <= 1.0:
-                    # 可接受区间：95%-100%（接近满员）
-                    return 0.08 + abs(0.975 - utilization) + preference_bonus
-                elif 0.60 <= utilization < 0.70:
-                    # 勉强可接受：60%-70%（有一定浪费）
-                    return 0.20 + abs(0.65 - utilization) + preference_bonus
-                else:
-                    # 利用率过低（<60%）或理论上的过载（>100%），大幅惩罚
-                    return 1.0 + abs(0.85 - utilization) + preference_bonus
-
-            classrooms_to_choose.sort(key=utilization_score)
-            return classrooms_to_choose[0]
-
-        return None
+        return first_available
 
     def _update_schedules(
         self,
         gene: Gene,
         task: TeachingTask,
-        teacher_schedule: Dict,
-        class_schedule: Dict,
-        classroom_schedule: Dict,
-        class_schedule_with_weeks: Dict = None,
-        classroom_schedule_with_weeks: Dict = None,
-    ):
+        teacher_occupancy: OccupancyGrid,
+        class_occupancy: OccupancyGrid,
+        classroom_occupancy: OccupancyGrid,
+    ) -> Tuple[int, int, int]:
         """更新时间占用情况
 
         重要修复: 对于多教师课程,需要标记所有教师的时间占用,
         而不是只标记基因中选中的那个教师。
+
+        Returns:
+            与已有占用发生冲突的节数：(教师, 班级, 教室)
         """
-        time_slots = {
-            (gene.week_day, slot)
-            for slot in range(gene.start_slot, gene.start_slot + task.slots_count)
-        }
+        week_mask = self.task_week_masks[task.task_id]
+        weekday, start_slot, slots_count = gene.week_day, gene.start_slot, task.slots_count
 
         # 修复: 更新任务的所有教师的时间占用
+        teacher_conflicts = 0
         for teacher_id in task.teachers:
-            teacher_schedule[teacher_id].update(time_slots)
-
-        classroom_schedule[gene.classroom_id].update(time_slots)
+            teacher_conflicts += teacher_occupancy.occupy(
+                teacher_id, weekday, start_slot, slots_count, week_mask
+            )
 
+        class_conflicts = 0
         for class_id in task.classes:
-            class_schedule[class_id].update(time_slots)
+            class_conflicts += class_occupancy.occupy(
+                class_id, weekday, start_slot, slots_count, week_mask
+            )
 
-        # 更新带周次信息的schedule
-        if class_schedule_with_weeks and task.weeks:
-            for class_id in task.classes:
-                for time_key in time_slots:
-                    class_schedule_with_weeks[class_id][time_key].append(task.weeks)
+        classroom_conflicts = classroom_occupancy.occupy(
+            gene.classroom_id, weekday, start_slot, slots_count, week_mask
+        )
 
-        if classroom_schedule_with_weeks and task.weeks:
-            for time_key in time_slots:
-                classroom_schedule_with_weeks[gene.classroom_id][time_key].append(
-                    task.weeks
-                )
+        return teacher_conflicts, class_conflicts, classroom_conflicts
 
     def fitness(self, individual: List[Gene]) -> float:
         """计算适应度函数
@@ -719,63 +766,47 @@ class SchedulingGeneticAlgorithm:
         """
         score = 0
 
-        # 构建时间占用表
-        teacher_schedule = defaultdict(list)
-        class_schedule = defaultdict(list)
-        classroom_schedule = defaultdict(list)
+        # 构建带周次位图的时间占用表，同时统计冲突节数
+        teacher_occupancy = OccupancyGrid()
+        class_occupancy = OccupancyGrid()
+        classroom_occupancy = OccupancyGrid()
+        teacher_conflicts = class_conflicts = classroom_conflicts = 0
 
-        # 构建带周次信息的占用表
-        # 结构: schedule_with_weeks[id][(weekday, slot)] = [weeks1, weeks2, ...]
-        class_schedule_with_weeks = defaultdict(lambda: defaultdict(list))
-        classroom_schedule_with_weeks = defaultdict(lambda: defaultdict(list))
+        # 班级每日课时数（学生负荷）
+        class_daily_slots = defaultdict(int)
 
         for gene in individual:
             task = self.task_dict[gene.task_id]
-            end_slot = gene.start_slot + task.slots_count - 1
-
-            for slot in range(gene.start_slot, end_slot + 1):
-                time_key = (gene.week_day, slot)
-
-                # 修复: 记录任务的所有教师的时间占用
-                for teacher_id in task.teachers:
-                    teacher_schedule[teacher_id].append(time_key)
+            t_count, c_count, r_count = self._update_schedules(
+                gene, task, teacher_occupancy, class_occupancy, classroom_occupancy
+            )
+            teacher_conflicts += t_count
+            class_conflicts += c_count
+            classroom_conflicts += r_count
 
-                classroom_schedule[gene.classroom_id].append(time_key)
+            for class_id in task.classes:
+                class_daily_slots[(class_id, gene.week_day)] += task.slots_count
 
-                for class_id in task.classes:
-                    class_schedule[class_id].append(time_key)
-                    # 记录周次信息
-                    if task.weeks:
-                        class_schedule_with_weeks[class_id][time_key].append(task.weeks)
-
-                # 记录教室的周次信息
-                if task.weeks:
-                    classroom_schedule_with_weeks[gene.classroom_id][time_key].append(
-                        task.weeks
-                    )
+        conflict_counts = {
+            "teacher_conflict": teacher_conflicts,
+            "class_conflict": class_conflicts,
+            "classroom_conflict": classroom_conflicts,
+        }
 
         # 检查硬约束
-        score += self._check_hard_constraints(
-            individual, teacher_schedule, class_schedule, classroom_schedule
-        )
+        score += self._check_hard_constraints(individual, conflict_counts)
 
         # 如果硬约束分数低于阈值，直接返回
         if score < -50000:
             return score
 
         # 检查软约束
-        score -= self._check_soft_constraints(
-            individual, teacher_schedule, class_schedule, classroom_schedule
-        )
+        score -= self._check_soft_constraints(individual, class_daily_slots)
 
         return score
 
     def _check_hard_constraints(
-        self,
-        individual: List[Gene],
-        teacher_schedule: Dict,
-        class_schedule: Dict,
-        classroom_schedule: Dict,
+        self, individual: List[Gene], conflict_counts: Dict[str, int]
     ) -> float:
         """检查硬约束
 
@@ -791,82 +822,67 @@ class SchedulingGeneticAlgorithm:
         """
         penalty = 0
 
-        # 检查时间冲突（教师 / 班级 / 教室 三类硬约束）
-        for schedule_dict, conflict_type in [
-            (teacher_schedule, "teacher_conflict"),
-            (class_schedule, "class_conflict"),
-            (classroom_schedule, "classroom_conflict"),
-        ]:
-            for entity_id, time_list in schedule_dict.items():
-                conflict_count = len(time_list) - len(set(time_list))
-                if conflict_count > 0:
-                    penalty += (
-                        conflict_count * self.config["penalty_scores"][conflict_type]
-                    )
+        # 检查时间冲突（教师 / 班级 / 教室 三类硬约束，按冲突节数计）
+        for conflict_type in ["teacher_conflict", "class_conflict", "classroom_conflict"]:
+            conflict_count = conflict_counts.get(conflict_type, 0)
+            if conflict_count > 0:
+                penalty += conflict_count * self.config["penalty_scores"][conflict_type]
 
         # 检查其他硬约束：容量、设施、黑名单、周四下午、校区通勤
         for gene in individual:
-            task = self.task_dict[gene.task_id]
+            penalty += self._gene_hard_penalty(gene, self.task_dict[gene.task_id])
 
-            # 【新增】周末禁排课硬约束
-            if gene.week_day in [6, 7]:
-                penalty += self.config["penalty_scores"]["weekend_penalty"]
+        # 检查校区通勤（现在视为硬约束）：同一教师同一天涉及多个校区
+        teacher_daily_rooms = defaultdict(set)
+        for gene in individual:
+            for t_id in self.task_dict[gene.task_id].teachers:
+                teacher_daily_rooms[(t_id, gene.week_day)].add(gene.classroom_id)
 
-            # 检查教室容量
-            classroom = self.data["classrooms"][gene.classroom_id]
-            if classroom.capacity < task.student_count:
-                penalty += self.config["penalty_scores"]["capacity_violation"]
+        commute_count = self.instance.commute_count
+        for rooms in teacher_daily_rooms.values():
+            penalty += self.config["penalty_scores"]["campus_commute"] * commute_count(
+                rooms
+            )
 
-            # 检查特征要求
-            if not task.required_features.issubset(classroom.features):
-                penalty += self.config["penalty_scores"]["feature_violation"]
+        return penalty
 
-            # 检查教师黑名单时间
-            for t_id in task.teachers:
-                if self._violates_teacher_blackout(
-                    t_id, gene.week_day, gene.start_slot, task.slots_count
-                ):
-                    penalty += self.config["penalty_scores"]["blackout_violation"]
+    def _gene_hard_penalty(self, gene: Gene, task: TeachingTask) -> float:
+        """单个基因自身的硬约束惩罚（周末、容量、设施、黑名单、周四下午）
 
-            # 检查周四下午限制（第6-10节不可排课，第11-13节晚上可以）
-            if gene.week_day == 4 and 6 <= gene.start_slot <= 10:
-                penalty += self.config["penalty_scores"]["thursday_afternoon"]
+        只依赖基因本身，不依赖其他基因，供全量评估与增量评估共用。
+        """
+        penalty = 0
 
-        # 检查校区通勤（现在视为硬约束）：同一教师同一天涉及多个校区
-        teacher_daily_campuses = defaultdict(lambda: defaultdict(set))
+        # 【新增】周末禁排课硬约束
+        if gene.week_day in [6, 7]:
+            penalty += self.config["penalty_scores"]["weekend_penalty"]
 
-        for gene in individual:
-            task = self.task_dict[gene.task_id]
-            classroom = self.data["classrooms"][gene.classroom_id]
-            campus_id = classroom.campus_id
+        # 检查教室容量
+        instance = self.instance
+        room = instance.room_index[gene.classroom_id]
+        t = instance.task_index[task.task_id]
+        if instance.room_capacity[room] < instance.task_students[t]:
+            penalty += self.config["penalty_scores"]["capacity_violation"]
 
-            # 判断时段（上午：1-5，下午：6-10，晚上：11-13）
-            if gene.start_slot <= 5:
-                period = "morning"
-            elif gene.start_slot <= 10:
-                period = "afternoon"
-            else:
-                period = "evening"
+        # 检查特征要求（任务要求的设施位图不是教室设施位图的子集）
+        if instance.task_features[t] & ~instance.room_features[room]:
+            penalty += self.config["penalty_scores"]["feature_violation"]
 
-            for t_id in task.teachers:
-                teacher_daily_campuses[t_id][gene.week_day].add((period, campus_id))
-
-        for teacher_id, daily_campuses in teacher_daily_campuses.items():
-            for weekday, period_campuses in daily_campuses.items():
-                campuses = {campus_id for _, campus_id in period_campuses}
-                if len(campuses) > 1:
-                    penalty += self.config["penalty_scores"]["campus_commute"] * (
-                        len(campuses) - 1
-                    )
+        # 检查教师黑名单时间
+        for t_id in task.teachers:
+            if self._violates_teacher_blackout(
+                t_id, gene.week_day, gene.start_slot, task.slots_count
+            ):
+                penalty += self.config["penalty_scores"]["blackout_violation"]
+
+        # 检查周四下午限制（第6-10节不可排课，第11-13节晚上可以）
+        if gene.week_day == 4 and 6 <= gene.start_slot <= 10:
+            penalty += self.config["penalty_scores"]["thursday_afternoon"]
 
         return penalty
 
     def _check_soft_constraints(
-        self,
-        individual: List[Gene],
-        teacher_schedule: Dict,
-        class_schedule: Dict,
-        classroom_schedule: Dict,
+        self, individual: List[Gene], class_daily_slots: Dict[Tuple[str, int], int]
     ) -> float:
         """检查软约束
 
@@ -892,7 +908,7 @@ class SchedulingGeneticAlgorithm:
         penalty += self._check_utilization_waste(individual)
 
         # 学生负荷
-        penalty += self._check_student_overload(class_schedule)
+        penalty += self._check_student_overload(class_daily_slots)
 
         # 课程时段偏好（新增）
         penalty += self._check_course_time_preference(individual)
@@ -911,35 +927,44 @@ class SchedulingGeneticAlgorithm:
         penalty = 0
 
         for gene in individual:
-            task = self.task_dict[gene.task_id]
-            for t_id in task.teachers:
-                teacher_prefs = self.teacher_preferences.get(t_id, {})
+            penalty += self._gene_preference_penalty(
+                gene, self.task_dict[gene.task_id]
+            )
 
-                # 检查避免时段
-                for (weekday, start_slot, end_slot), penalty_score in teacher_prefs.get(
-                    "avoided", []
+        return penalty
+
+    def _gene_preference_penalty(self, gene: Gene, task: TeachingTask) -> float:
+        """单个基因的教师偏好惩罚（任务的所有教师）"""
+        penalty = 0
+
+        for t_id in task.teachers:
+            teacher_prefs = self.teacher_preferences.get(t_id, {})
+
+            # 检查避免时段
+            for (weekday, start_slot, end_slot), penalty_score in teacher_prefs.get(
+                "avoided", []
+            ):
+                if gene.week_day == weekday and not (
+                    gene.start_slot + task.slots_count <= start_slot
+                    or gene.start_slot >= end_slot + 1
                 ):
-                    if gene.week_day == weekday and not (
-                        gene.start_slot + task.slots_count <= start_slot
-                        or gene.start_slot >= end_slot + 1
-                    ):
-                        penalty += penalty_score
-
-                # 检查偏好时段
-                in_preferred = False
-                for (weekday, start_slot, end_slot), penalty_score in teacher_prefs.get(
-                    "preferred", []
+                    penalty += penalty_score
+
+            # 检查偏好时段
+            in_preferred = False
+            for (weekday, start_slot, end_slot), penalty_score in teacher_prefs.get(
+                "preferred", []
+            ):
+                if (
+                    gene.week_day == weekday
+                    and gene.start_slot >= start_slot
+                    and gene.start_slot + task.slots_count <= end_slot + 1
                 ):
-                    if (
-                        gene.week_day == weekday
-                        and gene.start_slot >= start_slot
-                        and gene.start_slot + task.slots_count <= end_slot + 1
-                    ):
-                        in_preferred = True
-                        break
+                    in_preferred = True
+                    break
 
-                if not in_preferred and teacher_prefs.get("preferred"):
-                    penalty += self.config["penalty_scores"]["teacher_preference"]
+            if not in_preferred and teacher_prefs.get("preferred"):
+                penalty += self.config["penalty_scores"]["teacher_preference"]
 
         return penalty
 
@@ -969,85 +994,51 @@ class SchedulingGeneticAlgorithm:
                     continue
 
                 gene_to = task_gene_map[related_task_id]
-                relation_type = rel["relation_type"]
-                constraint_penalty = rel.get(
-                    "penalty", self.config["penalty_scores"]["task_relation"]
-                )
-
-                # 计算两个任务的天数差
-                day_diff = abs(gene_from.week_day - gene_to.week_day)
-
-                if relation_type == "same_day":
-                    # 要求同一天
-                    if gene_from.week_day != gene_to.week_day:
-                        penalty += constraint_penalty
-                        logger.debug(
-                            f"任务关系约束违反: 任务{task_id}和{related_task_id}应在同一天，"
-                            f"但实际分别在周{gene_from.week_day}和周{gene_to.week_day}"
-                        )
-
-                elif relation_type == "different_day":
-                    # 避免连续两天
-                    if day_diff == 1:
-                        penalty += constraint_penalty
-                        logger.debug(
-                            f"任务关系约束违反: 任务{task_id}和{related_task_id}在连续两天，"
-                            f"周{gene_from.week_day}和周{gene_to.week_day}"
-                        )
-
-                elif relation_type == "time_gap":
-                    # 至少间隔N天
-                    min_gap = rel.get("min_gap_days", 1) or 1
-                    if day_diff < min_gap:
-                        penalty += constraint_penalty
-                        logger.debug(
-                            f"任务关系约束违反: 任务{task_id}和{related_task_id}应至少间隔{min_gap}天，"
-                            f"但实际只间隔{day_diff}天"
-                        )
+                penalty += self._relation_penalty(gene_from, gene_to, rel)
 
         return penalty
 
-    def _check_campus_commute(self, individual: List[Gene]) -> float:
-        """检查校区通勤（软约束）
-
-        - 按教师 + 日期统计当天涉及的校区数量；
-        - 如果同一天涉及多个校区，则按 (校区数 - 1) * campus_commute 扣分，鼓励同一教师当天尽量固定在一个校区。
-        """
-        penalty = 0
-
-        # 按教师和日期分组
-        teacher_daily_campuses = defaultdict(lambda: defaultdict(set))
-
-        for gene in individual:
-            task = self.task_dict[gene.task_id]
-            classroom = self.data["classrooms"][gene.classroom_id]
-            campus_id = classroom.campus_id
+    def _relation_penalty(self, gene_from: Gene, gene_to: Gene, rel: Dict) -> float:
+        """单条任务关系约束的惩罚"""
+        task_id = gene_from.task_id
+        related_task_id = gene_to.task_id
+        relation_type = rel["relation_type"]
+        constraint_penalty = rel.get(
+            "penalty", self.config["penalty_scores"]["task_relation"]
+        )
 
-            # 判断时段（上午：1-5，下午：6-10，晚上：11-13）
-            if gene.start_slot <= 5:
-                period = "morning"
-            elif gene.start_slot <= 10:
-                period = "afternoon"
-            else:
-                period = "evening"
+        # 计算两个任务的天数差
+        day_diff = abs(gene_from.week_day - gene_to.week_day)
 
-            for t_id in task.teachers:
-                teacher_daily_campuses[t_id][gene.week_day].add((period, campus_id))
-
-        # 检查每个教师每天的校区数量
-        for teacher_id, daily_campuses in teacher_daily_campuses.items():
-            for weekday, period_campuses in daily_campuses.items():
-                # 提取所有校区
-                campuses = set()
-                for period, campus_id in period_campuses:
-                    campuses.add(campus_id)
-
-                if len(campuses) > 1:
-                    penalty += self.config["penalty_scores"]["campus_commute"] * (
-                        len(campuses) - 1
-                    )
+        if relation_type == "same_day":
+            # 要求同一天
+            if gene_from.week_day != gene_to.week_day:
+                logger.debug(
+                    f"任务关系约束违反: 任务{task_id}和{related_task_id}应在同一天，"
+                    f"但实际分别在周{gene_from.week_day}和周{gene_to.week_day}"
+                )
+                return constraint_penalty
+
+        elif relation_type == "different_day":
+            # 避免连续两天
+            if day_diff == 1:
+                logger.debug(
+                    f"任务关系约束违反: 任务{task_id}和{related_task_id}在连续两天，"
+                    f"周{gene_from.week_day}和周{gene_to.week_day}"
+                )
+                return constraint_penalty
+
+        elif relation_type == "time_gap":
+            # 至少间隔N天
+            min_gap = rel.get("min_gap_days", 1) or 1
+            if day_diff < min_gap:
+                logger.debug(
+                    f"任务关系约束违反: 任务{task_id}和{related_task_id}应至少间隔{min_gap}天，"
+                    f"但实际只间隔{day_diff}天"
+                )
+                return constraint_penalty
 
-        return penalty
+        return 0
 
     def _check_classroom_continuity(self, individual: List[Gene]) -> float:
         """检查连堂课同教室（软约束）- 增强版
@@ -1089,36 +1080,42 @@ class SchedulingGeneticAlgorithm:
         # 检查教师连续课程
         for teacher_id, daily_classes in teacher_daily_classes.items():
             for weekday, classes in daily_classes.items():
-                classes.sort(key=lambda x: x[0])  # 按开始时间排序
-
-                for i in range(len(classes) - 1):
-                    curr_end = classes[i][1]
-                    next_start = classes[i + 1][0]
-                    curr_classroom = classes[i][2]
-                    next_classroom = classes[i + 1][2]
-
-                    # 如果是连续课程但不在同一教室
-                    if curr_end + 1 == next_start and curr_classroom != next_classroom:
-                        penalty += self.config["penalty_scores"]["classroom_continuity"]
+                penalty += (
+                    self._count_continuity_breaks(classes)
+                    * self.config["penalty_scores"]["classroom_continuity"]
+                )
 
         # 检查班级连续课程
         for class_id, daily_classes in class_daily_classes.items():
             for weekday, classes in daily_classes.items():
-                classes.sort(key=lambda x: x[0])
+                penalty += (
+                    self._count_continuity_breaks(classes)
+                    * self.config["penalty_scores"]["classroom_continuity"]
+                    * 0.8
+                )  # 班级权重略低
 
-                for i in range(len(classes) - 1):
-                    curr_end = classes[i][1]
-                    next_start = classes[i + 1][0]
-                    curr_classroom = classes[i][2]
-                    next_classroom = classes[i + 1][2]
+        return penalty
 
-                    # 如果是连续课程但不在同一教室
-                    if curr_end + 1 == next_start and curr_classroom != next_classroom:
-                        penalty += (
-                            self.config["penalty_scores"]["classroom_continuity"] * 0.8
-                        )  # 班级权重略低
+    def _count_continuity_breaks(self, classes: List[tuple]) -> int:
+        """统计一天内连续课程换教室的次数
 
-        return penalty
+        Args:
+            classes: [(start_slot, end_slot, classroom_id), ...]，会被原地按开始节次排序
+        """
+        classes.sort(key=lambda x: x[0])  # 按开始时间排序
+
+        breaks = 0
+        for i in range(len(classes) - 1):
+            curr_end = classes[i][1]
+            next_start = classes[i + 1][0]
+            curr_classroom = classes[i][2]
+            next_classroom = classes[i + 1][2]
+
+            # 如果是连续课程但不在同一教室
+            if curr_end + 1 == next_start and curr_classroom != next_classroom:
+                breaks += 1
+
+        return breaks
 
     def _check_utilization_waste(self, individual: List[Gene]) -> float:
         """检查教室利用率（软约束）
@@ -1129,34 +1126,36 @@ class SchedulingGeneticAlgorithm:
         penalty = 0
 
         for gene in individual:
-            task = self.task_dict[gene.task_id]
-            classroom = self.data["classrooms"][gene.classroom_id]
-
-            if classroom.capacity == 0:
-                continue
+            penalty += self._gene_utilization_penalty(
+                gene, self.task_dict[gene.task_id]
+            )
 
-            utilization = task.student_count / classroom.capacity
+        return penalty
 
-            # 非线性惩罚：鼓励75%-90%的理想利用率
-            if 0.75 <= utilization <= 0.90:
-                penalty += 0  # 理想范围
-            elif 0.60 <= utilization < 0.75:
-                penalty += (
-                    (0.75 - utilization)
-                    * 100
-                    * self.config["penalty_scores"]["utilization_waste"]
-                )
-            elif 0.90 < utilization <= 1.0:
-                penalty += (
-                    (utilization - 0.90)
-                    * 50
-                    * self.config["penalty_scores"]["utilization_waste"]
-                )
-            elif utilization < 0.60:
-                waste_ratio = 0.60 - utilization
-                penalty += (waste_ratio * waste_ratio * 500) * self.config[
-                    "penalty_scores"
-                ]["utilization_waste"]
+    def _gene_utilization_penalty(self, gene: Gene, task: TeachingTask) -> float:
+        """单个基因的教室利用率惩罚"""
+        instance = self.instance
+        capacity = instance.room_capacity[instance.room_index[gene.classroom_id]]
+
+        if capacity == 0:
+            return 0
+
+        students = instance.task_students[instance.task_index[task.task_id]]
+        utilization = students / capacity
+
+        # 非线性惩罚：鼓励75%-90%的理想利用率
+        waste = self.config["penalty_scores"]["utilization_waste"]
+        if 0.75 <= utilization <= 0.90:
+            return 0  # 理想范围
+        elif 0.60 <= utilization < 0.75:
+            penalty = (0.75 - utilization) * 100 * waste
+        elif 0.90 < utilization <= 1.0:
+            penalty = (utilization - 0.90) * 50 * waste
+        elif utilization < 0.60:
+            waste_ratio = 0.60 - utilization
+            penalty = (waste_ratio * waste_ratio * 500) * waste
+        else:
+            return 0
 
         return penalty
 
@@ -1194,29 +1193,28 @@ class SchedulingGeneticAlgorithm:
 
         return penalty
 
-    def _check_student_overload(self, class_schedule: Dict) -> float:
+    def _check_student_overload(
+        self, class_daily_slots: Dict[Tuple[str, int], int]
+    ) -> float:
         """检查学生负荷（软约束）
 
-        - 按班级 + 日期统计一天的总节数；
+        - 按班级 + 日期统计一天的总节数（class_daily_slots[(class_id, weekday)]）；
         - 超过 8 节的部分，每多 1 节，按 student_overload 扣分，
           防止学生某一天课太多、过于疲惫。
         """
         penalty = 0
 
-        for class_id, time_list in class_schedule.items():
-            # 按天统计课程数
-            daily_count = defaultdict(int)
-            for weekday, slot in time_list:
-                daily_count[weekday] += 1
-
-            for weekday, count in daily_count.items():
-                if count > 8:  # 一天超过8节课
-                    penalty += self.config["penalty_scores"]["student_overload"] * (
-                        count - 8
-                    )
+        for count in class_daily_slots.values():
+            penalty += self._overload_penalty(count)
 
         return penalty
 
+    def _overload_penalty(self, daily_slots: int) -> float:
+        """单个班级单日课时数的过载惩罚"""
+        if daily_slots > 8:  # 一天超过8节课
+            return self.config["penalty_scores"]["student_overload"] * (daily_slots - 8)
+        return 0
+
     def _check_course_time_preference(self, individual: List[Gene]) -> float:
         """检查课程时段偏好与周末惩罚（软约束）
 
@@ -1227,36 +1225,40 @@ class SchedulingGeneticAlgorithm:
         penalty = 0
 
         for gene in individual:
-            task = self.task_dict[gene.task_id]
-            offering = task.offering
+            penalty += self._gene_time_preference_penalty(
+                gene, self.task_dict[gene.task_id]
+            )
 
-            if not offering:
-                continue
+        return penalty
 
-            # 检查必修课和通识课是否被安排在晚上（11-13节）
-            if offering.course_nature in [CourseNature.REQUIRED, CourseNature.GENERAL]:
-                if gene.start_slot >= 11:  # 晚上时段
-                    # 必修课在晚上的惩罚比较重
-                    penalty += self.config["penalty_scores"]["required_night_penalty"]
-
-            # 检查选修课是否过度占用黄金时段（上午和下午前半段）
-            elif offering.course_nature == CourseNature.ELECTIVE:
-                if gene.start_slot <= 5 or (
-                    gene.start_slot >= 6 and gene.start_slot <= 8
-                ):
-                    # 选修课占用黄金时段的轻微惩罚
-                    penalty += self.config["penalty_scores"][
-                        "elective_prime_time_penalty"
-                    ]
+    def _gene_time_preference_penalty(self, gene: Gene, task: TeachingTask) -> float:
+        """单个基因的课程时段偏好惩罚"""
+        nature = self.instance.task_nature[self.instance.task_index[task.task_id]]
 
-        return penalty
+        # 检查必修课和通识课是否被安排在晚上（11-13节）；没有开课计划的任务 nature 为 NATURE_NONE
+        if nature == NATURE_REQUIRED or nature == NATURE_GENERAL:
+            if gene.start_slot >= 11:  # 晚上时段
+                # 必修课在晚上的惩罚比较重
+                return self.config["penalty_scores"]["required_night_penalty"]
+
+        # 检查选修课是否过度占用黄金时段（上午和下午前半段）
+        elif nature == NATURE_ELECTIVE:
+            if gene.start_slot <= 5 or (gene.start_slot >= 6 and gene.start_slot <= 8):
+                # 选修课占用黄金时段的轻微惩罚
+                return self.config["penalty_scores"]["elective_prime_time_penalty"]
+
+        return 0
 
     def crossover(
         self, parent1: List[Gene], parent2: List[Gene]
     ) -> Tuple[List[Gene], List[Gene]]:
-        """交叉操作"""
+        """交叉操作
+
+        个体按不可变值使用（变异、修复都在副本上进行），
+        不交叉时直接返回亲本本身，交叉时子代与亲本共享 Gene 对象。
+        """
         if random.random() > self.config["crossover_rate"]:
-            return parent1[:], parent2[:]
+            return parent1, parent2
 
         # 单点交叉
         crossover_point = random.randint(1, min(len(parent1), len(parent2)) - 1)
@@ -1267,10 +1269,20 @@ class SchedulingGeneticAlgorithm:
         return child1, child2
 
     def mutate(self, individual: List[Gene]) -> List[Gene]:
-        """变异操作（增强版，带冲突修复）"""
+        """变异操作（增强版，带冲突修复）
+
+        mutation_mode 为 "conflict_set" 时改用冲突集驱动的变异（见 conflict_mutation 模块），
+        否则每个基因按 mutation_rate 独立变异。
+        """
+        conflict_mutator = self._get_conflict_mutator()
+        if conflict_mutator is not None:
+            return conflict_mutator.mutate(individual)
+
         mutated = individual[:]
 
         for i, gene in enumerate(mutated):
+            if gene.task_id in self.pinned_genes:
+                continue
             if random.random() < self.config["mutation_rate"]:
                 # 调整变异类型权重：增加智能修复的概率
                 mutation_types = [
@@ -1285,168 +1297,147 @@ class SchedulingGeneticAlgorithm:
 
                 task = self.task_dict[gene.task_id]
 
-                if mutation_type == "teacher" and len(task.teachers) > 1:
-                    # 更换教师
-                    new_teacher = random.choice(
-                        [t for t in task.teachers if t != gene.teacher_id]
-                    )
-                    mutated[i] = Gene(
-                        gene.task_id,
-                        new_teacher,
-                        gene.classroom_id,
-                        gene.week_day,
-                        gene.start_slot,
-                    )
-
-                elif mutation_type == "time":
-                    # 更换时间（避开周末）
-                    valid_slots = get_valid_time_slots(task.slots_count)
-                    new_weekday = random.randint(1, 5)  # 只选工作日
-                    new_start_slot, _ = random.choice(valid_slots)
-
-                    # 避开周四下午（第6-10节不可排课，第11-13节晚上可以）
-                    if new_weekday == 4 and 6 <= new_start_slot <= 10:
-                        new_start_slot = random.choice(
-                            [s for s, _ in valid_slots if s < 6 or s > 10]
-                        )
-
-                    mutated[i] = Gene(
-                        gene.task_id,
-                        gene.teacher_id,
-                        gene.classroom_id,
-                        new_weekday,
-                        new_start_slot,
-                    )
-
-                elif mutation_type == "classroom":
-                    # 更换教室（优先选择容量匹配的）
-                    suitable_classrooms = [
-                        cr
-                        for cr in self.classrooms
-                        if (
-                            cr.capacity >= task.student_count
-                            and task.required_features.issubset(cr.features)
-                        )
-                    ]
-                    if suitable_classrooms:
-                        # 按容量接近程度排序
-                        suitable_classrooms.sort(
-                            key=lambda x: abs(x.capacity - task.student_count * 1.2)
-                        )
-                        # 有70%概率选最佳，30%随机选择
-                        if random.random() < 0.7:
-                            new_classroom = suitable_classrooms[0]
-                        else:
-                            new_classroom = random.choice(
-                                suitable_classrooms[:5]
-                                if len(suitable_classrooms) > 5
-                                else suitable_classrooms
-                            )
-
-                        mutated[i] = Gene(
-                            gene.task_id,
-                            gene.teacher_id,
-                            new_classroom.classroom_id,
-                            gene.week_day,
-                            gene.start_slot,
-                        )
-
-                elif mutation_type == "smart_repair":
+                if mutation_type == "smart_repair":
                     # 智能修复：检测冲突并尝试解决
-                    mutated[i] = self._repair_conflicting_gene(
-                        gene, mutated[:i] + mutated[i + 1 :], task
-                    )
+                    mutated[i] = self._repair_conflicting_gene(gene, mutated, task)
+                else:
+                    mutated[i] = self._random_gene_mutation(gene, task, mutation_type)
+
+                if self.telemetry is not None:
+                    self.telemetry.record_mutation(mutation_type, mutated[i] != gene)
 
         return mutated
 
-    def _repair_conflicting_gene(
-        self, gene: Gene, other_genes: List[Gene], task: TeachingTask
+    def _random_gene_mutation(
+        self, gene: Gene, task: TeachingTask, mutation_type: str
     ) -> Gene:
-        """修复有冲突的基因 - 增强版，优先解决班级冲突"""
-        # 检查当前基因是否有冲突，并记录冲突类型
-        has_class_conflict = False
-        has_teacher_conflict = False
-        has_classroom_conflict = False
-
-        for other_gene in other_genes:
-            if (
-                other_gene.week_day == gene.week_day
-                and other_gene.start_slot == gene.start_slot
-            ):
-                other_task = self.task_dict[other_gene.task_id]
-
-                # 检查班级冲突（最高优先级）
-                if set(task.classes) & set(other_task.classes):
-                    has_class_conflict = True
-
-                # 检查教师冲突
-                if gene.teacher_id == other_gene.teacher_id:
-                    has_teacher_conflict = True
-
-                # 检查教室冲突
-                if gene.classroom_id == other_gene.classroom_id:
-                    has_classroom_conflict = True
+        """对单个基因做一次随机变异：更换教师 / 时间 / 教室，无法变异时返回原基因"""
+        if mutation_type == "teacher" and len(task.teachers) > 1:
+            # 更换教师
+            new_teacher = random.choice(
+                [t for t in task.teachers if t != gene.teacher_id]
+            )
+            return Gene(
+                gene.task_id,
+                new_teacher,
+                gene.classroom_id,
+                gene.week_day,
+                gene.start_slot,
+            )
 
-        if not (has_class_conflict or has_teacher_conflict or has_classroom_conflict):
-            return gene  # 无冲突，不需要修复
+        elif mutation_type == "time":
+            # 更换时间（只在候选域内采样，已避开周末、周四下午和黑名单）
+            new_weekday, new_start_slot = random.choice(
+                self.task_time_domains[task.task_id]
+            )
 
-        # 尝试找到无冲突的时间
-        valid_slots = get_valid_time_slots(task.slots_count)
-        attempts = 0
-        max_attempts = 50  # 增加尝试次数
+            return Gene(
+                gene.task_id,
+                gene.teacher_id,
+                gene.classroom_id,
+                new_weekday,
+                new_start_slot,
+            )
 
-        # 如果有班级冲突，使用更激进的策略
-        if has_class_conflict:
-            max_attempts = 80  # 班级冲突更多尝试
+        elif mutation_type == "classroom":
+            # 更换教室（优先选择容量匹配的，索引已按容量接近程度排序）
+            suitable_classrooms = self.task_mutation_classrooms[task.task_id]
+            if suitable_classrooms:
+                # 有70%概率选最佳，30%随机选择
+                if random.random() < 0.7:
+                    new_classroom = suitable_classrooms[0]
+                else:
+                    new_classroom = random.choice(
+                        suitable_classrooms[:5]
+                        if len(suitable_classrooms) > 5
+                        else suitable_classrooms
+                    )
 
-        while attempts < max_attempts:
-            new_weekday = random.randint(1, 5)  # 工作日
-            new_start_slot, _ = random.choice(valid_slots)
+                return Gene(
+                    gene.task_id,
+                    gene.teacher_id,
+                    new_classroom.classroom_id,
+                    gene.week_day,
+                    gene.start_slot,
+                )
 
-            # 避开周四下午（第6-10节不可排课，第11-13节晚上可以）
-            if new_weekday == 4 and 6 <= new_start_slot <= 10:
-                attempts += 1
-                continue
+        return gene
 
-            # 检查新时间是否有冲突
-            new_has_class_conflict = False
-            new_has_teacher_conflict = False
-            new_has_classroom_conflict = False
+    def _repair_conflicting_gene(
+        self, gene: Gene, individual: List[Gene], task: TeachingTask
+    ) -> Gene:
+        """修复有冲突的基因 - 增强版，优先解决班级冲突
 
-            for other_gene in other_genes:
+        冲突判断与 fitness() 的周次位图占用表一致：两次课时间块有任一节重叠、周次相交，
+        且共用教师（任务的全部教师）、班级或教室才算冲突。
+        individual 为完整个体，同一任务的基因（即 gene 自身所在位置）会被跳过，
+        调用方无需为每个被修复的基因复制一份“其余基因”列表。
+        """
+        instance = self.instance
+        task_index = instance.task_index
+        task_slots = instance.task_slots
+        task_weeks = instance.task_weeks
+        task_teacher_mask = instance.task_teacher_mask
+        task_class_mask = instance.task_class_mask
+        t = task_index[task.task_id]
+        slots_count = task_slots[t]
+        week_mask = task_weeks[t]
+        teacher_mask = task_teacher_mask[t]
+        class_mask = task_class_mask[t]
+
+        # 其他基因按星期分组，检查某个时间时只扫描当天的基因
+        genes_by_day = defaultdict(list)
+        for other_gene in individual:
+            if other_gene.task_id != gene.task_id:
+                genes_by_day[other_gene.week_day].append(other_gene)
+
+        def check(weekday: int, start_slot: int) -> Tuple[bool, bool]:
+            """返回 (是否有班级冲突, 是否有任何冲突)"""
+            end_slot = start_slot + slots_count
+            has_conflict = False
+            for other_gene in genes_by_day.get(weekday, ()):
+                o = task_index[other_gene.task_id]
                 if (
-                    other_gene.week_day == new_weekday
-                    and other_gene.start_slot == new_start_slot
+                    other_gene.start_slot >= end_slot
+                    or start_slot >= other_gene.start_slot + task_slots[o]
+                    or not week_mask & task_weeks[o]
                 ):
-                    other_task = self.task_dict[other_gene.task_id]
-
-                    # 优先检查班级冲突
-                    if set(task.classes) & set(other_task.classes):
-                        new_has_class_conflict = True
-                        break  # 立即退出，重新尝试
+                    continue
+                if class_mask & task_class_mask[o]:
+                    return True, True
+                if (
+                    teacher_mask & task_teacher_mask[o]
+                    or other_gene.classroom_id == gene.classroom_id
+                ):
+                    has_conflict = True
+            return False, has_conflict
 
-                    if gene.teacher_id == other_gene.teacher_id:
-                        new_has_teacher_conflict = True
+        # 检查当前基因是否有冲突
+        has_class_conflict, has_conflict = check(gene.week_day, gene.start_slot)
+        if not has_conflict:
+            return gene  # 无冲突，不需要修复
 
-                    if gene.classroom_id == other_gene.classroom_id:
-                        new_has_classroom_conflict = True
+        # 尝试找到无冲突的时间（在候选域内不放回采样，每个时间最多试一次）
+        time_domain = self.task_time_domains[task.task_id]
+        max_attempts = 50  # 增加尝试次数
 
-            # 无任何冲突才接受
-            if not (
-                new_has_class_conflict
-                or new_has_teacher_conflict
-                or new_has_classroom_conflict
-            ):
-                # 找到无冲突时间
-                return Gene(
-                    gene.task_id,
-                    gene.teacher_id,
-                    gene.classroom_id,
-                    new_weekday,
-                    new_start_slot,
-                )
+        # 如果有班级冲突，使用更激进的策略
+        if has_class_conflict:
+            max_attempts = 80  # 班级冲突更多尝试
 
-            attempts += 1
+        for new_weekday, new_start_slot in random.sample(
+            time_domain, min(max_attempts, len(time_domain))
+        ):
+            # 教师、班级、教室都无冲突才接受
+            if check(new_weekday, new_start_slot)[1]:
+                continue
+            return Gene(
+                gene.task_id,
+                gene.teacher_id,
+                gene.classroom_id,
+                new_weekday,
+                new_start_slot,
+            )
 
         # 如果找不到，返回原基因
         return gene
@@ -1455,13 +1446,17 @@ class SchedulingGeneticAlgorithm:
         self, population: List[List[Gene]], fitness_scores: List[float]
     ) -> List[Gene]:
         """锦标赛选择"""
+        best_idx = self._tournament_index(fitness_scores)
+        return population[best_idx][:]
+
+    def _tournament_index(self, fitness_scores: List[float]) -> int:
+        """锦标赛选择，返回胜出个体在种群中的下标"""
         tournament_size = self.config["tournament_size"]
         tournament_indices = random.sample(
-            range(len(population)), min(tournament_size, len(population))
+            range(len(fitness_scores)), min(tournament_size, len(fitness_scores))
         )
 
-        best_idx = max(tournament_indices, key=lambda i: fitness_scores[i])
-        return population[best_idx][:]
+        return max(tournament_indices, key=lambda i: fitness_scores[i])
 
     def evolve(self, progress_callback=None) -> List[Gene]:
         """进化主循环
@@ -1476,6 +1471,30 @@ class SchedulingGeneticAlgorithm:
                   - best_fitness: 当前最佳适应度
                   - message:   人类可读的状态描述
         """
+        # 时间预算：从这里开始计时，截止时刻对进化、岛屿和局部搜索都生效
+        self._started_at = time.monotonic()
+        self.telemetry = RunTelemetry()
+        budget = self.config.get("time_budget_seconds")
+        self._deadline = self._started_at + budget if budget else None
+
+        workers = self.config.get("fitness_workers", 1)
+        parallel_evaluator = (
+            ParallelFitnessEvaluator(self, workers)
+            if workers > 1 and self.config.get("islands", 1) <= 1
+            else None
+        )
+        try:
+            return self._evolve(progress_callback, parallel_evaluator)
+        finally:
+            if parallel_evaluator is not None:
+                parallel_evaluator.close()
+
+    def _evolve(
+        self,
+        progress_callback,
+        parallel_evaluator: Optional[ParallelFitnessEvaluator] = None,
+    ) -> List[Gene]:
+        """进化主循环实现（参数说明见 evolve）"""
         logger.info("开始遗传算法进化")
 
         total_generations = self.config["generations"]
@@ -1485,6 +1504,10 @@ class SchedulingGeneticAlgorithm:
         if progress_callback is None:
             progress_callback = self.config.get("progress_callback", None)
 
+        # 适应度缓存：完全相同的个体（精英复制、未交叉/未变异子代）不重复评估
+        cache_size = self.config.get("fitness_cache_size", 0)
+        fitness_cache = FitnessCache(cache_size) if cache_size > 0 else None
+
         def _notify(
             stage: str,
             percent: int,
@@ -1492,9 +1515,18 @@ class SchedulingGeneticAlgorithm:
             best_fitness: float = 0.0,
             message: str = "",
         ):
-            """内部统一推送，吞掉回调异常避免影响算法"""
+            """内部统一推送，吞掉回调异常避免影响算法
+
+            设置了时间预算时，进化阶段的进度按已用时间占预算的比例计算。
+            """
             if progress_callback is None:
                 return
+            elapsed = time.monotonic() - self._started_at
+            remaining = self._remaining_time()
+            last_generation = self.telemetry.last_generation() or {}
+            if remaining is not None and stage == "evolving":
+                budget = self.config["time_budget_seconds"]
+                percent = max(percent, 10 + min(85, int(elapsed / budget * 85)))
             try:
                 progress_callback(
                     {
@@ -1504,37 +1536,143 @@ class SchedulingGeneticAlgorithm:
                         "total_generations": total_generations,
                         "best_fitness": best_fitness,
                         "message": message,
+                        "cache_hits": fitness_cache.hits if fitness_cache else 0,
+                        "cache_misses": fitness_cache.misses if fitness_cache else 0,
+                        "elapsed_seconds": round(elapsed, 1),
+                        "remaining_seconds": (
+                            round(remaining, 1) if remaining is not None else None
+                        ),
+                        # 遥测：最近一代各阶段耗时与评估速度，完成时附带整体汇总
+                        "phase_seconds": last_generation.get("phase_seconds", {}),
+                        "evaluations_per_second": last_generation.get(
+                            "evaluations_per_second"
+                        ),
+                        "run_report": (
+                            self.telemetry.summary() if stage == "done" else None
+                        ),
                     }
                 )
             except Exception as e:
                 logger.warning(f"进度回调执行失败: {e}")
 
-        logger.info(f"正在初始化种群 (规模: {population_size})，这可能需要一些时间...")
-
-        # 初始化种群（带进度日志 + 回调）
-        population = []
-        for i in range(population_size):
-            if i > 0 and i % 10 == 0:
-                logger.info(f"已初始化 {i}/{population_size} 个个体...")
-            population.append(self.create_individual())
-            # 初始化阶段占总进度的 10%
-            if i % max(1, population_size // 10) == 0:
-                init_percent = int(i / population_size * 10)
-                _notify(
-                    "init",
-                    init_percent,
-                    message=f"正在初始化种群 {i}/{population_size}",
+        if self.config.get("decompose"):
+            # 问题分解：互不相关的任务分量分组并行求解，合并后修复教室冲突
+            groups = group_components(
+                find_components(self.schedulable_tasks, self.data["task_relations"]),
+                self.config.get("component_workers", 1),
+            )
+            if len(groups) > 1:
+                best_solution = ComponentSolver(self, groups).run(_notify)
+                return self._finish(
+                    best_solution,
+                    self.fitness(best_solution),
+                    total_generations,
+                    _notify,
                 )
-
-        logger.info("种群初始化完成！")
-        _notify("init", 10, message="种群初始化完成，开始进化")
+            logger.info("任务之间全部相互关联（或只有一个求解进程），不做分解")
+
+        islands = self.config.get("islands", 1)
+        if islands > 1:
+            # 岛屿模型：各子种群在独立进程中进化，主进程负责迁移与进度汇总
+            if self.config.get("checkpoint_path") or self.config.get("resume_from"):
+                logger.warning("岛屿模型暂不支持检查点，忽略 checkpoint_path / resume_from")
+            best_solution, best_fitness = IslandModel(self, islands).run(
+                _notify, fitness_cache
+            )
+            logger.info(f"岛屿模型进化完成，最终最佳适应度: {best_fitness:.2f}")
+            return self._finish(best_solution, best_fitness, total_generations, _notify)
+
+        checkpoint_path = self.config.get("checkpoint_path")
+        checkpoint_interval = max(1, self.config.get("checkpoint_interval", 10))
+        resume_from = self.config.get("resume_from")
+        checkpoint = None
+        if resume_from:
+            checkpoint = load_checkpoint(resume_from, self.codec)
+            population = checkpoint.population
+            logger.info(
+                f"从检查点 {resume_from} 恢复：第 {checkpoint.generation} 代，"
+                f"种群 {len(population)} 个，最佳适应度 {checkpoint.best_fitness:.2f}"
+            )
+            _notify(
+                "init",
+                10,
+                generation=checkpoint.generation,
+                best_fitness=checkpoint.best_fitness,
+                message=f"已从检查点恢复（第 {checkpoint.generation} 代），继续进化",
+            )
+        else:
+            with self.telemetry.phase(PHASE_INIT, per_generation=False):
+                population = self._initialize_population(
+                    population_size, parallel_evaluator, _notify
+                )
+            logger.info("种群初始化完成！")
+            _notify("init", 10, message="种群初始化完成，开始进化")
 
         best_fitness = float("-inf")
         stagnation_count = 0
 
-        for generation in range(total_generations):
+        # 增量评估：每个个体保存评估状态，子代基于亲本状态只重算改动部分
+        evaluator = (
+            IncrementalFitnessEvaluator(self)
+            if self.config.get("incremental_fitness", True)
+            and parallel_evaluator is None
+            else None
+        )
+        # 与 population 一一对应：可作为增量基准的评估状态（亲本或自身）
+        population_bases = [()] * len(population)
+        # 与 population 一一对应：染色体指纹（None 表示未知，评估时从零计算），只在启用缓存时维护
+        population_fingerprints = (
+            [None] * len(population) if fitness_cache is not None else None
+        )
+
+        def _evaluate_population(per_generation: bool = True) -> List[float]:
+            with self.telemetry.phase(PHASE_FITNESS, per_generation):
+                return self._score_population(
+                    population,
+                    population_bases,
+                    evaluator,
+                    cache=fitness_cache,
+                    parallel_evaluator=parallel_evaluator,
+                    fingerprints=population_fingerprints,
+                )
+
+        def _save_checkpoint(generation: int, fitness_scores: List[float]):
+            save_checkpoint(
+                checkpoint_path,
+                self.codec,
+                Checkpoint(
+                    generation=generation,
+                    population=population,
+                    fitness_scores=fitness_scores,
+                    best_fitness=best_fitness,
+                    stagnation_count=stagnation_count,
+                    random_state=random.getstate(),
+                ),
+            )
+
+        start_generation = 0
+        if checkpoint is not None:
+            # 检查点保存于繁殖下一代之前：恢复随机数状态后直接繁殖，从下一代继续
+            random.setstate(checkpoint.random_state)
+            best_fitness = checkpoint.best_fitness
+            stagnation_count = checkpoint.stagnation_count
+            (
+                population,
+                population_bases,
+                population_fingerprints,
+            ) = self._next_generation(
+                population,
+                population_bases,
+                checkpoint.fitness_scores,
+                population_fingerprints,
+            )
+            start_generation = checkpoint.generation + 1
+
+        # 提前结束（时间预算、停滞）时种群就是最近一次评估的种群，不必再评估一次
+        final_fitness_scores = None
+        for generation in range(start_generation, total_generations):
             # 计算适应度
-            fitness_scores = [self.fitness(individual) for individual in population]
+            fitness_scores = _evaluate_population()
 
             # 记录最佳适应度
             current_best = max(fitness_scores)
@@ -1560,6 +1698,23 @@ class SchedulingGeneticAlgorithm:
                     message=f"第 {generation}/{total_generations} 代，最佳适应度: {best_fitness:.0f}",
                 )
 
+            # 检查时间预算：到时立即停止，返回当前种群中的最优个体
+            if self._time_is_up():
+                logger.info(f"时间预算已用完，第 {generation} 代结束进化")
+                _notify(
+                    "evolving",
+                    95,
+                    generation=generation,
+                    best_fitness=best_fitness,
+                    message=f"时间预算已用完，第 {generation} 代结束进化",
+                )
+                # 到时保存的检查点是本代评估后、精英局部搜索之前的种群（预算已用完，不再做本代的局部搜索）；
+                # 返回的方案另外经过 _finish 的后处理和最终局部搜索，这些结果不写入检查点
+                if checkpoint_path:
+                    _save_checkpoint(generation, fitness_scores)
+                final_fitness_scores = fitness_scores
+                break
+
             # 检查停滞
             if stagnation_count >= self.config["max_stagnation"]:
                 logger.info(f"算法停滞 {stagnation_count} 代，提前结束")
@@ -1570,58 +1725,431 @@ class SchedulingGeneticAlgorithm:
                     best_fitness=best_fitness,
                     message=f"算法收敛，第 {generation} 代提前结束",
                 )
+                final_fitness_scores = fitness_scores
                 break
 
-            # 精英保留
-            elite_indices = sorted(
-                range(len(fitness_scores)),
-                key=lambda i: fitness_scores[i],
-                reverse=True,
-            )
-            elite_size = self.config["elitism_size"]
-            new_population = [population[i][:] for i in elite_indices[:elite_size]]
-
-            # 生成新个体
-            while len(new_population) < self.config["population_size"]:
-                parent1 = self.tournament_selection(population, fitness_scores)
-                parent2 = self.tournament_selection(population, fitness_scores)
-
-                child1, child2 = self.crossover(parent1, parent2)
-                child1 = self.mutate(child1)
-                child2 = self.mutate(child2)
+            # 模因算法：每隔若干代对精英个体做局部搜索
+            interval = self.config.get("local_search_interval", 0)
+            if interval > 0 and generation > 0 and generation % interval == 0:
+                with self.telemetry.phase(PHASE_LOCAL_SEARCH):
+                    self._polish_elites(
+                        population,
+                        population_bases,
+                        fitness_scores,
+                        population_fingerprints,
+                    )
 
-                new_population.extend([child1, child2])
+            if checkpoint_path and (generation + 1) % checkpoint_interval == 0:
+                _save_checkpoint(generation, fitness_scores)
 
-            # 截断到目标大小
-            population = new_population[: self.config["population_size"]]
+            # 精英保留 + 选择/交叉/变异
+            (
+                population,
+                population_bases,
+                population_fingerprints,
+            ) = self._next_generation(
+                population, population_bases, fitness_scores, population_fingerprints
+            )
 
             if generation % 20 == 0:
                 logger.info(
                     f"第 {generation} 代完成，当前最佳适应度: {current_best:.2f}"
                 )
 
+            self.telemetry.end_generation(generation, best_fitness)
+
+        if (
+            self.telemetry.has_pending_generation()
+            and start_generation < total_generations
+        ):
+            # 提前结束的最后一代只有评估阶段
+            self.telemetry.end_generation(generation, best_fitness)
+
         # 返回最佳个体
-        final_fitness_scores = [self.fitness(individual) for individual in population]
+        if final_fitness_scores is None:
+            final_fitness_scores = _evaluate_population(per_generation=False)
         best_idx = max(
             range(len(final_fitness_scores)), key=lambda i: final_fitness_scores[i]
         )
 
         logger.info(f"进化完成，最终最佳适应度: {final_fitness_scores[best_idx]:.2f}")
 
+        return self._finish(
+            population[best_idx],
+            final_fitness_scores[best_idx],
+            total_generations,
+            _notify,
+        )
+
+    def _initialize_population(
+        self,
+        population_size: int,
+        parallel_evaluator: Optional[ParallelFitnessEvaluator],
+        notify,
+    ) -> List[List[Gene]]:
+        """生成初始种群，并用主种子派生的进化种子重置全局随机数"""
+        logger.info(f"正在初始化种群 (规模: {population_size})，这可能需要一些时间...")
+
+        # 每个初始个体使用由主种子派生的独立种子，结果与初始化进程数无关
+        master_rng = (
+            random.Random(self.config["random_seed"])
+            if self.config.get("random_seed") is not None
+            else random.Random(random.getrandbits(64))
+        )
+        individual_seeds = [master_rng.getrandbits(64) for _ in range(population_size)]
+        evolution_seed = master_rng.getrandbits(64)
+
+        # 热启动：种群的一部分由已有版本的排课结果及其变异体构成，其余照常生成
+        population = []
+        seed_schedules = self.data.get("seed_schedules")
+        if seed_schedules:
+            warm_count = max(
+                1, int(population_size * self.config.get("warm_start_ratio", 0.5))
+            )
+            warm_count = min(warm_count, population_size)
+            random.seed(master_rng.getrandbits(64))
+            population = create_warm_start_individuals(
+                self, seed_schedules, warm_count
+            )
+            individual_seeds = individual_seeds[warm_count:]
+
+        # 前一部分个体用 DSATUR 构造式启发生成，其余随机生成
+        constructive_count = int(
+            population_size * self.config.get("dsatur_seed_ratio", 0.0)
+        )
+        individual_specs = [
+            (seed, i < constructive_count) for i, seed in enumerate(individual_seeds)
+        ]
+        if constructive_count:
+            logger.info(f"其中 {constructive_count} 个个体使用 DSATUR 构造式初始化")
+
+        init_workers = self.config.get("init_workers", 1)
+        init_pool = parallel_evaluator
+        if init_pool is None and init_workers > 1:
+            init_pool = ParallelFitnessEvaluator(self, init_workers)
+
+        # 初始化种群（带进度日志 + 回调）
+        individuals = (
+            init_pool.create_individuals(individual_specs)
+            if init_pool is not None
+            else (
+                self.create_seeded_individual(seed, constructive)
+                for seed, constructive in individual_specs
+            )
+        )
+        try:
+            # 进度计数包含热启动个体：i 为本个体加入前种群中已有的个体数
+            for i, individual in enumerate(individuals, start=len(population)):
+                if len(population) >= 2 and self._time_is_up():
+                    logger.warning(
+                        f"时间预算已用完，种群初始化提前结束（{len(population)}/{population_size}）"
+                    )
+                    break
+                if i > 0 and i % 10 == 0:
+                    logger.info(f"已初始化 {i}/{population_size} 个个体...")
+                population.append(individual)
+                # 初始化阶段占总进度的 10%
+                if i % max(1, population_size // 10) == 0:
+                    init_percent = int(i / population_size * 10)
+                    notify(
+                        "init",
+                        init_percent,
+                        message=f"正在初始化种群 {i}/{population_size}",
+                    )
+        finally:
+            # 提前结束时关闭生成器，取消进程池中尚未开始的初始化任务
+            individuals.close()
+            if init_pool is not None and init_pool is not parallel_evaluator:
+                init_pool.close()
+
+        random.seed(evolution_seed)
+        return population
+
+    def _finish(
+        self,
+        best_solution: List[Gene],
+        best_fitness: float,
+        total_generations: int,
+        notify,
+    ) -> List[Gene]:
+        """进化结束：后处理、局部搜索改良最佳个体、记录运行报告并推送完成事件"""
         # 后处理：专门针对班级冲突的修复
-        best_solution = population[best_idx]
-        best_solution = self._post_process_class_conflicts(best_solution)
+        with self.telemetry.phase(PHASE_POST_PROCESS, per_generation=False):
+            best_solution = self._post_process_class_conflicts(best_solution)
+
+        # 局部搜索放在后处理之后：它只接受不变差的结果，最终方案以它为准
+        local_search = self._get_local_search()
+        if local_search is not None:
+            with self.telemetry.phase(PHASE_LOCAL_SEARCH, per_generation=False):
+                best_solution, state = local_search.improve(
+                    best_solution,
+                    self._cap_to_remaining(self.config["local_search_time_budget"]),
+                )
+            best_fitness = state.fitness
 
-        _notify(
+        # 最优个体的硬约束分项（违反次数 × 惩罚权重）
+        _, summary = check_all_hard_constraints(
+            best_solution, self.task_dict, self.data, self.config
+        )
+        self.telemetry.set_best_breakdown(
+            summary["details"], self.config["penalty_scores"]
+        )
+        if self.config.get("run_report_path"):
+            self.telemetry.write_report(self.config["run_report_path"], self.config)
+
+        notify(
             "done",
             100,
             generation=total_generations,
-            best_fitness=final_fitness_scores[best_idx],
-            message=f"排课完成，最终适应度: {final_fitness_scores[best_idx]:.0f}",
+            best_fitness=best_fitness,
+            message=f"排课完成，最终适应度: {best_fitness:.0f}",
         )
 
         return best_solution
 
+    def get_run_report(self) -> Optional[Dict]:
+        """最近一次 evolve() 的完整运行报告（各阶段耗时、逐代统计、变异成功率、硬约束分项）"""
+        if self.telemetry is None:
+            return None
+        return self.telemetry.report(self.config)
+
+    def _remaining_time(self) -> Optional[float]:
+        """距时间预算截止的剩余秒数；未设置预算时返回 None"""
+        deadline = getattr(self, "_deadline", None)
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+
+    def _time_is_up(self) -> bool:
+        """时间预算是否已用完"""
+        remaining = self._remaining_time()
+        return remaining is not None and remaining <= 0
+
+    def _cap_to_remaining(self, seconds: float) -> float:
+        """把某一阶段的时间预算限制在整体剩余时间之内"""
+        remaining = self._remaining_time()
+        return seconds if remaining is None else min(seconds, remaining)
+
+    def _get_conflict_mutator(self) -> Optional[ConflictSetMutator]:
+        """按配置创建（并缓存）冲突集变异算子；mutation_mode 不是 "conflict_set" 时返回 None"""
+        mode = self.config.get("mutation_mode", MUTATION_UNIFORM)
+        if mode == MUTATION_UNIFORM:
+            return None
+        if mode != MUTATION_CONFLICT_SET:
+            raise ValueError(f"不支持的变异模式: {mode}")
+        if getattr(self, "_conflict_mutator", None) is None:
+            self._conflict_mutator = ConflictSetMutator(
+                self,
+                repair_rate=self.config.get("conflict_repair_rate", 1.0),
+                exploration_rate=self.config.get("exploration_rate", 0.02),
+            )
+        return self._conflict_mutator
+
+    def _get_local_search(self) -> Optional[LocalSearch]:
+        """按配置创建（并缓存）局部搜索器；未启用时返回 None"""
+        method = self.config.get("local_search")
+        if not method:
+            return None
+        if getattr(self, "_local_search", None) is None:
+            self._local_search = LocalSearch(self, method)
+        return self._local_search
+
+    def _polish_elites(
+        self,
+        population: List[List[Gene]],
+        population_bases: List[tuple],
+        fitness_scores: List[float],
+        fingerprints: Optional[List[Optional[int]]] = None,
+    ):
+        """对当前最优的若干个体做局部搜索，原地替换个体、评估基准、得分和指纹"""
+        local_search = self._get_local_search()
+        if local_search is None:
+            return
+
+        elite_indices = sorted(
+            range(len(fitness_scores)), key=lambda i: fitness_scores[i], reverse=True
+        )[: self.config.get("local_search_elites", 1)]
+        for i in elite_indices:
+            bases = population_bases[i]
+            improved, state = local_search.improve(
+                population[i],
+                self._cap_to_remaining(
+                    self.config.get("local_search_elite_time_budget", 0.5)
+                ),
+                state=bases[0] if bases else None,
+            )
+            population[i] = improved
+            population_bases[i] = (state,)
+            fitness_scores[i] = state.fitness
+            if fingerprints is not None:
+                fingerprints[i] = None
+
+    def _score_population(
+        self,
+        population: List[List[Gene]],
+        population_bases: List[tuple],
+        evaluator: Optional[IncrementalFitnessEvaluator],
+        cache: Optional[FitnessCache] = None,
+        parallel_evaluator: Optional[ParallelFitnessEvaluator] = None,
+        fingerprints: Optional[List[Optional[int]]] = None,
+    ) -> List[float]:
+        """计算种群适应度
+
+        先查适应度缓存，只评估未命中的个体（并行、增量或全量）。
+        缓存键优先取 fingerprints 中增量维护的指纹，为 None 的位置从零计算并写回。
+        启用增量评估时，population_bases 会被原地更新为各个体自身的评估状态，
+        供下一代子代作为增量基准。
+        时间预算在评估中途用完时，至少评估一个个体后停止，其余未评估的个体记为 -inf（不写入缓存）。
+        """
+        scores: List[Optional[float]] = [None] * len(population)
+        keys = None
+        if cache is not None:
+            keys = [
+                fingerprints[i]
+                if fingerprints is not None and fingerprints[i] is not None
+                else chromosome_fingerprint(individual)
+                for i, individual in enumerate(population)
+            ]
+            if fingerprints is not None:
+                fingerprints[:] = keys
+            scores = [
+                cache.get(key, individual) for key, individual in zip(keys, population)
+            ]
+        pending = [i for i, score in enumerate(scores) if score is None]
+
+        if parallel_evaluator is not None:
+            results = parallel_evaluator.evaluate(
+                [population[i] for i in pending], getattr(self, "_deadline", None)
+            )
+        else:
+            results = []
+            for i in pending:
+                if results and self._time_is_up():
+                    break
+                if evaluator is None:
+                    results.append(self.fitness(population[i]))
+                else:
+                    state = evaluator.evaluate(population[i], *population_bases[i])
+                    population_bases[i] = (state,)
+                    results.append(state.fitness)
+        if self.telemetry is not None:
+            self.telemetry.add_evaluations(len(results))
+
+        for i, score in zip(pending, results):
+            scores[i] = score
+            if cache is not None:
+                cache.put(keys[i], score, population[i])
+        if len(results) < len(pending):
+            logger.info(
+                f"时间预算已用完，本次只评估了 {len(results)}/{len(pending)} 个个体"
+            )
+            for i in pending[len(results) :]:
+                scores[i] = float("-inf")
+
+        if evaluator is not None and len(pending) < len(population):
+            # 命中缓存的个体沿用亲本状态作为增量基准，限制数量避免逐代累积
+            for i, bases in enumerate(population_bases):
+                if len(bases) > 2:
+                    population_bases[i] = bases[:2]
+
+        return scores
+
+    def _next_generation(
+        self,
+        population: List[List[Gene]],
+        population_bases: List[tuple],
+        fitness_scores: List[float],
+        fingerprints: Optional[List[Optional[int]]] = None,
+    ) -> Tuple[List[List[Gene]], List[tuple], Optional[List[Optional[int]]]]:
+        """精英保留 + 锦标赛选择/交叉/变异，生成下一代种群
+
+        Returns:
+            (新种群, 与之一一对应的增量评估基准, 指纹)；
+            传入 fingerprints 时子代指纹由亲本指纹增量更新，否则指纹为 None
+        """
+        population_size = len(population)
+
+        # 精英保留
+        elite_indices = sorted(
+            range(len(fitness_scores)),
+            key=lambda i: fitness_scores[i],
+            reverse=True,
+        )
+        elite_size = self.config["elitism_size"]
+        new_population = [population[i] for i in elite_indices[:elite_size]]
+        new_bases = [population_bases[i] for i in elite_indices[:elite_size]]
+        new_fingerprints = (
+            [fingerprints[i] for i in elite_indices[:elite_size]]
+            if fingerprints is not None
+            else None
+        )
+
+        # 生成新个体（分别累计选择、交叉、变异的耗时）
+        clock = time.perf_counter
+        selection_time = crossover_time = mutation_time = 0.0
+        while len(new_population) < population_size:
+            if self._time_is_up():
+                # 时间预算已用完：剩余位置沿用上一代排名靠前的个体（其评估状态就是增量基准，
+                # 再评估几乎没有开销），尽快回到主循环结束进化
+                carried = elite_indices[elite_size:][
+                    : population_size - len(new_population)
+                ]
+                new_population.extend(population[i] for i in carried)
+                new_bases.extend(population_bases[i] for i in carried)
+                if new_fingerprints is not None:
+                    new_fingerprints.extend(fingerprints[i] for i in carried)
+                break
+            started = clock()
+            idx1 = self._tournament_index(fitness_scores)
+            idx2 = self._tournament_index(fitness_scores)
+            parent1 = population[idx1]
+            parent2 = population[idx2]
+            selected = clock()
+
+            child1, child2 = self.crossover(parent1, parent2)
+            crossed = clock()
+            child1 = self.mutate(child1)
+            child2 = self.mutate(child2)
+            mutated = clock()
+
+            selection_time += selected - started
+            crossover_time += crossed - selected
+            mutation_time += mutated - crossed
+            new_population.extend([child1, child2])
+            parent_bases = population_bases[idx1] + population_bases[idx2]
+            new_bases.extend([parent_bases, parent_bases])
+            if new_fingerprints is not None:
+                # child1 以 parent1 为前缀、child2 以 parent2 为前缀
+                new_fingerprints.extend(
+                    [
+                        self._child_fingerprint(fingerprints[idx1], parent1, child1),
+                        self._child_fingerprint(fingerprints[idx2], parent2, child2),
+                    ]
+                )
+
+        if self.telemetry is not None:
+            self.telemetry.add_time(PHASE_SELECTION, selection_time)
+            self.telemetry.add_time(PHASE_CROSSOVER, crossover_time)
+            self.telemetry.add_time(PHASE_MUTATION, mutation_time)
+
+        # 截断到目标大小
+        return (
+            new_population[:population_size],
+            new_bases[:population_size],
+            new_fingerprints[:population_size]
+            if new_fingerprints is not None
+            else None,
+        )
+
+    @staticmethod
+    def _child_fingerprint(
+        parent_fingerprint: Optional[int], parent: List[Gene], child: List[Gene]
+    ) -> Optional[int]:
+        """由亲本指纹增量计算子代指纹；亲本指纹未知时返回 None（评估时从零计算）"""
+        if parent_fingerprint is None:
+            return None
+        return update_fingerprint(parent_fingerprint, parent, child)
+
     def _post_process_class_conflicts(self, individual: List[Gene]) -> List[Gene]:
         """后处理：专门修复班级冲突"""
         logger.info("开始后处理班级冲突...")
@@ -1644,8 +2172,7 @@ class SchedulingGeneticAlgorithm:
             task = self.task_dict[gene.task_id]
 
             # 尝试为这个冲突的课程找新时间
-            other_genes = improved[:gene_idx] + improved[gene_idx + 1 :]
-            repaired_gene = self._repair_conflicting_gene(gene, other_genes, task)
+            repaired_gene = self._repair_conflicting_gene(gene, improved, task)
 
             if repaired_gene != gene:
                 improved[gene_idx] = repaired_gene
@@ -1663,30 +2190,49 @@ class SchedulingGeneticAlgorithm:
 
         for idx, gene in enumerate(individual):
             task = self.task_dict[gene.task_id]
+            week_mask = self.task_week_masks[gene.task_id]
 
             for slot in range(gene.start_slot, gene.start_slot + task.slots_count):
                 time_key = (gene.week_day, slot)
 
                 for class_id in task.classes:
                     class_schedule[class_id].append(
-                        {"time": time_key, "gene_index": idx, "task_id": gene.task_id}
+                        {
+                            "time": time_key,
+                            "gene_index": idx,
+                            "task_id": gene.task_id,
+                            "week_mask": week_mask,
+                        }
                     )
 
-        # 查找冲突
+        # 查找冲突（同一时间且周次重叠）
         for class_id, schedule_list in class_schedule.items():
             time_dict = defaultdict(list)
             for item in schedule_list:
                 time_dict[item["time"]].append(item)
 
             for time_key, items in time_dict.items():
-                if len(items) > 1:
-                    # 发现冲突，选择第一个任务来修复
+                occupied_weeks = 0
+                has_conflict = False
+                for item in items:
+                    if occupied_weeks & item["week_mask"]:
+                        has_conflict = True
+                        break
+                    occupied_weeks |= item["week_mask"]
+
+                if has_conflict:
+                    # 发现冲突，选择第一个未锁定的任务来修复
+                    movable = [
+                        item for item in items if item["task_id"] not in self.pinned_genes
+                    ]
+                    if not movable:
+                        continue
                     conflicts.append(
                         {
                             "class_id": class_id,
                             "time": time_key,
-                            "gene_index": items[0]["gene_index"],
-                            "task_id": items[0]["task_id"],
+                            "gene_index": movable[0]["gene_index"],
+                            "task_id": movable[0]["task_id"],
                         }
                     )
 
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+岛屿模型模块
+多个子种群在独立进程中并行进化，每隔若干代交换各自的最优个体
+"""
+
+import logging
+import multiprocessing
+import queue
+import random
+import time
+import traceback
+from typing import Callable, Dict, List, Optional, Tuple
+
+from data_models import Gene
+from fitness_cache import FitnessCache
+from fitness_evaluator import IncrementalFitnessEvaluator
+
+logger = logging.getLogger(__name__)
+
+
+def _island_main(
+    island_id: int,
+    data: Dict,
+    config: Dict,
+    seed: int,
+    inbox,
+    outbox,
+):
+    """岛屿进程入口
+
+    与主进程的通信协议：
+      - 每个迁移周期结束时（或本岛时间预算用完时）发送
+        ("epoch", island_id, generation, best_fitness, emigrants, (cache_hits, cache_misses))，
+        随后阻塞等待主进程回复：迁入个体列表，或 None 表示提前结束
+      - 进化结束时发送 ("done", island_id, best_individual, best_fitness)
+      - 出错时发送 ("error", island_id, traceback_text)
+    """
+    try:
+        from genetic_algorithm import SchedulingGeneticAlgorithm
+
+        logging.getLogger("genetic_algorithm").setLevel(logging.WARNING)
+        random.seed(seed)
+        budget = config.get("time_budget_seconds")
+        deadline = time.monotonic() + budget if budget else None
+        ga = SchedulingGeneticAlgorithm(data, config)
+        ga._deadline = deadline
+
+        total_generations = config["generations"]
+        interval = max(1, config["migration_interval"])
+        migration_size = config["migration_size"]
+
+        # 与单种群模式相同的初始化路径：按本岛种子派生个体种子，支持 DSATUR 比例和热启动
+        population = ga._initialize_population(
+            config["population_size"], None, lambda *args, **kwargs: None
+        )
+        population_bases = [()] * len(population)
+        evaluator = (
+            IncrementalFitnessEvaluator(ga)
+            if config.get("incremental_fitness", True)
+            else None
+        )
+        cache_size = config.get("fitness_cache_size", 0)
+        cache = FitnessCache(cache_size) if cache_size > 0 else None
+        fingerprints = [None] * len(population) if cache is not None else None
+
+        for generation in range(total_generations):
+            fitness_scores = ga._score_population(
+                population,
+                population_bases,
+                evaluator,
+                cache=cache,
+                fingerprints=fingerprints,
+            )
+
+            time_is_up = deadline is not None and time.monotonic() >= deadline
+            if (generation + 1) % interval == 0 or time_is_up:
+                ranked = sorted(
+                    range(len(population)),
+                    key=lambda i: fitness_scores[i],
+                    reverse=True,
+                )
+                emigrants = [
+                    ga.codec.pack(population[i]) for i in ranked[:migration_size]
+                ]
+                outbox.put(
+                    (
+                        "epoch",
+                        island_id,
+                        generation,
+                        fitness_scores[ranked[0]],
+                        emigrants,
+                        (cache.hits, cache.misses) if cache else (0, 0),
+                    )
+                )
+                immigrants = inbox.get()
+                if immigrants is None:
+                    break
+
+                # 迁入个体替换本岛最差的个体（无增量基准，下一代全量评估）
+                for i, packed in zip(reversed(ranked), immigrants):
+                    population[i] = ga.codec.unpack(packed)
+                    population_bases[i] = ()
+                    if fingerprints is not None:
+                        fingerprints[i] = None
+                    fitness_scores[i] = ga.fitness(population[i])
+
+            population, population_bases, fingerprints = ga._next_generation(
+                population, population_bases, fitness_scores, fingerprints
+            )
+
+        fitness_scores = ga._score_population(
+            population,
+            population_bases,
+            evaluator,
+            cache=cache,
+            fingerprints=fingerprints,
+        )
+        best_idx = max(range(len(population)), key=lambda i: fitness_scores[i])
+        outbox.put(
+            ("done", island_id, ga.codec.pack(population[best_idx]), fitness_scores[best_idx])
+        )
+    except Exception:
+        outbox.put(("error", island_id, traceback.format_exc()))
+
+
+class IslandModel:
+    """岛屿模型调度器（运行在主进程）
+
+    K 个岛屿各自进化，每 migration_interval 代同步一次：
+    主进程收集各岛最优个体，按环形拓扑把第 i 岛的迁出个体发给第 i+1 岛，
+    同时把全局进度并入 progress_callback 事件流。
+    全局最佳适应度连续 max_stagnation 代未提升时通知所有岛屿提前结束。
+    """
+
+    def __init__(self, ga, islands: int):
+        self.ga = ga
+        self.islands = islands
+
+    def run(
+        self,
+        notify: Callable[..., None],
+        cache_stats: Optional[FitnessCache] = None,
+    ) -> Tuple[Optional[List[Gene]], float]:
+        """运行所有岛屿，返回 (全局最优个体, 适应度)
+
+        Args:
+            notify: evolve 内部的进度推送函数 notify(stage, percent, generation, best_fitness, message)
+            cache_stats: 主进程的缓存对象，用于汇总各岛的缓存命中统计后随进度事件推送
+        """
+        config = self.ga.config
+        total_generations = config["generations"]
+
+        # 各岛种群规模之和与单种群模式一致；回调等不可序列化的配置不传给子进程
+        island_config = {k: v for k, v in config.items() if not callable(v)}
+        island_config["population_size"] = max(
+            2, config["population_size"] // self.islands
+        )
+        island_config["elitism_size"] = min(
+            config["elitism_size"], island_config["population_size"] - 1
+        )
+        island_config["fitness_workers"] = 1
+        # 岛屿进程是守护进程，不能再创建子进程，种群在岛内串行初始化
+        if config.get("init_workers", 1) > 1:
+            logger.warning("岛屿模型中各岛串行初始化种群，忽略 init_workers")
+        island_config["init_workers"] = 1
+        # 岛屿按主进程剩余的时间预算计时，到时在下一个同步点结束
+        island_config["time_budget_seconds"] = self.ga._remaining_time()
+
+        # 各岛种子由 random_seed 派生：同一 random_seed 的运行结果可复现，各岛种群互不相同
+        master_rng = (
+            random.Random(config["random_seed"])
+            if config.get("random_seed") is not None
+            else random.Random(random.getrandbits(64))
+        )
+        island_seeds = [master_rng.getrandbits(64) for _ in range(self.islands)]
+
+        outbox = multiprocessing.Queue()
+        inboxes = [multiprocessing.Queue() for _ in range(self.islands)]
+        processes = []
+        for island_id in range(self.islands):
+            process = multiprocessing.Process(
+                target=_island_main,
+                args=(
+                    island_id,
+                    self.ga.data,
+                    dict(island_config, random_seed=island_seeds[island_id]),
+                    island_seeds[island_id],
+                    inboxes[island_id],
+                    outbox,
+                ),
+                daemon=True,
+            )
+            process.start()
+            processes.append(process)
+
+        logger.info(
+            f"岛屿模型启动：{self.islands} 个岛屿，每岛 {island_config['population_size']} 个体，"
+            f"每 {island_config['migration_interval']} 代迁移 {island_config['migration_size']} 个"
+        )
+        notify("init", 5, message=f"{self.islands} 个岛屿正在初始化种群")
+
+        best_fitness = float("-inf")
+        best_individual = None
+        last_improved_generation = 0
+        epoch_messages = {}
+        finished = {}
+
+        try:
+            while len(finished) < self.islands:
+                message = self._receive(outbox, processes)
+                kind, island_id = message[0], message[1]
+
+                if kind == "error":
+                    raise RuntimeError(f"岛屿 {island_id} 运行失败:\n{message[2]}")
+
+                if kind == "done":
+                    _, _, packed, fitness = message
+                    finished[island_id] = fitness
+                    if best_individual is None or fitness > max(
+                        f for i, f in finished.items() if i != island_id
+                    ):
+                        best_individual = self.ga.codec.unpack(packed)
+                    continue
+
+                # kind == "epoch"：等所有岛屿到达同一迁移点后统一交换
+                epoch_messages[island_id] = message
+                if len(epoch_messages) < self.islands:
+                    continue
+
+                generation = message[2]
+                epoch_best = max(m[3] for m in epoch_messages.values())
+                if epoch_best > best_fitness:
+                    best_fitness = epoch_best
+                    last_improved_generation = generation
+                    logger.info(f"第 {generation} 代，新的最佳适应度: {best_fitness:.2f}")
+
+                if cache_stats is not None:
+                    cache_stats.hits = sum(m[5][0] for m in epoch_messages.values())
+                    cache_stats.misses = sum(m[5][1] for m in epoch_messages.values())
+
+                stagnated = (
+                    generation - last_improved_generation >= config["max_stagnation"]
+                )
+                time_is_up = self.ga._time_is_up()
+                notify(
+                    "evolving",
+                    10 + int(generation / total_generations * 85),
+                    generation=generation,
+                    best_fitness=best_fitness,
+                    message=(
+                        f"第 {generation}/{total_generations} 代，"
+                        f"{self.islands} 个岛屿最佳适应度: {best_fitness:.0f}"
+                    ),
+                )
+
+                for island_id in range(self.islands):
+                    if stagnated or time_is_up:
+                        inboxes[island_id].put(None)
+                    else:
+                        source = (island_id - 1) % self.islands
+                        inboxes[island_id].put(epoch_messages[source][4])
+                if stagnated:
+                    logger.info(f"全局最佳适应度停滞，第 {generation} 代提前结束")
+                elif time_is_up:
+                    logger.info(f"时间预算已用完，第 {generation} 代结束进化")
+                epoch_messages = {}
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        return best_individual, max(finished.values())
+
+    @staticmethod
+    def _receive(outbox, processes):
+        """从岛屿读取消息；若有岛屿进程异常退出则报错，避免永久阻塞"""
+        while True:
+            try:
+                return outbox.get(timeout=1)
+            except queue.Empty:
+                dead = [p for p in processes if not p.is_alive() and p.exitcode]
+                if dead:
+                    raise RuntimeError(f"岛屿进程异常退出（exitcode={dead[0].exitcode}）")
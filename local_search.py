@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+局部搜索模块（模因算法的个体改良阶段）
+在单基因移动（换时间 / 换教室 / 同时换）和两基因交换时间的邻域上，
+用禁忌搜索或模拟退火改良个体。每次移动只做增量试算，总耗时受时间预算约束。
+"""
+
+import logging
+import math
+import random
+import time
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Tuple
+
+from data_models import Gene
+from fitness_evaluator import EvaluationState, IncrementalFitnessEvaluator
+
+logger = logging.getLogger(__name__)
+
+# 支持的局部搜索方法
+METHOD_TABU = "tabu"
+METHOD_ANNEALING = "annealing"
+
+
+def _combine(hard: float, soft: float) -> float:
+    """与 fitness() 相同的组合规则"""
+    return hard if hard < -50000 else hard - soft
+
+
+class LocalSearch:
+    """禁忌搜索 / 模拟退火局部改良
+
+    - tabu: 每步从若干随机邻域移动中选最优的非禁忌移动（优于历史最优时破禁），
+      刚离开的 (任务, 星期, 节次) 在若干步内禁止回到原处；
+    - annealing: 每步一个随机移动，变差时按 exp(Δ/T) 概率接受，温度按几何速率下降。
+
+    移动优先作用于处在冲突分桶中的基因，其余时间随机选择基因；锁定任务的基因不参与移动。
+    """
+
+    def __init__(
+        self,
+        ga,
+        method: str = METHOD_TABU,
+        neighborhood_size: int = 20,
+        tabu_tenure: int = 30,
+        initial_temperature: float = 500.0,
+        cooling_rate: float = 0.995,
+    ):
+        if method not in (METHOD_TABU, METHOD_ANNEALING):
+            raise ValueError(f"不支持的局部搜索方法: {method}")
+        self.ga = ga
+        self.method = method
+        self.neighborhood_size = neighborhood_size
+        self.tabu_tenure = tabu_tenure
+        self.initial_temperature = initial_temperature
+        self.cooling_rate = cooling_rate
+        self.evaluator = IncrementalFitnessEvaluator(ga)
+
+        # 可移动（未锁定）的基因下标
+        self.free_positions = [
+            idx
+            for idx, task in enumerate(ga.schedulable_tasks)
+            if task.task_id not in ga.pinned_genes
+        ]
+        free = set(self.free_positions)
+        # 全部基因都可移动时不需要过滤
+        self.free_set = free if len(free) < len(ga.schedulable_tasks) else None
+
+        # 同班级任务的基因下标（交换移动的候选伙伴），按个体布局预先计算
+        self.positions_by_class = defaultdict(list)
+        for idx, task in enumerate(ga.schedulable_tasks):
+            if idx not in free:
+                continue
+            for class_id in task.classes:
+                self.positions_by_class[class_id].append(idx)
+        self.time_domain_sets = {
+            task_id: set(domain) for task_id, domain in ga.task_time_domains.items()
+        }
+
+    def improve(
+        self,
+        individual: List[Gene],
+        time_budget: float,
+        state: Optional[EvaluationState] = None,
+        max_iterations: Optional[int] = None,
+    ) -> Tuple[List[Gene], EvaluationState]:
+        """改良个体，返回 (改良后的个体, 其评估状态)；不会比输入更差
+
+        Args:
+            individual: 待改良个体
+            time_budget: 时间预算（秒）
+            state: 个体已有的评估状态（可选，省去一次全量评估）
+            max_iterations: 最大迭代步数（可选）
+        """
+        deadline = time.monotonic() + time_budget
+        if state is None or state.genes is not individual:
+            state = self.evaluator.full_state(individual)
+
+        best_state = current = state
+        best_fitness = current_fitness = state.fitness
+        temperature = self.initial_temperature
+        tabu = deque()
+        tabu_set = set()
+        hot_positions = self._hot_positions(current)
+        iterations = 0
+        if not self.free_positions:
+            return state.genes, state
+
+        while time.monotonic() < deadline and (
+            max_iterations is None or iterations < max_iterations
+        ):
+            iterations += 1
+
+            if self.method == METHOD_TABU:
+                chosen = None
+                chosen_fitness = float("-inf")
+                for _ in range(self.neighborhood_size):
+                    changes = self._random_move(current, hot_positions)
+                    if not changes:
+                        continue
+                    delta_hard, delta_soft = self.evaluator.move_delta(
+                        current, changes
+                    )
+                    fitness = _combine(
+                        current.hard + delta_hard, current.soft + delta_soft
+                    )
+                    is_tabu = any(
+                        (gene.task_id, gene.week_day, gene.start_slot) in tabu_set
+                        for gene in changes.values()
+                    )
+                    if is_tabu and fitness <= best_fitness:
+                        continue
+                    if fitness > chosen_fitness:
+                        chosen, chosen_fitness = changes, fitness
+                if chosen is None:
+                    continue
+
+                for idx in chosen:
+                    old_gene = current.genes[idx]
+                    attribute = (
+                        old_gene.task_id,
+                        old_gene.week_day,
+                        old_gene.start_slot,
+                    )
+                    tabu.append(attribute)
+                    tabu_set.add(attribute)
+                    if len(tabu) > self.tabu_tenure:
+                        tabu_set.discard(tabu.popleft())
+            else:
+                chosen = self._random_move(current, hot_positions)
+                if not chosen:
+                    continue
+                delta_hard, delta_soft = self.evaluator.move_delta(current, chosen)
+                chosen_fitness = _combine(
+                    current.hard + delta_hard, current.soft + delta_soft
+                )
+                delta = chosen_fitness - current_fitness
+                temperature *= self.cooling_rate
+                if delta < 0 and random.random() >= math.exp(
+                    delta / max(temperature, 1e-9)
+                ):
+                    continue
+
+            previous = current
+            current = self.evaluator.apply_move(current, chosen)
+            current_fitness = chosen_fitness
+            self._update_hot_positions(hot_positions, previous, current, chosen)
+            if current_fitness > best_fitness:
+                best_state, best_fitness = current, current_fitness
+
+        logger.info(
+            f"局部搜索({self.method})完成：{iterations} 步，"
+            f"适应度 {state.fitness:.2f} -> {best_fitness:.2f}"
+        )
+        return best_state.genes, best_state
+
+    def _hot_positions(self, state: EvaluationState) -> "_HotPositions":
+        """处在有硬约束惩罚的分桶中、或自身有硬约束惩罚的未锁定基因下标（从零构建）"""
+        hot = _HotPositions(self.free_set)
+        for key, (hard, _) in state.bucket_scores.items():
+            if hard < 0:
+                for idx in state.buckets[key]:
+                    hot.increment(idx)
+        for idx, (hard, _) in enumerate(state.gene_scores):
+            if hard < 0:
+                hot.increment(idx)
+        return hot
+
+    def _update_hot_positions(
+        self,
+        hot: "_HotPositions",
+        previous: EvaluationState,
+        current: EvaluationState,
+        changes: Dict[int, Gene],
+    ):
+        """移动后只按被改动基因新旧所在的分桶更新冲突基因集合"""
+        task_dict = self.ga.task_dict
+        bucket_keys = self.evaluator._bucket_keys
+        touched = set()
+        for idx, new_gene in changes.items():
+            task = task_dict[new_gene.task_id]
+            touched.update(bucket_keys(previous.genes[idx], task))
+            touched.update(bucket_keys(new_gene, task))
+            if previous.gene_scores[idx][0] < 0:
+                hot.decrement(idx)
+            if current.gene_scores[idx][0] < 0:
+                hot.increment(idx)
+
+        for key in touched:
+            if previous.bucket_scores.get(key, (0, 0))[0] < 0:
+                for idx in previous.buckets[key]:
+                    hot.decrement(idx)
+            if current.bucket_scores.get(key, (0, 0))[0] < 0:
+                for idx in current.buckets[key]:
+                    hot.increment(idx)
+
+    def _random_move(
+        self, state: EvaluationState, hot_positions: "_HotPositions"
+    ) -> Dict[int, Gene]:
+        """随机生成一个邻域移动：基因下标 -> 新基因"""
+        genes = state.genes
+        if hot_positions.items and random.random() < 0.7:
+            idx = random.choice(hot_positions.items)
+        else:
+            idx = random.choice(self.free_positions)
+        gene = genes[idx]
+        task = self.ga.task_dict[gene.task_id]
+
+        move = random.random()
+        if move < 0.2:
+            return self._swap_move(genes, idx, task)
+
+        # 0.2-0.6 换时间，0.6-0.8 换教室，0.8-1.0 同时换时间和教室
+        weekday, start_slot = gene.week_day, gene.start_slot
+        classroom_id = gene.classroom_id
+        if move < 0.6 or move >= 0.8:
+            weekday, start_slot = random.choice(
+                self.ga.task_time_domains[task.task_id]
+            )
+        if move >= 0.6:
+            rooms = (
+                self.ga.task_classrooms[task.task_id]
+                or self.ga.task_mutation_classrooms[task.task_id]
+            )
+            if rooms:
+                classroom_id = random.choice(rooms[:10]).classroom_id
+
+        if (weekday, start_slot, classroom_id) == (
+            gene.week_day,
+            gene.start_slot,
+            gene.classroom_id,
+        ):
+            return {}
+        return {
+            idx: Gene(gene.task_id, gene.teacher_id, classroom_id, weekday, start_slot)
+        }
+
+    def _swap_move(self, genes: List[Gene], idx: int, task) -> Dict[int, Gene]:
+        """与同班级、同节数的另一门课交换上课时间"""
+        if not task.classes:
+            return {}
+        partners = self.positions_by_class.get(random.choice(task.classes), [])
+        if len(partners) < 2:
+            return {}
+        other_idx = random.choice(partners)
+        if other_idx == idx:
+            return {}
+
+        gene, other = genes[idx], genes[other_idx]
+        other_task = self.ga.task_dict[other.task_id]
+        if other_task.slots_count != task.slots_count or (
+            gene.week_day,
+            gene.start_slot,
+        ) == (other.week_day, other.start_slot):
+            return {}
+        if (other.week_day, other.start_slot) not in self.time_domain_sets[
+            task.task_id
+        ]:
+            return {}
+        if (gene.week_day, gene.start_slot) not in self.time_domain_sets[
+            other_task.task_id
+        ]:
+            return {}
+
+        return {
+            idx: Gene(
+                gene.task_id,
+                gene.teacher_id,
+                gene.classroom_id,
+                other.week_day,
+                other.start_slot,
+            ),
+            other_idx: Gene(
+                other.task_id,
+                other.teacher_id,
+                other.classroom_id,
+                gene.week_day,
+                gene.start_slot,
+            ),
+        }
+
+
+class _HotPositions:
+    """冲突基因下标集合
+
+    按"所在的有硬约束惩罚的分桶数 + 自身是否有硬约束惩罚"计数，计数大于 0 即在集合中；
+    items 为集合内下标的列表（交换删除），随机抽取为 O(1)。锁定基因不进入集合。
+    """
+
+    __slots__ = ("allowed", "counts", "items", "positions")
+
+    def __init__(self, allowed: Optional[set] = None):
+        self.allowed = allowed
+        self.counts: Dict[int, int] = defaultdict(int)
+        self.items: List[int] = []
+        self.positions: Dict[int, int] = {}
+
+    def increment(self, idx: int):
+        if self.allowed is not None and idx not in self.allowed:
+            return
+        self.counts[idx] += 1
+        if self.counts[idx] == 1:
+            self.positions[idx] = len(self.items)
+            self.items.append(idx)
+
+    def decrement(self, idx: int):
+        if self.allowed is not None and idx not in self.allowed:
+            return
+        self.counts[idx] -= 1
+        if self.counts[idx] == 0:
+            del self.counts[idx]
+            position = self.positions.pop(idx)
+            last = self.items.pop()
+            if last != idx:
+                self.items[position] = last
+                self.positions[last] = position
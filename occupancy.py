@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+占用表模块
+用“实体 × (星期, 节次) → 周次位图”表示教师 / 班级 / 教室的时间占用，
+冲突检测只需一次按位与
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+# 星期 1-7、节次 1-13，按 weekday * SLOTS_PER_DAY + slot 展平为下标
+SLOTS_PER_DAY = 14
+GRID_SIZE = 8 * SLOTS_PER_DAY
+
+
+class OccupancyGrid:
+    """周次位图占用表
+
+    每个实体一个长度固定的整数列表，元素为该 (星期, 节次) 已被占用的周次位图。
+    两次课只有在时间重叠且周次位图按位与非零时才算冲突。
+    """
+
+    __slots__ = ("_cells",)
+
+    def __init__(self):
+        self._cells: Dict[str, List[int]] = {}
+
+    def conflicts(
+        self,
+        entity_id: str,
+        weekday: int,
+        start_slot: int,
+        slots_count: int,
+        week_mask: int,
+    ) -> bool:
+        """检查实体在给定时间块、给定周次内是否已被占用"""
+        cells = self._cells.get(entity_id)
+        if cells is None:
+            return False
+        base = weekday * SLOTS_PER_DAY
+        for idx in range(base + start_slot, base + start_slot + slots_count):
+            if cells[idx] & week_mask:
+                return True
+        return False
+
+    def occupy(
+        self,
+        entity_id: str,
+        weekday: int,
+        start_slot: int,
+        slots_count: int,
+        week_mask: int,
+    ) -> int:
+        """标记占用，返回与已有占用发生冲突的节数"""
+        cells = self._cells.get(entity_id)
+        if cells is None:
+            cells = self._cells[entity_id] = [0] * GRID_SIZE
+        base = weekday * SLOTS_PER_DAY
+        conflict_count = 0
+        for idx in range(base + start_slot, base + start_slot + slots_count):
+            occupied = cells[idx]
+            if occupied & week_mask:
+                conflict_count += 1
+            cells[idx] = occupied | week_mask
+        return conflict_count
+
+
+def count_slot_conflicts(intervals: Iterable[Tuple[int, int, int]]) -> int:
+    """统计同一实体同一天内的冲突节数
+
+    与 OccupancyGrid.occupy 逐个累加的结果一致：按给定顺序依次占用，
+    每节与此前已占用周次重叠即记一次冲突。
+
+    Args:
+        intervals: [(start_slot, end_slot, week_mask), ...]
+    """
+    cells: Dict[int, int] = {}
+    conflict_count = 0
+    for start_slot, end_slot, week_mask in intervals:
+        for slot in range(start_slot, end_slot + 1):
+            occupied = cells.get(slot, 0)
+            if occupied & week_mask:
+                conflict_count += 1
+            cells[slot] = occupied | week_mask
+    return conflict_count
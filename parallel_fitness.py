@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+并行评估模块
+用进程池把整个种群的适应度计算和初始化分摊到多个 CPU 核心
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from data_models import Gene
+
+logger = logging.getLogger(__name__)
+
+# 工作进程内的算法实例（每个进程初始化时构建一次，之后只读）
+_worker_ga = None
+
+
+def _init_worker(data: Dict, config: Dict):
+    """工作进程初始化：只读数据在进程启动时传入一次，之后每次评估只传染色体"""
+    global _worker_ga
+    from genetic_algorithm import SchedulingGeneticAlgorithm
+
+    logging.getLogger("genetic_algorithm").setLevel(logging.WARNING)
+    _worker_ga = SchedulingGeneticAlgorithm(data, config)
+
+
+def _evaluate_chunk(chunk: List[bytes]) -> List[float]:
+    """在工作进程中批量计算一组个体的适应度"""
+    return [_worker_ga.fitness(_worker_ga.codec.unpack(p)) for p in chunk]
+
+
+def _create_individual(spec: Tuple[int, bool]) -> bytes:
+    """在工作进程中按 (种子, 是否构造式) 创建个体"""
+    seed, constructive = spec
+    return _worker_ga.codec.pack(
+        _worker_ga.create_seeded_individual(seed, constructive)
+    )
+
+
+class ParallelFitnessEvaluator:
+    """进程池适应度评估器
+
+    适应度函数本身是确定性的，且 map 按输入顺序返回结果，
+    因此得分与串行评估完全一致，与进程数无关。
+    """
+
+    def __init__(self, ga, workers: int):
+        self.workers = workers
+        self._codec = ga.codec
+        # 回调等不可序列化的配置项不需要传给工作进程
+        worker_config = {k: v for k, v in ga.config.items() if not callable(v)}
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(ga.data, worker_config),
+        )
+        logger.info(f"并行适应度评估已启用：{workers} 个进程")
+
+    def evaluate(
+        self, population: List[List[Gene]], deadline: Optional[float] = None
+    ) -> List[float]:
+        """计算种群的适应度，结果顺序与 population 一致
+
+        给定截止时刻（time.monotonic()）时，到时不再等待后续分块、取消尚未开始的分块，
+        只返回已完成的前缀（至少包含第一个分块的结果）。
+        """
+        # 以紧凑染色体字节串传输（每个基因 6 字节），比序列化 Gene 实例小得多
+        payload = [self._codec.pack(individual) for individual in population]
+        chunksize = max(1, math.ceil(len(payload) / (self.workers * 4)))
+        futures = deque(
+            self._executor.submit(_evaluate_chunk, payload[i : i + chunksize])
+            for i in range(0, len(payload), chunksize)
+        )
+        scores = []
+        try:
+            while futures:
+                timeout = None
+                if deadline is not None and scores:
+                    timeout = max(0.0, deadline - time.monotonic())
+                try:
+                    scores.extend(futures[0].result(timeout=timeout))
+                except FutureTimeoutError:
+                    break
+                futures.popleft()
+        finally:
+            for future in futures:
+                future.cancel()
+        return scores
+
+    def create_individuals(
+        self, specs: List[Tuple[int, bool]]
+    ) -> Iterator[List[Gene]]:
+        """按 (种子, 是否构造式) 并行创建个体，按 specs 顺序逐个产出（便于调用方汇报进度）
+
+        同一时间最多提交 workers × 2 个任务；调用方提前停止迭代（如时间预算用完）并关闭生成器时，
+        尚未开始的任务会被取消，不会在后台继续构建剩余个体、也不会排在后续评估任务之前。
+        """
+        pending = deque()
+        remaining_specs = iter(specs)
+        try:
+            for spec in islice(remaining_specs, self.workers * 2):
+                pending.append(self._executor.submit(_create_individual, spec))
+            while pending:
+                packed = pending.popleft().result()
+                spec = next(remaining_specs, None)
+                if spec is not None:
+                    pending.append(self._executor.submit(_create_individual, spec))
+                yield self._codec.unpack(packed)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        """关闭进程池（取消尚未开始的任务）"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+编译后的问题实例模块
+在 DataLoader 与遗传算法之间做一次编译：教师 / 班级 / 教室 / 校区 / 设施 ID 驻留为连续整数，
+任务和教室的属性展开为按下标访问的平铺数组，热路径上不再反复按字符串 ID 查字典、解引用数据类。
+
+- 任务数组按 data["teaching_tasks"] 的顺序排列，task_index 为 task_id -> 下标；
+- 设施要求、周次、教师 / 班级集合都编码为位图，判断"是否满足设施""教师 / 班级是否重叠"只需一次按位运算。
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from data_models import CourseNature, weeks_to_mask
+
+# 课程性质编码（数值即排序优先级：通识 > 必修 > 选修）
+NATURE_GENERAL = 0
+NATURE_REQUIRED = 1
+NATURE_ELECTIVE = 2
+NATURE_NONE = -1  # 任务没有开课计划
+
+_NATURE_CODES = {
+    CourseNature.GENERAL: NATURE_GENERAL,
+    CourseNature.REQUIRED: NATURE_REQUIRED,
+    CourseNature.ELECTIVE: NATURE_ELECTIVE,
+}
+
+
+class _Interner:
+    """ID -> 连续整数（按首次出现的顺序编号）"""
+
+    __slots__ = ("ids", "index")
+
+    def __init__(self):
+        self.ids: List = []
+        self.index: Dict = {}
+
+    def intern(self, entity_id) -> int:
+        idx = self.index.get(entity_id)
+        if idx is None:
+            idx = len(self.ids)
+            self.index[entity_id] = idx
+            self.ids.append(entity_id)
+        return idx
+
+
+class ProblemInstance:
+    """编译后的排课问题实例（构建后只读）
+
+    教室数组（按 room 下标）：
+        room_ids, room_capacity, room_campus, room_features（设施位图）
+    任务数组（按 task 下标）：
+        task_ids, task_slots, task_students, task_nature, task_features（设施位图）,
+        task_weeks（周次位图）, task_teachers / task_classes（整数元组）,
+        task_teacher_mask / task_class_mask（教师 / 班级位图）, task_offering_slots（所属开课计划的总节数）
+    """
+
+    def __init__(self, data: Dict):
+        teachers = _Interner()
+        classes = _Interner()
+        rooms = _Interner()
+        campuses = _Interner()
+        features = _Interner()
+
+        for teacher_id in data["teachers"]:
+            teachers.intern(teacher_id)
+        for class_id in data["classes"]:
+            classes.intern(class_id)
+        for campus_id in data["campuses"]:
+            campuses.intern(campus_id)
+        for feature_id in data["classroom_features"]:
+            features.intern(feature_id)
+
+        # ---- 教室 ----
+        self.room_capacity: List[int] = []
+        self.room_campus: List[int] = []
+        self.room_features: List[int] = []
+        for classroom_id, classroom in data["classrooms"].items():
+            rooms.intern(classroom_id)
+            self.room_capacity.append(classroom.capacity)
+            self.room_campus.append(campuses.intern(classroom.campus_id))
+            self.room_features.append(
+                self._feature_mask(classroom.features, features)
+            )
+
+        # ---- 任务 ----
+        tasks = data["teaching_tasks"]
+        offering_slots = defaultdict(int)
+        for task in tasks:
+            offering_slots[task.offering_id] += task.slots_count
+
+        self.task_ids: List[int] = []
+        self.task_index: Dict[int, int] = {}
+        self.task_slots: List[int] = []
+        self.task_students: List[int] = []
+        self.task_nature: List[int] = []
+        self.task_features: List[int] = []
+        self.task_weeks: List[int] = []
+        self.task_teachers: List[Tuple[int, ...]] = []
+        self.task_classes: List[Tuple[int, ...]] = []
+        self.task_teacher_mask: List[int] = []
+        self.task_class_mask: List[int] = []
+        self.task_offering_slots: List[int] = []
+        for task in tasks:
+            self.task_index[task.task_id] = len(self.task_ids)
+            self.task_ids.append(task.task_id)
+            self.task_slots.append(task.slots_count)
+            self.task_students.append(task.student_count or 0)
+            self.task_nature.append(
+                _NATURE_CODES.get(task.offering.course_nature, NATURE_ELECTIVE)
+                if task.offering
+                else NATURE_NONE
+            )
+            self.task_features.append(
+                self._feature_mask(task.required_features, features)
+            )
+            self.task_weeks.append(weeks_to_mask(task.weeks))
+            teacher_indices = tuple(teachers.intern(t) for t in task.teachers)
+            self.task_teachers.append(teacher_indices)
+            mask = 0
+            for idx in teacher_indices:
+                mask |= 1 << idx
+            self.task_teacher_mask.append(mask)
+            class_indices = tuple(classes.intern(c) for c in task.classes)
+            self.task_classes.append(class_indices)
+            mask = 0
+            for idx in class_indices:
+                mask |= 1 << idx
+            self.task_class_mask.append(mask)
+            self.task_offering_slots.append(offering_slots[task.offering_id])
+
+        self.teacher_ids, self.teacher_index = teachers.ids, teachers.index
+        self.class_ids, self.class_index = classes.ids, classes.index
+        self.room_ids, self.room_index = rooms.ids, rooms.index
+        self.campus_ids, self.campus_index = campuses.ids, campuses.index
+        self.feature_ids, self.feature_index = features.ids, features.index
+
+    @staticmethod
+    def _feature_mask(feature_ids, features: _Interner) -> int:
+        mask = 0
+        for feature_id in feature_ids or ():
+            mask |= 1 << features.intern(feature_id)
+        return mask
+
+    def priority_key(self, task_idx: int) -> Tuple[int, int, int, int]:
+        """任务排序键：课程性质、节数（长课优先）、学生人数、开课计划总节数（均为大者优先）"""
+        nature = self.task_nature[task_idx]
+        if nature == NATURE_NONE:
+            return (2, 0, 0, 0)  # 默认优先级
+        return (
+            nature,
+            -self.task_slots[task_idx],
+            -self.task_students[task_idx],
+            -self.task_offering_slots[task_idx],
+        )
+
+    def room_of(self, classroom_id: str) -> Optional[int]:
+        """教室ID -> 下标（不存在时返回 None）"""
+        return self.room_index.get(classroom_id)
+
+    def campus_of(self, classroom_id: str) -> int:
+        """教室ID -> 校区下标"""
+        return self.room_campus[self.room_index[classroom_id]]
+
+    def commute_count(self, classroom_ids: Iterable[str]) -> int:
+        """同一教师同一天的课所在教室涉及的校区数减一（校区通勤次数），没有课时为 0
+
+        全量适应度、增量评估和冲突集变异统一用它计算 campus_commute。
+        """
+        room_campus, room_index = self.room_campus, self.room_index
+        return max(len({room_campus[room_index[c]] for c in classroom_ids}) - 1, 0)
@@ -60,18 +60,39 @@ class SchedulingSystem:
         self.db_connector = None
         self.data_loader = None
 
-    def setup_database_connection(self):
-        """设置数据库连接"""
-        from db_config import get_db_config
+    def setup_database_connection(
+        self, sqlite_path: str = None, snapshot_dir: str = None
+    ):
+        """设置数据库连接
+
+        Args:
+            sqlite_path: 指定时改用该 SQLite 文件（见 data_sources.py），不连接 MySQL
+            snapshot_dir: 指定时使用该目录中的学期数据快照，源数据未变化时不再逐表查询
+        """
+        if sqlite_path:
+            from data_sources import SQLiteConnector
+
+            logger.info(f"使用 SQLite 数据库: {sqlite_path}")
+            self.db_connector = SQLiteConnector(sqlite_path)
+            self.db_connector.connect()
+        else:
+            from db_config import get_db_config
 
-        db_config = get_db_config()
-        logger.info(
-            f"连接数据库: {db_config['host']}:{db_config['port']}/{db_config['database']}"
-        )
+            db_config = get_db_config()
+            logger.info(
+                f"连接数据库: {db_config['host']}:{db_config['port']}/{db_config['database']}"
+            )
+
+            self.db_connector = DatabaseConnector(**db_config)
+            self.db_connector.connect()
 
-        self.db_connector = DatabaseConnector(**db_config)
-        self.db_connector.connect()
-        self.data_loader = DataLoader(self.db_connector)
+        if snapshot_dir:
+            from data_sources import SnapshotDataLoader
+
+            logger.info(f"使用学期数据快照目录: {snapshot_dir}")
+            self.data_loader = SnapshotDataLoader(self.db_connector, snapshot_dir)
+        else:
+            self.data_loader = DataLoader(self.db_connector)
 
     def validate_version(self, version_id: int) -> bool:
         """验证排课版本是否存在且状态正确，不存在则自动创建"""
@@ -143,9 +164,17 @@ class SchedulingSystem:
         return True
 
     def run_scheduling(
-        self, version_id: int, grades: List[int] = None, ga_config: Dict = None
+        self,
+        version_id: int,
+        grades: List[int] = None,
+        ga_config: Dict = None,
+        seed_version_id: int = None,
     ) -> bool:
-        """运行排课算法"""
+        """运行排课算法
+
+        Args:
+            seed_version_id: 热启动的来源版本ID（可选），用其排课结果作为初始种群的种子
+        """
         try:
             start_time = time.time()
 
@@ -172,6 +201,12 @@ class SchedulingSystem:
             if not self.validate_data_integrity(data):
                 return False
 
+            # 热启动：以已有版本的排课结果为种子
+            if seed_version_id is not None:
+                data["seed_schedules"] = self.data_loader.load_schedules(
+                    seed_version_id
+                )
+
             # 初始化遗传算法（添加进度回调）
             logger.info("初始化遗传算法")
 
@@ -968,6 +1003,12 @@ def parse_arguments():
     parser.add_argument(
         "--mutation-rate", type=float, default=0.1, help="变异率 (默认: 0.1)"
     )
+    parser.add_argument(
+        "--mutation-mode",
+        choices=["uniform", "conflict_set"],
+        default="uniform",
+        help="变异模式：uniform 每个基因按变异率独立变异，conflict_set 优先修复处在硬约束冲突中的基因 (默认: uniform)",
+    )
     parser.add_argument(
         "--tournament-size", type=int, default=5, help="锦标赛大小 (默认: 5)"
     )
@@ -977,12 +1018,132 @@ def parse_arguments():
     parser.add_argument(
         "--max-stagnation", type=int, default=50, help="最大停滞代数 (默认: 50)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="并行适应度评估进程数 (默认: 1，即串行)",
+    )
+    parser.add_argument(
+        "--dsatur-ratio",
+        type=float,
+        default=0.0,
+        help="初始种群中 DSATUR 构造式个体的比例 0-1 (默认: 0)",
+    )
+    parser.add_argument(
+        "--init-workers",
+        type=int,
+        default=1,
+        help="并行初始化种群的进程数 (默认: 1，即串行)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="主随机种子，指定后结果可复现 (默认: 不固定)",
+    )
+    parser.add_argument(
+        "--islands",
+        type=int,
+        default=1,
+        help="岛屿模型子种群（进程）数 (默认: 1，即单种群)",
+    )
+    parser.add_argument(
+        "--migration-interval",
+        type=int,
+        default=10,
+        help="岛屿模型迁移间隔代数 (默认: 10)",
+    )
+    parser.add_argument(
+        "--local-search",
+        choices=["tabu", "annealing"],
+        default=None,
+        help="进化结束后对最佳个体做局部搜索的方法 (默认: 不启用)",
+    )
+    parser.add_argument(
+        "--local-search-budget",
+        type=float,
+        default=5.0,
+        help="局部搜索时间预算（秒）(默认: 5)",
+    )
+    parser.add_argument(
+        "--local-search-interval",
+        type=int,
+        default=0,
+        help="每隔多少代对精英做局部搜索，0 表示只在结束后做 (默认: 0)",
+    )
+    parser.add_argument(
+        "--decompose",
+        type=int,
+        default=0,
+        metavar="WORKERS",
+        help="按班级/教师把任务分解为互不相关的分量，用指定进程数分组并行求解，0 表示不分解 (默认: 0)",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="运行时间预算（秒），到时停止进化并返回当前最优解 (默认: 不限时)",
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        help="运行报告 JSON 输出路径（各阶段耗时、评估速度、变异成功率、硬约束分项）",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help="检查点文件路径，进化过程中定期保存种群状态 (默认: 不保存)",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=int,
+        default=10,
+        help="每隔多少代保存一次检查点 (默认: 10)",
+    )
+    parser.add_argument(
+        "--resume-from",
+        type=str,
+        default=None,
+        help="从指定检查点文件继续进化，不重新初始化种群",
+    )
+    parser.add_argument(
+        "--seed-version",
+        type=int,
+        default=None,
+        help="热启动：以指定版本的排课结果作为初始种群的种子 (默认: 不使用)",
+    )
+    parser.add_argument(
+        "--pin-seed",
+        action="store_true",
+        help="配合 --seed-version：锁定原方案中仍有效的安排，只重排新增或已变更的任务",
+    )
+    parser.add_argument(
+        "--warm-start-ratio",
+        type=float,
+        default=0.5,
+        help="热启动时由原方案及其变异体构成的初始种群比例 (默认: 0.5)",
+    )
     parser.add_argument(
         "--grades",
         type=str,
         default=None,
         help="年级范围（格式：1,2,3 或 all；默认加载所有年级）",
     )
+    parser.add_argument(
+        "--sqlite",
+        type=str,
+        default=None,
+        help="改用 SQLite 数据库文件作为数据源（见 data_sources.py），不连接 MySQL",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        type=str,
+        default=None,
+        help="学期数据快照目录：源数据未变化时直接读取快照，变化后自动重建",
+    )
 
     return parser.parse_args()
 
@@ -1006,9 +1167,28 @@ def main():
         "generations": args.generations,
         "crossover_rate": args.crossover_rate,
         "mutation_rate": args.mutation_rate,
+        "mutation_mode": args.mutation_mode,
         "tournament_size": args.tournament_size,
         "elitism_size": args.elitism_size,
         "max_stagnation": args.max_stagnation,
+        "fitness_workers": args.workers,
+        "dsatur_seed_ratio": args.dsatur_ratio,
+        "init_workers": args.init_workers,
+        "random_seed": args.seed,
+        "islands": args.islands,
+        "migration_interval": args.migration_interval,
+        "local_search": args.local_search,
+        "local_search_time_budget": args.local_search_budget,
+        "local_search_interval": args.local_search_interval,
+        "time_budget_seconds": args.time_budget,
+        "decompose": args.decompose > 0,
+        "component_workers": max(1, args.decompose),
+        "run_report_path": args.report,
+        "checkpoint_path": args.checkpoint,
+        "checkpoint_interval": args.checkpoint_interval,
+        "resume_from": args.resume_from,
+        "warm_start_ratio": args.warm_start_ratio,
+        "pin_seed_schedules": args.pin_seed,
     }
 
     logger.info("=" * 60)
@@ -1024,10 +1204,12 @@ def main():
 
     try:
         # 设置数据库连接
-        system.setup_database_connection()
+        system.setup_database_connection(args.sqlite, args.snapshot_dir)
 
         # 运行排课
-        success = system.run_scheduling(args.version, grades, ga_config)
+        success = system.run_scheduling(
+            args.version, grades, ga_config, seed_version_id=args.seed_version
+        )
 
         if success:
             logger.info("排课任务完成成功！")
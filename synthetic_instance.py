@@ -0,0 +1,759 @@
+# -*- coding: utf-8 -*-
+"""
+合成排课实例生成模块
+离线生成 SchedulingGeneticAlgorithm 所需的 data 字典（与 DataLoader.load_all_data 结构一致），
+规模可从几百到两万个教学任务，用于压测和基准测试，不依赖生产数据。
+
+生成的结构：校区 → 院系 → 专业 → 年级行政班；教师按院系归属；
+开课计划分必修 / 选修 / 通识，合班规模与课程性质相关；教学任务为 2/3/4 节连堂，
+周次模式含全周 / 单周 / 双周 / 半学期；另含教师黑名单、偏好和任务关系约束。
+教室按各校区、各容量档、各设施的实际需求配置，tightness 控制教室的目标占用率。
+
+可选地把同一实例批量写入数据库（需要 pymysql）：
+    python synthetic_instance.py --tasks 5000 --load-db --version 900
+    python synthetic_instance.py --tasks 5000 --sqlite synthetic.db --version 1
+"""
+
+import argparse
+import logging
+import math
+import random
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from data_models import (
+    Campus,
+    Class,
+    Classroom,
+    ClassroomFeature,
+    Course,
+    CourseNature,
+    CourseOffering,
+    Department,
+    Major,
+    PreferenceType,
+    TaskRelation,
+    Teacher,
+    TeacherBlackoutTime,
+    TeacherPreference,
+    TeachingTask,
+)
+
+logger = logging.getLogger(__name__)
+
+# 教室容量档位：任务取不小于其人数的最小档，浪费率不超过 GA 放置教室的要求
+CAPACITY_TIERS = [30, 40, 50, 60, 70, 80, 100, 120, 140, 160, 200, 250, 300]
+
+# 一间教室每周可容纳的课次（工作日 × 每天约 4.5 个连堂块，扣除周四下午）
+ROOM_SESSIONS_PER_WEEK = 21
+
+# 每个行政班 / 每位教师每周的课次上限
+CLASS_MAX_SESSIONS = 14
+TEACHER_MAX_SESSIONS = 8
+
+# 单个任务的节数分布
+SLOT_LENGTHS = [2, 3, 4]
+SLOT_WEIGHTS = [0.55, 0.3, 0.15]
+
+# 任务关系类型 -> 数据库 constraint_type
+RELATION_DB_TYPES = {
+    "same_day": "REQUIRE_SAME_DAY",
+    "different_day": "AVOID_CONSECUTIVE_DAYS",
+    "time_gap": "MIN_DAYS_APART",
+}
+
+
+def _weeks_for(start_week: int, end_week: int, week_pattern: str) -> set:
+    """与 DataLoader._generate_weeks_from_pattern 相同的周次展开规则"""
+    weeks = range(start_week, end_week + 1)
+    if week_pattern == "SINGLE":
+        return {w for w in weeks if w % 2 == 1}
+    if week_pattern == "DOUBLE":
+        return {w for w in weeks if w % 2 == 0}
+    return set(weeks)
+
+
+def _capacity_tier(student_count: int) -> int:
+    for tier in CAPACITY_TIERS:
+        if tier >= student_count:
+            return tier
+    return CAPACITY_TIERS[-1]
+
+
+def generate_instance(
+    num_tasks: int = 2000,
+    seed: int = 0,
+    num_campuses: int = 2,
+    tightness: float = 0.8,
+    semester: str = "2025-2026-1",
+    id_base: int = 1,
+) -> Dict:
+    """生成一个合成排课实例
+
+    Args:
+        num_tasks: 教学任务数（约数，按开课计划整体生成，可能略多几个）
+        seed: 随机种子，相同参数和种子生成完全相同的实例
+        num_campuses: 校区数
+        tightness: 教室目标占用率 (0, 1]，越大教室越紧张
+        semester: 学期
+        id_base: 整数 ID（开课计划、任务等）的起始值，写入已有数据库时避免冲突
+
+    Returns:
+        与 DataLoader.load_all_data() 结构一致的 data 字典
+    """
+    if not 0 < tightness <= 1:
+        raise ValueError(f"tightness 必须在 (0, 1] 内: {tightness}")
+    rng = random.Random(seed)
+
+    # ---- 组织结构：校区 / 院系 / 专业 / 行政班 / 教师 ----
+    campuses = {
+        f"CP{i:02d}": Campus(f"CP{i:02d}", f"校区{i}", f"校区{i}地址")
+        for i in range(1, num_campuses + 1)
+    }
+    campus_ids = list(campuses)
+
+    num_departments = max(2 * num_campuses, num_tasks // 250)
+    departments = {}
+    for i in range(1, num_departments + 1):
+        dept_id = f"D{i:03d}"
+        departments[dept_id] = Department(
+            dept_id, f"学院{i}", campus_ids[(i - 1) % num_campuses]
+        )
+
+    # 每个行政班每周约 11 个课次，平均每个任务 1.6 个班
+    needed_classes = max(4, math.ceil(num_tasks * 1.6 / 11))
+    majors_per_department = 3
+    grades = [1, 2, 3, 4]
+    classes_per_group = max(
+        1,
+        math.ceil(
+            needed_classes / (num_departments * majors_per_department * len(grades))
+        ),
+    )
+
+    majors = {}
+    classes = {}
+    classes_by_group = defaultdict(list)  # (major_id, grade) -> [class_id]
+    classes_by_department_grade = defaultdict(list)
+    classes_by_campus_grade = defaultdict(list)
+    for dept_id, dept in departments.items():
+        for m in range(1, majors_per_department + 1):
+            major_id = f"M{dept_id[1:]}{m}"
+            majors[major_id] = Major(
+                major_id, f"{dept.department_name}专业{m}", dept_id
+            )
+            for grade in grades:
+                for c in range(1, classes_per_group + 1):
+                    class_id = f"C{major_id[1:]}{grade}{c:02d}"
+                    classes[class_id] = Class(
+                        class_id,
+                        f"{major_id}-{grade}-{c}班",
+                        2025 - grade + 1,
+                        rng.randint(28, 50),
+                        major_id,
+                        4,
+                    )
+                    classes_by_group[(major_id, grade)].append(class_id)
+                    classes_by_department_grade[(dept_id, grade)].append(class_id)
+                    classes_by_campus_grade[(dept.campus_id, grade)].append(class_id)
+
+    num_teachers = max(num_departments, math.ceil(num_tasks / 6))
+    teachers = {}
+    teachers_by_department = defaultdict(list)
+    dept_ids = list(departments)
+    for i in range(1, num_teachers + 1):
+        teacher_id = f"T{i:05d}"
+        dept_id = dept_ids[(i - 1) % num_departments]
+        teachers[teacher_id] = Teacher(
+            teacher_id,
+            f"教师{i}",
+            dept_id,
+            rng.choice(["男", "女"]),
+            rng.random() < 0.05,
+        )
+        teachers_by_department[dept_id].append(teacher_id)
+
+    classroom_features = {
+        "DMT": ClassroomFeature("DMT", "多媒体", "标准多媒体设备"),
+        "LAB": ClassroomFeature("LAB", "实验室", "实验设备"),
+        "PC": ClassroomFeature("PC", "计算机机房", "学生机"),
+    }
+
+    # ---- 开课计划与教学任务 ----
+    class_load = defaultdict(int)
+    teacher_load = defaultdict(int)
+
+    def pick_least_loaded(candidates: List[str], count: int, load, limit: int):
+        available = [c for c in candidates if load[c] < limit]
+        rng.shuffle(available)
+        available.sort(key=lambda c: load[c])
+        return available[:count]
+
+    courses = {}
+    offerings = {}
+    tasks: List[TeachingTask] = []
+    relations: List[TaskRelation] = []
+    offering_departments = {}
+    offering_features = {}
+    offering_teachers = {}
+    offering_id = id_base
+    task_id = id_base
+    attempts = 0
+
+    while len(tasks) < num_tasks:
+        attempts += 1
+        if attempts > num_tasks * 20:
+            logger.warning(f"班级/教师课时已饱和，只生成了 {len(tasks)} 个任务")
+            break
+
+        dept_id = rng.choice(dept_ids)
+        campus_id = departments[dept_id].campus_id
+        grade = rng.choice(grades)
+        roll = rng.random()
+        if roll < 0.6:
+            nature = CourseNature.REQUIRED
+            major_id = f"M{dept_id[1:]}{rng.randint(1, majors_per_department)}"
+            candidates = classes_by_group[(major_id, grade)]
+            class_count = rng.choice([1, 1, 2, 2, 3])
+        elif roll < 0.85:
+            nature = CourseNature.ELECTIVE
+            candidates = classes_by_department_grade[(dept_id, grade)]
+            class_count = rng.choice([1, 1, 2])
+        else:
+            nature = CourseNature.GENERAL
+            candidates = classes_by_campus_grade[(campus_id, grade)]
+            class_count = rng.choice([2, 3, 4, 5])
+
+        sequences = 2 if rng.random() < 0.6 else 1
+        class_ids = pick_least_loaded(
+            candidates, class_count, class_load, CLASS_MAX_SESSIONS - sequences + 1
+        )
+        teacher_count = 2 if rng.random() < 0.1 else 1
+        teacher_ids = pick_least_loaded(
+            teachers_by_department[dept_id],
+            teacher_count,
+            teacher_load,
+            TEACHER_MAX_SESSIONS - sequences + 1,
+        )
+        if not class_ids or not teacher_ids:
+            continue
+
+        course_id = f"K{offering_id:06d}"
+        slots = rng.choices(SLOT_LENGTHS, SLOT_WEIGHTS)[0]
+        courses[course_id] = Course(
+            course_id,
+            f"课程{offering_id}",
+            float(slots * sequences) / 2,
+            slots * sequences * 16,
+        )
+
+        pattern_roll = rng.random()
+        if pattern_roll < 0.7:
+            start_week, end_week, week_pattern = 1, 16, "CONTINUOUS"
+        elif pattern_roll < 0.8:
+            start_week, end_week, week_pattern = 1, 16, "SINGLE"
+        elif pattern_roll < 0.9:
+            start_week, end_week, week_pattern = 1, 16, "DOUBLE"
+        else:
+            start_week, end_week = rng.choice([(1, 8), (9, 16)])
+            week_pattern = "CONTINUOUS"
+        weeks = _weeks_for(start_week, end_week, week_pattern)
+
+        student_count = sum(classes[c].student_count for c in class_ids)
+        offering = CourseOffering(
+            offering_id,
+            semester,
+            course_id,
+            nature,
+            student_count,
+            start_week,
+            end_week,
+            week_pattern,
+        )
+        offerings[offering_id] = offering
+        offering_departments[offering_id] = dept_id
+        offering_teachers[offering_id] = teacher_ids
+
+        feature_roll = rng.random()
+        features = {"DMT"}
+        if feature_roll < 0.06:
+            features = {"LAB"}
+        elif feature_roll < 0.12:
+            features = {"PC"}
+        offering_features[offering_id] = features
+
+        offering_tasks = []
+        for sequence in range(1, sequences + 1):
+            task = TeachingTask(
+                task_id,
+                offering_id,
+                None,
+                sequence,
+                slots if sequence == 1 else rng.choices(SLOT_LENGTHS, SLOT_WEIGHTS)[0],
+            )
+            task.teachers = list(teacher_ids)
+            task.classes = list(class_ids)
+            task.student_count = student_count
+            task.required_features = set(features)
+            task.offering = offering
+            task.weeks = set(weeks)
+            offering_tasks.append(task)
+            task_id += 1
+        tasks.extend(offering_tasks)
+
+        for class_id in class_ids:
+            class_load[class_id] += sequences
+        for teacher_id in teacher_ids:
+            teacher_load[teacher_id] += sequences
+
+        if sequences == 2 and rng.random() < 0.3:
+            relation_type = rng.choice(list(RELATION_DB_TYPES))
+            relations.append(
+                TaskRelation(
+                    len(relations) + 1,
+                    offering_id,
+                    offering_tasks[0].task_id,
+                    offering_tasks[1].task_id,
+                    relation_type,
+                    2 if relation_type == "time_gap" else None,
+                    200,
+                )
+            )
+        offering_id += 1
+
+    # ---- 教室：按校区 × 设施 × 容量档的需求配置 ----
+    demand = defaultdict(float)
+    for task in tasks:
+        campus_id = departments[offering_departments[task.offering_id]].campus_id
+        feature = next(iter(task.required_features))
+        demand[(campus_id, feature, _capacity_tier(task.student_count))] += (
+            len(task.weeks) / 16
+        )
+
+    classrooms = {}
+    room_index = 1
+    for (campus_id, feature, tier), sessions in sorted(demand.items()):
+        room_count = max(1, math.ceil(sessions / (ROOM_SESSIONS_PER_WEEK * tightness)))
+        for _ in range(room_count):
+            classroom_id = f"R{room_index:05d}"
+            room_features = {"DMT", feature}
+            classrooms[classroom_id] = Classroom(
+                classroom_id,
+                f"{campus_id}-{room_index}",
+                f"{campus_id}-教学楼{(room_index % 5) + 1}",
+                campus_id,
+                {"DMT": "普通多媒体", "LAB": "实验室", "PC": "计算机机房"}[feature],
+                tier,
+                True,
+                room_features,
+            )
+            room_index += 1
+
+    # ---- 教师黑名单与偏好 ----
+    blackouts = []
+    for teacher_id in teachers:
+        if rng.random() < 0.15:
+            start_slot, end_slot = rng.choice([(1, 5), (6, 10)])
+            blackouts.append(
+                TeacherBlackoutTime(
+                    len(blackouts) + 1,
+                    teacher_id,
+                    semester,
+                    rng.randint(1, 5),
+                    start_slot,
+                    end_slot,
+                    "合成数据",
+                )
+            )
+
+    preferences = []
+    for offering_id, teacher_ids in offering_teachers.items():
+        if rng.random() < 0.2:
+            start_slot, end_slot = rng.choice([(1, 5), (6, 10), (11, 13)])
+            preferences.append(
+                TeacherPreference(
+                    len(preferences) + 1,
+                    offering_id,
+                    teacher_ids[0],
+                    rng.choice(list(PreferenceType)),
+                    rng.randint(1, 5),
+                    start_slot,
+                    end_slot,
+                    rng.choice([50, 100, 150]),
+                )
+            )
+
+    logger.info(
+        f"合成实例：{len(tasks)} 个任务，{len(offerings)} 个开课计划，{len(classes)} 个班级，"
+        f"{len(teachers)} 位教师，{len(classrooms)} 间教室，{len(relations)} 条任务关系"
+    )
+    data = {
+        "campuses": campuses,
+        "departments": departments,
+        "majors": majors,
+        "classes": classes,
+        "teachers": teachers,
+        "courses": courses,
+        "classroom_features": classroom_features,
+        "classrooms": classrooms,
+        "course_offerings": offerings,
+        "teaching_groups": {},
+        "teaching_tasks": tasks,
+        "teacher_blackout_times": blackouts,
+        "teacher_preferences": preferences,
+        "task_relations": relations,
+        "offering_weeks": {},
+    }
+    return data
+
+
+def _insert(db, table: str, columns: List[str], rows: List[tuple], chunk: int = 5000):
+    """分批插入（重复主键时更新首列以外的第一列，与 test_data_generator 一致）"""
+    if not rows:
+        return
+    placeholders = ", ".join(["%s"] * len(columns))
+    update_column = columns[1] if len(columns) > 1 else columns[0]
+    query = (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+        f"ON DUPLICATE KEY UPDATE {update_column}=VALUES({update_column})"
+    )
+    for i in range(0, len(rows), chunk):
+        db.execute_batch_insert(query, rows[i : i + chunk])
+
+
+def bulk_load_instance(data: Dict, db, version_id: Optional[int] = None):
+    """把合成实例批量写入数据库
+
+    Args:
+        data: generate_instance() 的返回值
+        db: DatabaseConnector（已连接或可自动连接）
+        version_id: 若指定，同时创建一个该学期的草案排课版本
+    """
+    offerings = data["course_offerings"]
+    tasks = data["teaching_tasks"]
+
+    _insert(
+        db,
+        "campuses",
+        ["campus_id", "campus_name", "address"],
+        [(c.campus_id, c.campus_name, c.address) for c in data["campuses"].values()],
+    )
+    _insert(
+        db,
+        "departments",
+        ["department_id", "department_name", "campus_id"],
+        [
+            (d.department_id, d.department_name, d.campus_id)
+            for d in data["departments"].values()
+        ],
+    )
+    _insert(
+        db,
+        "majors",
+        ["major_id", "major_name", "department_id"],
+        [(m.major_id, m.major_name, m.department_id) for m in data["majors"].values()],
+    )
+    _insert(
+        db,
+        "classes",
+        [
+            "class_id",
+            "class_name",
+            "grade",
+            "student_count",
+            "major_id",
+            "education_system",
+        ],
+        [
+            (
+                c.class_id,
+                c.class_name,
+                c.grade,
+                c.student_count,
+                c.major_id,
+                c.education_system,
+            )
+            for c in data["classes"].values()
+        ],
+    )
+    _insert(
+        db,
+        "teachers",
+        ["teacher_id", "teacher_name", "department_id", "gender", "is_external"],
+        [
+            (t.teacher_id, t.teacher_name, t.department_id, t.gender, t.is_external)
+            for t in data["teachers"].values()
+        ],
+    )
+    _insert(
+        db,
+        "courses",
+        ["course_id", "course_name", "credits", "total_hours"],
+        [
+            (c.course_id, c.course_name, c.credits, c.total_hours)
+            for c in data["courses"].values()
+        ],
+    )
+    _insert(
+        db,
+        "classroom_features",
+        ["feature_id", "feature_name", "description"],
+        [
+            (f.feature_id, f.feature_name, f.description)
+            for f in data["classroom_features"].values()
+        ],
+    )
+    _insert(
+        db,
+        "classrooms",
+        [
+            "classroom_id",
+            "classroom_name",
+            "building_name",
+            "campus_id",
+            "classroom_type",
+            "capacity",
+            "is_available",
+        ],
+        [
+            (
+                r.classroom_id,
+                r.classroom_name,
+                r.building_name,
+                r.campus_id,
+                r.classroom_type,
+                r.capacity,
+                r.is_available,
+            )
+            for r in data["classrooms"].values()
+        ],
+    )
+    _insert(
+        db,
+        "classroom_has_features",
+        ["classroom_id", "feature_id"],
+        [
+            (r.classroom_id, f)
+            for r in data["classrooms"].values()
+            for f in sorted(r.features)
+        ],
+    )
+    _insert(
+        db,
+        "course_offerings",
+        [
+            "offering_id",
+            "semester",
+            "course_id",
+            "course_nature",
+            "student_count_estimate",
+            "start_week",
+            "end_week",
+            "week_pattern",
+        ],
+        [
+            (
+                o.offering_id,
+                o.semester,
+                o.course_id,
+                o.course_nature.value,
+                o.student_count_estimate,
+                o.start_week,
+                o.end_week,
+                o.week_pattern,
+            )
+            for o in offerings.values()
+        ],
+    )
+
+    # 开课计划的班级 / 教师 / 设施要求由其第一个任务反推（同一开课计划的任务共享这些属性）
+    first_tasks = {}
+    for task in tasks:
+        first_tasks.setdefault(task.offering_id, task)
+    _insert(
+        db,
+        "offering_classes",
+        ["offering_id", "class_id"],
+        [(oid, c) for oid, task in first_tasks.items() for c in task.classes],
+    )
+    _insert(
+        db,
+        "offering_teachers",
+        ["offering_id", "teacher_id", "role"],
+        [(oid, t, "主讲") for oid, task in first_tasks.items() for t in task.teachers],
+    )
+    _insert(
+        db,
+        "offering_requires_features",
+        ["offering_id", "feature_id", "is_mandatory"],
+        [
+            (oid, f, True)
+            for oid, task in first_tasks.items()
+            for f in sorted(task.required_features)
+            if f != "DMT"
+        ],
+    )
+    _insert(
+        db,
+        "teaching_tasks",
+        ["task_id", "offering_id", "group_id", "task_sequence", "slots_count"],
+        [
+            (t.task_id, t.offering_id, t.group_id, t.task_sequence, t.slots_count)
+            for t in tasks
+        ],
+    )
+
+    task_sequences = {task.task_id: task.task_sequence for task in tasks}
+    _insert(
+        db,
+        "task_relation_constraints",
+        [
+            "offering_id",
+            "task_sequence_a",
+            "task_sequence_b",
+            "constraint_type",
+            "constraint_value",
+            "penalty_score",
+        ],
+        [
+            (
+                r.offering_id,
+                task_sequences[r.task_id_from],
+                task_sequences[r.task_id_to],
+                RELATION_DB_TYPES[r.relation_type],
+                r.min_gap_days,
+                r.penalty,
+            )
+            for r in data["task_relations"]
+        ],
+    )
+    _insert(
+        db,
+        "teacher_blackout_times",
+        ["teacher_id", "semester", "weekday", "start_slot", "end_slot", "reason"],
+        [
+            (b.teacher_id, b.semester, b.weekday, b.start_slot, b.end_slot, b.reason)
+            for b in data["teacher_blackout_times"]
+        ],
+    )
+    _insert(
+        db,
+        "teacher_preferences",
+        [
+            "offering_id",
+            "teacher_id",
+            "preference_type",
+            "weekday",
+            "start_slot",
+            "end_slot",
+            "penalty_score",
+        ],
+        [
+            (
+                p.offering_id,
+                p.teacher_id,
+                p.preference_type.value,
+                p.weekday,
+                p.start_slot,
+                p.end_slot,
+                p.penalty_score,
+            )
+            for p in data["teacher_preferences"]
+        ],
+    )
+
+    if version_id is not None:
+        semester = next(iter(offerings.values())).semester
+        _insert(
+            db,
+            "schedule_versions",
+            [
+                "version_id",
+                "semester",
+                "version_name",
+                "status",
+                "description",
+                "created_by",
+            ],
+            [
+                (
+                    version_id,
+                    semester,
+                    f"合成实例 {len(tasks)} 任务",
+                    "draft",
+                    "synthetic_instance.py 生成",
+                    "system",
+                )
+            ],
+        )
+    logger.info(f"合成实例已写入数据库：{len(tasks)} 个任务")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成合成排课实例（可选写入数据库）")
+    parser.add_argument(
+        "--tasks", type=int, default=2000, help="教学任务数 (默认: 2000)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="随机种子 (默认: 0)")
+    parser.add_argument("--campuses", type=int, default=2, help="校区数 (默认: 2)")
+    parser.add_argument(
+        "--tightness", type=float, default=0.8, help="教室目标占用率 (默认: 0.8)"
+    )
+    parser.add_argument(
+        "--semester", type=str, default="2025-2026-1", help="学期 (默认: 2025-2026-1)"
+    )
+    parser.add_argument(
+        "--id-base", type=int, default=1, help="开课计划/任务ID起始值 (默认: 1)"
+    )
+    parser.add_argument(
+        "--load-db",
+        action="store_true",
+        help="把实例批量写入数据库（使用 db_config 的配置）",
+    )
+    parser.add_argument(
+        "--version", type=int, default=None, help="写入数据库时同时创建的草案版本ID"
+    )
+    parser.add_argument(
+        "--sqlite",
+        type=str,
+        default=None,
+        help="把实例写入该 SQLite 文件（不需要 MySQL）",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    data = generate_instance(
+        args.tasks,
+        args.seed,
+        args.campuses,
+        args.tightness,
+        args.semester,
+        args.id_base,
+    )
+
+    if args.sqlite:
+        from data_sources import SQLiteConnector
+
+        db = SQLiteConnector(args.sqlite)
+        db.create_schema()
+        try:
+            bulk_load_instance(data, db, args.version)
+        finally:
+            db.disconnect()
+
+    if args.load_db:
+        from db_config import get_db_config
+        from db_connector import DatabaseConnector
+
+        db = DatabaseConnector(**get_db_config())
+        db.connect()
+        try:
+            bulk_load_instance(data, db, args.version)
+        finally:
+            db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+运行遥测模块
+记录进化过程中各阶段（初始化、适应度评估、选择、交叉、变异/修复、局部搜索、后处理）
+的耗时、每代评估次数与评估速度、各变异类型的成功率，以及最终最优个体的硬约束分项，
+随进度事件推送，并在结束时汇总为可写入 JSON 的运行报告。
+"""
+
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 阶段名称
+PHASE_INIT = "init"
+PHASE_FITNESS = "fitness"
+PHASE_SELECTION = "selection"
+PHASE_CROSSOVER = "crossover"
+PHASE_MUTATION = "mutation"
+PHASE_LOCAL_SEARCH = "local_search"
+PHASE_POST_PROCESS = "post_process"
+
+
+class RunTelemetry:
+    """单次运行的遥测数据
+
+    - phase(name): 计时上下文，耗时同时累加到当前代和全程合计
+    - add_time(name, seconds): 直接累加一段耗时（用于循环内零散计时）
+    - end_generation(...): 结束一代，返回该代的统计记录
+    - record_mutation(type, changed): 记录一次变异/修复是否改变了基因
+    """
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.phase_totals: Dict[str, float] = defaultdict(float)
+        self.generation_phases: Dict[str, float] = defaultdict(float)
+        self.generations: List[Dict] = []
+        self.evaluations = 0
+        self.generation_evaluations = 0
+        self.mutation_attempts: Dict[str, int] = defaultdict(int)
+        self.mutation_changes: Dict[str, int] = defaultdict(int)
+        self.best_breakdown: Optional[Dict] = None
+
+    @contextmanager
+    def phase(self, name: str, per_generation: bool = True):
+        """计时上下文；per_generation=False 时只计入全程合计（如初始化、后处理）"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started, per_generation)
+
+    def add_time(self, name: str, seconds: float, per_generation: bool = True):
+        self.phase_totals[name] += seconds
+        if per_generation:
+            self.generation_phases[name] += seconds
+
+    def has_pending_generation(self) -> bool:
+        """当前代是否已有未结束的统计（提前结束进化时用于补记最后一代）"""
+        return bool(self.generation_phases)
+
+    def last_generation(self) -> Optional[Dict]:
+        return self.generations[-1] if self.generations else None
+
+    def set_best_breakdown(self, details: Dict[str, int], penalty_scores: Dict):
+        """记录最优个体各硬约束的违反次数和对应惩罚"""
+        self.best_breakdown = {
+            constraint: {
+                "count": count,
+                "penalty": count * penalty_scores.get(constraint, 0),
+            }
+            for constraint, count in details.items()
+        }
+
+    def add_evaluations(self, count: int):
+        self.evaluations += count
+        self.generation_evaluations += count
+
+    def record_mutation(self, mutation_type: str, changed: bool):
+        self.mutation_attempts[mutation_type] += 1
+        if changed:
+            self.mutation_changes[mutation_type] += 1
+
+    def end_generation(self, generation: int, best_fitness: float) -> Dict:
+        """结束一代，返回该代记录：各阶段耗时、评估次数和每秒评估数"""
+        phases = {name: round(s, 6) for name, s in self.generation_phases.items()}
+        fitness_seconds = self.generation_phases.get(PHASE_FITNESS, 0.0)
+        record = {
+            "generation": generation,
+            "best_fitness": best_fitness,
+            "phase_seconds": phases,
+            "evaluations": self.generation_evaluations,
+            "evaluations_per_second": (
+                round(self.generation_evaluations / fitness_seconds, 1)
+                if fitness_seconds > 0
+                else None
+            ),
+        }
+        self.generations.append(record)
+        self.generation_phases = defaultdict(float)
+        self.generation_evaluations = 0
+        return record
+
+    def mutation_stats(self) -> Dict[str, Dict]:
+        """各变异类型的尝试次数、实际改变基因的次数和成功率"""
+        return {
+            mutation_type: {
+                "attempts": attempts,
+                "changed": self.mutation_changes[mutation_type],
+                "success_rate": round(self.mutation_changes[mutation_type] / attempts, 4),
+            }
+            for mutation_type, attempts in sorted(self.mutation_attempts.items())
+        }
+
+    def summary(self) -> Dict:
+        """不含逐代明细的汇总（随完成事件推送）"""
+        elapsed = time.monotonic() - self.started_at
+        fitness_seconds = self.phase_totals.get(PHASE_FITNESS, 0.0)
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "generations": len(self.generations),
+            "phase_seconds": {
+                name: round(s, 6) for name, s in sorted(self.phase_totals.items())
+            },
+            "evaluations": self.evaluations,
+            "evaluations_per_second": (
+                round(self.evaluations / fitness_seconds, 1)
+                if fitness_seconds > 0
+                else None
+            ),
+            "mutation": self.mutation_stats(),
+            "best_hard_breakdown": self.best_breakdown,
+        }
+
+    def report(self, config: Optional[Dict] = None) -> Dict:
+        """完整运行报告：汇总 + 逐代明细 + 运行配置（不可序列化的配置项被省略）"""
+        report = self.summary()
+        report["per_generation"] = self.generations
+        if config is not None:
+            report["config"] = {
+                key: value
+                for key, value in config.items()
+                if isinstance(value, (int, float, str, bool, dict, list, type(None)))
+                and key != "pinned_genes"
+            }
+        return report
+
+    def write_report(self, path: str, config: Optional[Dict] = None):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(config), f, ensure_ascii=False, indent=2)
+        logger.info(f"运行报告已写入: {path}")
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+热启动模块
+把已有排课版本的 schedules 记录还原为基因，作为初始种群的种子：
+记录仍然有效的任务沿用原安排，新增或已变更的任务在原安排的占用基础上重新放置；
+种群中除原方案本身外，再加入若干由它变异得到的个体。
+"""
+
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+from data_models import Gene, Schedule
+from occupancy import OccupancyGrid
+
+logger = logging.getLogger(__name__)
+
+
+def seed_genes_from_schedules(ga, schedules: Sequence[Schedule]) -> Dict[int, Gene]:
+    """把仍然有效的排课记录还原为基因：task_id -> Gene
+
+    以下记录视为失效（对应任务需要重新放置）：
+    - 任务已不存在或不再需要排课；
+    - 节数与任务当前的连堂节数不一致（任务已变更）；
+    - 教室已不存在，或时间已不在任务的候选时间域内（如新增了教师黑名单）。
+
+    schedules 表不记录教师，还原的基因取任务的第一位教师（适应度按任务的全部教师计算）。
+    """
+    rows = {row.task_id: row for row in schedules}
+    classrooms = ga.data["classrooms"]
+
+    genes = {}
+    for task in ga.schedulable_tasks:
+        row = rows.get(task.task_id)
+        if row is None:
+            continue
+        if row.end_slot - row.start_slot + 1 != task.slots_count:
+            continue
+        if row.classroom_id not in classrooms:
+            continue
+        if (row.week_day, row.start_slot) not in ga.task_time_domains[task.task_id]:
+            continue
+        genes[task.task_id] = Gene(
+            task.task_id, task.teachers[0], row.classroom_id, row.week_day, row.start_slot
+        )
+    return genes
+
+
+def build_seed_individual(ga, schedules: Sequence[Schedule]) -> Tuple[List[Gene], int]:
+    """把排课记录还原为个体，返回 (个体, 重新放置的任务数)
+
+    有效记录沿用原安排（锁定的任务使用其锁定安排），失效记录对应的任务重新放置。
+    """
+    genes = seed_genes_from_schedules(ga, schedules)
+    genes.update(ga.pinned_genes)
+
+    teacher_occupancy = OccupancyGrid()
+    class_occupancy = OccupancyGrid()
+    classroom_occupancy = OccupancyGrid()
+    for task in ga.schedulable_tasks:
+        gene = genes.get(task.task_id)
+        if gene is not None:
+            ga._update_schedules(
+                gene, task, teacher_occupancy, class_occupancy, classroom_occupancy
+            )
+
+    # 新增 / 变更的任务按优先级顺序在已有安排的空隙中放置
+    fresh_count = 0
+    for task in ga.tasks:
+        if task.task_id in genes or not task.teachers:
+            continue
+        gene = ga._create_gene_for_task(
+            task, teacher_occupancy, class_occupancy, classroom_occupancy
+        )
+        genes[task.task_id] = gene
+        ga._update_schedules(
+            gene, task, teacher_occupancy, class_occupancy, classroom_occupancy
+        )
+        fresh_count += 1
+
+    return [genes[task.task_id] for task in ga.schedulable_tasks], fresh_count
+
+
+def create_warm_start_individuals(
+    ga, schedules: Sequence[Schedule], count: int
+) -> List[List[Gene]]:
+    """生成 count 个热启动个体：第一个为还原的原方案，其余为它的变异体"""
+    if count <= 0:
+        return []
+
+    seed_individual, fresh_count = build_seed_individual(ga, schedules)
+    logger.info(
+        f"热启动：沿用 {len(seed_individual) - fresh_count} 个任务的原安排，"
+        f"重新放置 {fresh_count} 个新增或已变更的任务"
+    )
+
+    individuals = [seed_individual]
+    while len(individuals) < count:
+        individuals.append(ga.mutate(seed_individual))
+    return individuals